@@ -29,6 +29,9 @@ class Splash(QtGui.QDialog):
 
         self.setWindowFlags(QtCore.Qt.SplashScreen)
 
+        # Messages of the startup phases in flight, by phase name.
+        self._phases = {}
+
     def set_message(self, text):
         """
         Sets the message to display on the widget.
@@ -38,6 +41,27 @@ class Splash(QtGui.QDialog):
         self.ui.message.setText(text)
         QtGui.QApplication.instance().processEvents()
 
+    def start_phase(self, name, message):
+        """
+        Adds a startup phase to the ones in flight, or updates its message. The
+        messages of all the phases in flight are displayed together on the widget.
+
+        :param str name: Name of the phase.
+        :param str message: Text describing what the phase is doing.
+        """
+        self._phases[name] = message
+        self.set_message(" ".join(self._phases.values()))
+
+    def end_phase(self, name):
+        """
+        Removes a startup phase from the ones in flight.
+
+        :param str name: Name of the phase.
+        """
+        self._phases.pop(name, None)
+        if self._phases:
+            self.set_message(" ".join(self._phases.values()))
+
     def set_version(self, version):
         """
         Set the version of the PTR desktop app on the widget.
@@ -162,7 +162,7 @@ from .qt import QtCore, QtGui
 import shotgun_desktop.paths
 import shotgun_desktop.splash
 from shotgun_desktop.desktop_message_box import DesktopMessageBox
-from shotgun_desktop.upgrade_startup import upgrade_startup
+from shotgun_desktop.upgrade_startup import BackgroundStartupUpgrade
 from shotgun_desktop.location import get_startup_descriptor
 
 from shotgun_desktop.errors import (
@@ -180,29 +180,54 @@ from tank.util.version import (
     is_version_newer_or_equal,
 )
 
-global_debug_flag_at_startup = None
+# Capture of the debug log records of the startup, see __stop_debug_capture.
+startup_debug_capture = None
 
+# Timeline of the startup core and the span covering the startup, see
+# __save_startup_timeline.
+startup_timeline = None
+startup_span = None
 
-def __restore_global_debug_flag():
+
+def __stop_debug_capture(flush):
     """
-    Restores the global debug flag
+    Stops capturing the debug log records of the startup, once.
+
+    :param bool flush: If True, the captured records are written to the log file,
+        otherwise they are discarded.
     """
-    global global_debug_flag_at_startup
-    import sgtk
+    global startup_debug_capture
 
-    # If there is no LogManager for the new core, there's no need to restore any flag.
-    if hasattr(sgtk, "LogManager"):
-        sgtk.LogManager().global_debug = global_debug_flag_at_startup
+    if startup_debug_capture is None:
+        return
 
+    startup_debug_capture.stop(flush)
+    startup_debug_capture = None
 
-def __backup_global_debug_flag():
+
+def __save_startup_timeline():
     """
-    Backups the global debug flag.
+    Saves the timeline of the startup next to the log file, once. The spans
+    recorded by the cores bootstrapped since are included, as the timeline is
+    handed over to them on core swap.
     """
-    global global_debug_flag_at_startup
+    global startup_span
+
+    if startup_span is None:
+        return
+
+    startup_span.end()
+    startup_span = None
+
     import sgtk
 
-    global_debug_flag_at_startup = sgtk.LogManager().global_debug
+    path = os.path.join(
+        sgtk.LogManager().log_folder, "tk-desktop_startup_timeline.json"
+    )
+    try:
+        startup_timeline.save(path)
+    except Exception:
+        logger.exception("Unable to save the startup timeline to %s" % path)
 
 
 def __desktop_engine_supports_authentication_module(engine):
@@ -345,6 +370,17 @@ def __restart_app_with_countdown(splash, reason):
     raise RequestRestartException()
 
 
+def __restart_after_startup_upgrade(splash):
+    """
+    Restarts the app after the startup logic was updated.
+
+    :param splash: Splash dialog, used to display the countdown.
+
+    :throws RequestRestartException: This method never returns and throws
+    """
+    __restart_app_with_countdown(splash, "Flow Production Tracking updated.")
+
+
 def __extract_command_line_argument(arg_name):
     """
     Checks if an argument was specified from the command line and extracts it. Note that this method
@@ -379,43 +415,46 @@ def __launch_app(app, splash, user, app_bootstrap, settings):
 
     sgtk.set_authenticated_user(user)
 
-    # Downloads an upgrade for the startup if available.
-    startup_updated = upgrade_startup(splash, sgtk, app_bootstrap)
-    if startup_updated:
-        # We need to restore the global debug logging setting prior to
-        # restarting the app so that forced debug logging is not remembered
-        # as the startup state.  Once Desktop relaunches it will resume forced
-        # debug logging until core swap, when the original launch setting is
-        # restored.
-        __restore_global_debug_flag()
-        __restart_app_with_countdown(splash, "Flow Production Tracking updated.")
+    # Downloads an upgrade for the startup if available. This happens in the
+    # background while the site configuration is looked up, as we only need to
+    # know if the app has to be restarted before bootstrapping.
+    startup_upgrade = BackgroundStartupUpgrade(sgtk, app_bootstrap)
+    startup_upgrade.start()
+    splash.start_phase("upgrade", startup_upgrade.message)
 
-    splash.set_message("Looking up site configuration.")
+    splash.start_phase("site_config", "Looking up site configuration.")
 
     connection = user.create_sg_connection()
 
-    splash.show()
-
     logger.debug("Getting the default site configuration.")
-    (
-        pc_path,
-        pc,
-        toolkit_classic_required,
-    ) = shotgun_desktop.paths.get_pipeline_configuration_info(connection)
-
-    # We need to toggle the global debug logging setting back prior to swapping
-    # core. Cores older than v0.18.117 do not manage the TK_DEBUG environment
-    # variable when global debug is toggled, so we can end up in a situation
-    # where the new core in desktopstartup toggles it on, setting the env var,
-    # and then when the toggle off occurs we end up with the older core in the
-    # site config NOT purging the TK_DEBUG env var. The result is that any
-    # subprocesses spawned then end up with debug logging on when the user
-    # didn't ask for it. This impacts engine command execution from both Desktop
-    # and via browser integration. It is the biggest issue with browser
-    # integration, however, as the debug logs are reported back to the web
-    # app from the desktopserver RPC API, and the user is presented with a
-    # dialog full of debug log messages.
-    __restore_global_debug_flag()
+    try:
+        with sgtk.util.Timeline().span("get_pipeline_configuration_info", "desktop"):
+            (
+                pc_path,
+                pc,
+                toolkit_classic_required,
+            ) = shotgun_desktop.paths.get_pipeline_configuration_info(connection)
+    except Exception:
+        # Restart with the updated startup if there is one, it may not have
+        # this problem. Waiting for the upgrade can raise as well, so make sure
+        # this error is the one reported.
+        splash.end_phase("site_config")
+        logger.debug("Could not get the default site configuration.", exc_info=True)
+        try:
+            startup_updated = startup_upgrade.wait(splash, "upgrade")
+        except Exception:
+            logger.exception("Could not upgrade the startup logic.")
+            startup_updated = False
+        if startup_updated:
+            __restart_after_startup_upgrade(splash)
+        raise
+    splash.end_phase("site_config")
+
+    startup_updated = startup_upgrade.wait(splash, "upgrade")
+    if startup_updated:
+        __restart_after_startup_upgrade(splash)
+
+    splash.show()
 
     # We're about to bootstrap, so remove sgtk from our scope so that if we add
     # code that uses it after the bootstrap we have to import the
@@ -584,8 +623,6 @@ def __start_engine_in_zero_config(app, app_bootstrap, splash, user):
     if bundle_cache_path:
         mgr.bundle_cache_fallback_paths.append(bundle_cache_path)
 
-    mgr.pre_engine_start_callback = lambda ctx: __restore_global_debug_flag()
-
     return mgr.bootstrap_engine("tk-desktop")
 
 
@@ -688,6 +725,15 @@ def _is_pipeline_config_disabled(error_message):
 def _run_engine(engine, splash, startup_version, app_bootstrap, startup_desc, settings):
     __ensure_engine_compatible_with_qt_version(engine, app_bootstrap.get_version())
 
+    # The startup ends when the engine runs until the app quits. The debug log
+    # records of the startup are only kept if the user enabled debug logging.
+    import sgtk
+
+    __stop_debug_capture(
+        flush=hasattr(sgtk, "LogManager") and sgtk.LogManager().global_debug
+    )
+    __save_startup_timeline()
+
     return engine.run(
         splash,
         version=app_bootstrap.get_version(),
@@ -859,6 +905,9 @@ def main(**kwargs):
     import sgtk
 
     global logger
+    global startup_timeline
+    global startup_span
+    global startup_debug_capture
 
     # Core will take over logging
     app_bootstrap.tear_down_logging()
@@ -866,6 +915,9 @@ def main(**kwargs):
     logger = sgtk.LogManager.get_logger(__name__)
     logger.debug("Running main from %s" % __file__)
 
+    startup_timeline = sgtk.util.Timeline()
+    startup_span = startup_timeline.span("startup.main", "desktop")
+
     # Create some ui related objects
     app, splash = __init_app()
 
@@ -876,11 +928,10 @@ def main(**kwargs):
     # We might crash before even initializing the authenticator, so instantiate
     # it right away.
     shotgun_authenticator = None
-    # PTR desktop app startup has always been logging every debug string to disk since the new authentication from 0.16
-    # was released and the startup has been difficult to work with and debug, so keep that logic in place during the
-    # startup sequence. It will be restored during the ToolkitManager's pre_engine_start_callback.
-    __backup_global_debug_flag()
-    sgtk.LogManager().global_debug = True
+    # The startup has been difficult to work with and debug, so keep the debug log records of the startup sequence
+    # in memory. They are written to disk if the startup fails, without the cost of writing every debug string to
+    # disk on each launch. The capture keeps going after the core swap, until the engine runs.
+    startup_debug_capture = sgtk.LogManager().start_debug_capture()
 
     from sgtk import authentication
     from sgtk.descriptor import InvalidAppStoreCredentialsError
@@ -931,11 +982,19 @@ def main(**kwargs):
         shotgun_authenticator.clear_default_user()
         return 0
     except InvalidAppStoreCredentialsError as e:
+        __stop_debug_capture(flush=True)
         __handle_exception(splash, shotgun_authenticator, str(e))
         return -1
     except ShotgunDesktopError as e:
+        __stop_debug_capture(flush=True)
         __handle_exception(splash, shotgun_authenticator, str(e))
         return -1
     except Exception as e:
+        __stop_debug_capture(flush=True)
         __handle_unexpected_exception(splash, shotgun_authenticator, e, app_bootstrap)
         return -1
+    finally:
+        # Saves the timeline and discards the debug log records if the startup
+        # was interrupted.
+        __stop_debug_capture(flush=False)
+        __save_startup_timeline()
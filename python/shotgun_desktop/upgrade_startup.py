@@ -10,9 +10,11 @@
 
 import sys
 import os
+import threading
 from shotgun_desktop.location import write_location, get_startup_descriptor
 from shotgun_desktop.desktop_message_box import DesktopMessageBox
 from sgtk.descriptor import CheckVersionConstraintsError
+from sgtk.util.timeline import record_span
 
 from sgtk import LogManager
 
@@ -59,14 +61,131 @@ def _out_of_date_check(latest_descriptor, current_desc):
     return latest_descriptor.get_version() != current_desc.get_version()
 
 
-def upgrade_startup(splash, sgtk, app_bootstrap):
+class _UpgradeFailedError(Exception):
     """
-    Tries to upgrade the startup logic. If an update is available, it will be donwloaded to the
-    local cache directory and the startup descriptor will be updated.
+    Raised when an available update of the startup logic couldn't be installed.
+    """
+
+
+class BackgroundStartupUpgrade(object):
+    """
+    Tries to upgrade the startup logic in a background thread, so the round trips to
+    the app store overlap with the rest of the startup. If an update is available, it
+    will be downloaded to the local cache directory and the startup descriptor will be
+    updated.
+
+    The splash screen is only updated from the main thread, while waiting for the
+    upgrade to complete.
+    """
+
+    def __init__(self, sgtk, app_bootstrap):
+        """
+        :param sgtk: The Toolkit API handle.
+        :param app_bootstrap: Application bootstrap instance, used to update the startup descriptor.
+        """
+        self._sgtk = sgtk
+        self._app_bootstrap = app_bootstrap
+        self._message = "Checking for Flow Production Tracking updates..."
+        self._result = False
+        self._error = None
+        self._exception = None
+        self._thread = threading.Thread(target=self._run, name="StartupUpgrade")
+        # Never prevent the app from exiting.
+        self._thread.daemon = True
+
+    @property
+    def message(self):
+        """
+        Message describing what the upgrade is currently doing.
+        """
+        return self._message
+
+    def start(self):
+        """
+        Starts the upgrade.
+        """
+        self._thread.start()
+
+    def wait(self, splash, phase_name):
+        """
+        Waits for the upgrade to complete, reporting its progress on the splash screen.
+
+        :param splash: Splash dialog to update user on what is currently going on.
+        :param phase_name: Name of the splash screen phase reporting the upgrade.
+
+        :returns: True if an update was downloaded and the descriptor updated, False otherwise.
+        """
+        while self._thread.is_alive():
+            splash.start_phase(phase_name, self._message)
+            self._thread.join(0.1)
+        splash.end_phase(phase_name)
+
+        if self._exception:
+            raise self._exception
+
+        if self._error:
+            _report_upgrade_failure(splash, self._sgtk, self._error)
+            return False
+
+        return self._result
+
+    def _run(self):
+        """
+        Runs the upgrade, from the background thread.
+        """
+        try:
+            self._result = _upgrade_startup(
+                self._sgtk, self._app_bootstrap, self._set_message
+            )
+        except _UpgradeFailedError as e:
+            self._error = e
+        except Exception as e:
+            # Raised from the main thread when waiting for the upgrade.
+            self._exception = e
+
+    def _set_message(self, message):
+        """
+        Records what the upgrade is currently doing.
+
+        :param message: Message to display on the splash screen.
+        """
+        self._message = message
+
+
+def _report_upgrade_failure(splash, sgtk, error):
+    """
+    Lets the user know that an update couldn't be installed.
 
+    :param splash: Splash dialog, hidden while the error is displayed.
+    :param sgtk: The Toolkit API handle.
+    :param error: The error raised when installing the update.
+    """
+    splash.hide()
+    # If there is an error updating, don't prevent the user from running the app, but let them
+    # know something wrong is going on.
+    DesktopMessageBox.critical(
+        "Flow Production Tracking update failed",
+        "There is a new update of the PTR desktop component, but it couldn't be installed. The PTR desktop "
+        "app will be launched with the currently installed version of the code.\n"
+        "If this problem persists, please <a href='%s'>contact</a> Flow Production Tracking support.\n"
+        "\n"
+        "Error: %s" % (sgtk.support_url, str(error)),
+    )
+    splash.show()
+
+
+@record_span("desktop")
+def _upgrade_startup(sgtk, app_bootstrap, report_progress):
+    """
+    Tries to upgrade the startup logic, without interacting with the user.
+
+    :param sgtk: The Toolkit API handle.
     :param app_bootstrap: Application bootstrap instance, used to update the startup descriptor.
+    :param report_progress: Callable invoked with a message describing the current step.
 
     :returns: True if an update was downloaded and the descriptor updated, False otherwise.
+
+    :raises _UpgradeFailedError: If an update is available but couldn't be installed.
     """
 
     # It is possible to launch the app with a version of core
@@ -92,7 +211,7 @@ def upgrade_startup(splash, sgtk, app_bootstrap):
         logger.info("Desktop startup using a dev descriptor, skipping update...")
         return False
     else:
-        splash.set_message("Getting Flow Production Tracking updates...")
+        report_progress("Getting Flow Production Tracking updates...")
         logger.info("Getting Flow Production Tracking updates...")
 
     try:
@@ -151,17 +270,5 @@ def upgrade_startup(splash, sgtk, app_bootstrap):
         app_bootstrap.update_startup(latest_descriptor)
         return True
     except Exception as e:
-        splash.hide()
-        # If there is an error updating, don't prevent the user from running the app, but let them
-        # know something wrong is going on.
         logger.exception("Unexpected error when updating startup code.")
-        DesktopMessageBox.critical(
-            "Flow Production Tracking update failed",
-            "There is a new update of the PTR desktop component, but it couldn't be installed. The PTR desktop "
-            "app will be launched with the currently installed version of the code.\n"
-            "If this problem persists, please <a href='%s'>contact</a> Flow Production Tracking support.\n"
-            "\n"
-            "Error: %s" % (sgtk.support_url, str(e)),
-        )
-        splash.show()
-        return False
+        raise _UpgradeFailedError(str(e))
@@ -0,0 +1,164 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks the resolution of the environments of a pipeline configuration,
+comparing copy-on-write views over the yaml cache with deep copies of the
+cached data.
+"""
+
+# system imports
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "python"))
+sys.path.append(python_folder)
+
+# sgtk imports
+from sgtk import LogManager
+from tank.platform import environment_includes
+from tank.util import yaml_cache
+
+from utils import OptionParserLineBreakingEpilog
+
+# set up logging
+logger = LogManager.get_logger("benchmark_yaml_cache")
+
+
+def _resolve_environments(env_files, iterations):
+    """
+    Resolves the includes of all the environment files a number of times.
+
+    :param env_files: List of environment file paths.
+    :param int iterations: Number of times each file is resolved.
+    :returns: Tuple with the time spent in seconds and the peak memory
+        allocated while resolving a single environment, in bytes.
+    """
+    time_before = time.time()
+    for _ in range(iterations):
+        for env_file in env_files:
+            data = yaml_cache.g_yaml_cache.get_view(env_file) or {}
+            environment_includes.process_includes(env_file, data, None)
+    time_spent = time.time() - time_before
+
+    # memory is traced separately, since tracing slows down allocations a lot.
+    peak = 0
+    tracemalloc.start()
+    for env_file in env_files:
+        tracemalloc.reset_peak()
+        (current_before, _) = tracemalloc.get_traced_memory()
+        data = yaml_cache.g_yaml_cache.get_view(env_file) or {}
+        environment_includes.process_includes(env_file, data, None)
+        (_, env_peak) = tracemalloc.get_traced_memory()
+        peak = max(peak, env_peak - current_before)
+    tracemalloc.stop()
+
+    return (time_spent, peak)
+
+
+def _benchmark(config_path, iterations):
+    """
+    Runs the benchmark.
+
+    :param config_path: Path to the configuration folder, containing an env folder.
+    :param int iterations: Number of times each environment is resolved.
+    """
+    env_files = sorted(glob.glob(os.path.join(config_path, "env", "*.yml")))
+    if not env_files:
+        logger.error("No environment files found in %s" % config_path)
+        return
+
+    # populate the cache so only the resolution is measured.
+    _resolve_environments(env_files, 1)
+
+    (view_time, view_peak) = _resolve_environments(env_files, iterations)
+
+    # deep copies are what get() returns, which is how the cached data was
+    # read before views were available.
+    get_view = yaml_cache.g_yaml_cache.get_view
+    yaml_cache.g_yaml_cache.get_view = yaml_cache.g_yaml_cache.get
+    try:
+        (copy_time, copy_peak) = _resolve_environments(env_files, iterations)
+    finally:
+        yaml_cache.g_yaml_cache.get_view = get_view
+
+    logger.info("Resolved %d environments %d times." % (len(env_files), iterations))
+    logger.info(
+        "Deep copies: %.3fs, %d KiB peak allocation per environment."
+        % (copy_time, copy_peak // 1024)
+    )
+    logger.info(
+        "Views:       %.3fs, %d KiB peak allocation per environment."
+        % (view_time, view_peak // 1024)
+    )
+    if copy_time:
+        logger.info("Time saved: %.1f%%" % (100.0 * (1 - view_time / copy_time)))
+
+
+def main():
+    """
+    Main entry point for script.
+
+    Handles argument parsing and validation and then calls the script payload.
+    """
+
+    usage = "%prog [options] config_path"
+
+    desc = "Measures the cost of resolving the environments of a configuration."
+
+    epilog = """
+
+Details and Examples
+--------------------
+
+Provide the path to a configuration folder, containing the env folder:
+
+> python benchmark_yaml_cache.py --iterations 20 /path/to/tk-config-default2
+
+Template based includes are skipped since no context is available.
+
+"""
+    parser = OptionParserLineBreakingEpilog(
+        usage=usage, description=desc, epilog=epilog
+    )
+
+    parser.add_option(
+        "-i",
+        "--iterations",
+        default=10,
+        type="int",
+        help="Number of times each environment is resolved",
+    )
+
+    # parse cmd line
+    options, remaining_args = parser.parse_args()
+
+    if len(remaining_args) != 1:
+        parser.print_help()
+        return 2
+
+    config_path = os.path.expanduser(os.path.expandvars(remaining_args[0]))
+    _benchmark(config_path, options.iterations)
+    return 0
+
+
+if __name__ == "__main__":
+
+    # set up output of all sgtk log messages to stdout
+    LogManager().initialize_custom_handler()
+
+    exit_code = main()
+
+    sys.exit(exit_code)
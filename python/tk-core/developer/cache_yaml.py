@@ -0,0 +1,107 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helper script to write the binary yaml cache of a configuration.
+
+Unlike the tank cache_yaml command, it doesn't need a project: any
+configuration on disk can be processed, for example a configuration
+which is about to be baked or distributed.
+"""
+
+# system imports
+import os
+import sys
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "python"))
+sys.path.append(python_folder)
+
+# sgtk imports
+from sgtk import LogManager
+from tank.util import yaml_cache_file
+
+from utils import OptionParserLineBreakingEpilog
+
+# set up logging
+logger = LogManager.get_logger("cache_yaml")
+
+
+def main():
+    """
+    Main entry point for script.
+
+    Handles argument parsing and validation and then calls the script payload.
+    """
+
+    usage = "%prog [options] config_path"
+
+    desc = "Writes the binary yaml cache of a configuration."
+
+    epilog = """
+
+Details and Examples
+--------------------
+
+Provide the path to the root of a configuration. The cache is written to
+{file_name} in that folder, where it is picked up when the configuration
+is used:
+
+> python cache_yaml.py /path/to/tk-config-default2
+
+""".format(
+        file_name=yaml_cache_file.CACHE_FILE_NAME
+    )
+    parser = OptionParserLineBreakingEpilog(
+        usage=usage, description=desc, epilog=epilog
+    )
+
+    parser.add_option(
+        "-d", "--debug", default=False, action="store_true", help="Enable debug logging"
+    )
+
+    parser.add_option(
+        "-o",
+        "--output",
+        default=None,
+        help="Path to write the cache to, instead of the root of the configuration",
+    )
+
+    # parse cmd line
+    options, remaining_args = parser.parse_args()
+
+    if options.debug:
+        LogManager().global_debug = True
+
+    if len(remaining_args) != 1:
+        parser.print_help()
+        return 2
+
+    config_path = os.path.expanduser(os.path.expandvars(remaining_args[0]))
+    (cache_path, items) = yaml_cache_file.write_config_cache_file(
+        config_path, options.output
+    )
+    logger.info("Wrote %s yaml files to %s" % (len(items), cache_path))
+    return 0
+
+
+if __name__ == "__main__":
+
+    # set up output of all sgtk log messages to stdout
+    LogManager().initialize_custom_handler()
+
+    exit_code = 1
+    try:
+        exit_code = main()
+    except Exception as e:
+        logger.exception("An exception was raised: %s" % e)
+
+    sys.exit(exit_code)
@@ -29,7 +29,12 @@ sys.path.append(python_folder)
 # sgtk imports
 from sgtk import LogManager
 from sgtk.util import filesystem
-from sgtk.descriptor import Descriptor, create_descriptor, is_descriptor_version_missing
+from sgtk.descriptor import (
+    Descriptor,
+    create_descriptor,
+    is_descriptor_version_missing,
+    write_bundle_cache_manifest,
+)
 
 from utils import (
     cache_apps,
@@ -47,7 +52,9 @@ logger = LogManager.get_logger("populate_bundle_cache")
 BUNDLE_CACHE_ROOT_FOLDER_NAME = "bundle_cache"
 
 
-def _build_bundle_cache(sg_connection, target_path, config_descriptor_uri):
+def _build_bundle_cache(
+    sg_connection, target_path, config_descriptor_uri, write_manifest=False
+):
     """
     Perform a build of the bundle cache.
 
@@ -56,6 +63,7 @@ def _build_bundle_cache(sg_connection, target_path, config_descriptor_uri):
     :param sg_connection: Shotgun connection
     :param target_path: Path to build
     :param config_descriptor_uri: Descriptor of the configuration to cache.
+    :param write_manifest: If True, write a manifest of the cached bundles.
     """
     logger.info("The build will generated into '%s'" % target_path)
 
@@ -107,6 +115,10 @@ def _build_bundle_cache(sg_connection, target_path, config_descriptor_uri):
 
     cleanup_bundle_cache(bundle_cache_root)
 
+    if write_manifest:
+        logger.info("Writing bundle cache manifest...")
+        write_bundle_cache_manifest(bundle_cache_root)
+
     logger.info("")
     logger.info("Build complete!")
     logger.info("")
@@ -158,6 +170,16 @@ http://developer.shotgridsoftware.com/tk-core/descriptor
         "-d", "--debug", default=False, action="store_true", help="Enable debug logging"
     )
 
+    parser.add_option(
+        "--manifest",
+        default=False,
+        action="store_true",
+        help=(
+            "Write a manifest of the cached bundles, used to find them without "
+            "accessing the file system when SGTK_BUNDLE_CACHE_MANIFEST=1 is set."
+        ),
+    )
+
     add_authentication_options(parser)
 
     # parse cmd line
@@ -185,7 +207,9 @@ http://developer.shotgridsoftware.com/tk-core/descriptor
     sg_connection = sg_user.create_sg_connection()
 
     # we are all set.
-    _build_bundle_cache(sg_connection, target_path, config_descriptor_str)
+    _build_bundle_cache(
+        sg_connection, target_path, config_descriptor_str, options.manifest
+    )
 
     # all good!
     return 0
@@ -14,9 +14,8 @@ called.
 """
 
 from tank import Hook
+from tank.folder import FolderIOReceiver
 import os
-import shutil
-from tank.util import is_windows
 
 
 class ProcessFolderCreation(Hook):
@@ -103,91 +102,23 @@ class ProcessFolderCreation(Hook):
 
         # set the umask so that we get true permissions
         old_umask = os.umask(0)
-        locations = []
         try:
-
-            # loop through our list of items
-            for i in items:
-
-                action = i.get("action")
-
-                if action in ["entity_folder", "folder"]:
-                    # folder creation
-                    path = i.get("path")
-                    if not os.path.exists(path):
-                        if not preview_mode:
-                            # create the folder using open permissions
-                            os.makedirs(path, 0o777)
-                        locations.append(path)
-
-                elif action == "remote_entity_folder":
-                    # Remote folder creation
-                    #
-                    # NOTE! This action happens when another user has created
-                    # a folder on their machine and we are syncing our local path
-                    # cache to be aware of this folder's existance.
-                    #
-                    # For a traditional setup, where the project storage is shared,
-                    # there is no need to do I/O for remote folders - these folders
-                    # have already been created on the remote storage so you have access
-                    # to them already.
-                    #
-                    # On a setup where each user or group of users is attached to
-                    # different, independendent file storages, which are synced,
-                    # it may be meaningful to "replay" the remote folder creation
-                    # on the local system. This would result in the same folder
-                    # scaffold on each disk which is storing project data.
-                    #
-                    # path = i.get("path")
-                    # if not os.path.exists(path):
-                    #     if not preview_mode:
-                    #         # create the folder using open permissions
-                    #         os.makedirs(path, 0777)
-                    #     locations.append(path)
-                    pass
-
-                elif action == "symlink":
-                    # symbolic link
-                    if is_windows():
-                        # no windows support
-                        continue
-                    path = i.get("path")
-                    target = i.get("target")
-                    # note use of lexists to check existance of symlink
-                    # rather than what symlink is pointing at
-                    if not os.path.lexists(path):
-                        if not preview_mode:
-                            os.symlink(target, path)
-                        locations.append(path)
-
-                elif action == "copy":
-                    # a file copy
-                    source_path = i.get("source_path")
-                    target_path = i.get("target_path")
-                    if not os.path.exists(target_path):
-                        if not preview_mode:
-                            # do a standard file copy
-                            shutil.copy(source_path, target_path)
-                            # set permissions to open
-                            os.chmod(target_path, 0o666)
-                        locations.append(target_path)
-
-                elif action == "create_file":
-                    # create a new file based on content
-                    path = i.get("path")
-                    parent_folder = os.path.dirname(path)
-                    content = i.get("content", "")
-                    if not os.path.exists(parent_folder) and not preview_mode:
-                        os.makedirs(parent_folder, 0o777)
-                    if not os.path.exists(path):
-                        if not preview_mode:
-                            # create the file
-                            fp = open(path, "wb")
-                            fp.write(content.encode("utf-8"))
-                            fp.close()
-                            # and set permissions to open
-                            os.chmod(path, 0o666)
-                        locations.append(path)
+            # The items are processed concurrently by the core, creating parent
+            # folders before their children, which speeds up folder creation on
+            # network storage. To customize how an action is carried out, process
+            # the items in this hook instead, one at a time.
+            #
+            # Note that remote entity folders are not processed: this action happens
+            # when another user has created a folder on their machine and we are
+            # syncing our local path cache to be aware of this folder's existance.
+            # For a traditional setup, where the project storage is shared, these
+            # folders have already been created on the remote storage. On a setup
+            # where users are attached to different, independent file storages which
+            # are synced, it may be meaningful to "replay" the remote folder creation
+            # on the local system, with os.makedirs(i.get("path"), 0o777).
+            #
+            # Symbolic links are not created on Windows.
+            locations = FolderIOReceiver.execute_items(items, preview_mode)
         finally:
             # reset umask
             os.umask(old_umask)
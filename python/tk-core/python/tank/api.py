@@ -14,13 +14,17 @@ Classes for the main Sgtk API.
 
 import os
 import glob
+import threading
+import time
+import weakref
 
 from . import folder
 from . import context
 from .util import shotgun, yaml_cache
 from .errors import TankError, TankMultipleMatchingTemplatesError
-from .path_cache import PathCache
+from .path_cache import PathCacheHandle
 from .template import read_templates
+from .template_index import TemplateIndex
 from . import constants
 from . import pipelineconfig
 from . import pipelineconfig_utils
@@ -83,6 +87,21 @@ class Sgtk(object):
         # cache of local storages
         self.__cache = {}
 
+        # index used to look up templates from paths, built on demand.
+        self.__template_index = None
+
+        # long lived path cache access, its database is opened on demand and
+        # closed when this instance is garbage collected.
+        self.__path_cache_handle = PathCacheHandle(self)
+        weakref.finalize(self, self.__path_cache_handle.close)
+
+        # folder configuration built from the schema, with the signature of
+        # the schema it was built from.
+        self.__folder_configuration = None
+        self.__folder_configuration_signature = None
+        self.__folder_configuration_check_time = 0
+        self.__folder_configuration_lock = threading.Lock()
+
     def __repr__(self):
         return "<Sgtk Core %s@0x%08x Config %s>" % (
             self.version,
@@ -108,6 +127,75 @@ class Sgtk(object):
         """
         return self.__pipeline_config
 
+    def _get_path_cache_handle(self):
+        """
+        Returns the long lived handle used to look up the path cache.
+
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+
+        :returns: :class:`~tank.path_cache.PathCacheHandle` instance.
+        """
+        return self.__path_cache_handle
+
+    def _close_path_cache_handle(self):
+        """
+        Closes the database connection of the long lived path cache handle,
+        releasing the path cache file. It is opened again the next time a
+        lookup is made.
+
+        This should be called before the path cache file is replaced or
+        rebuilt, and when the path cache is no longer needed.
+
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+        """
+        self.__path_cache_handle.close()
+
+    def _get_folder_configuration(self):
+        """
+        Returns the folder configuration built from the folder creation schema.
+
+        The configuration is built the first time it is needed and reused
+        until a file of the schema is modified, so successive folder creation
+        requests don't read the whole schema again. The schema is checked for
+        modifications at most every
+        :data:`~tank.constants.FOLDER_CONFIGURATION_CHECK_INTERVAL` seconds.
+
+        The configuration holds no Shotgun data, so it can be used by several
+        folder creation requests at once.
+
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+
+        :returns: :class:`~tank.folder.FolderConfiguration` instance.
+        """
+        schema_location = self.pipeline_configuration.get_schema_config_location()
+
+        with self.__folder_configuration_lock:
+            now = time.time()
+            if (
+                self.__folder_configuration is not None
+                and self.__folder_configuration_signature[0] == schema_location
+                and now - self.__folder_configuration_check_time
+                < constants.FOLDER_CONFIGURATION_CHECK_INTERVAL
+            ):
+                return self.__folder_configuration
+
+            signature = (schema_location, folder.get_schema_signature(schema_location))
+            if (
+                self.__folder_configuration is None
+                or self.__folder_configuration_signature != signature
+            ):
+                log.debug("Loading folder configuration from %s" % schema_location)
+                self.__folder_configuration = folder.FolderConfiguration(
+                    self, schema_location
+                )
+                self.__folder_configuration_signature = signature
+            self.__folder_configuration_check_time = now
+
+            return self.__folder_configuration
+
     def execute_core_hook(self, hook_name, **kwargs):
         """
         Executes a core level hook, passing it any keyword arguments supplied.
@@ -449,11 +537,38 @@ class Sgtk(object):
         :returns: list of :class:`TemplatePath` or [] if no match could be found.
         """
         matched_templates = []
-        for key, template in self.templates.items():
+        for template in self.__get_template_index().get_candidates(path):
             if template.validate(path):
                 matched_templates.append(template)
         return matched_templates
 
+    @property
+    def template_index_stats(self):
+        """
+        Statistics about the index used by :meth:`templates_from_path` and
+        :meth:`template_from_path` to narrow down the templates a path is
+        validated against.
+
+        :returns: Dictionary with the number of ``templates`` indexed, the number
+            of ``lookups`` done, the average number of ``candidates`` validated per
+            lookup and the ``hit_rate``, the ratio of templates which didn't need
+            to be validated.
+        """
+        return self.__get_template_index().stats
+
+    def __get_template_index(self):
+        """
+        Returns the index of the current templates, building it if needed.
+
+        :returns: :class:`TemplateIndex` instance.
+        """
+        templates = self.templates
+        if self.__template_index is None or not self.__template_index.is_valid_for(
+            templates
+        ):
+            self.__template_index = TemplateIndex(templates)
+        return self.__template_index
+
     def template_from_path(self, path):
         """
         Finds a template that matches the given path::
@@ -747,11 +862,9 @@ class Sgtk(object):
         """
 
         # Use the path cache to look up all paths associated with this entity
-        path_cache = PathCache(self)
-        paths = path_cache.get_paths(entity_type, entity_id, primary_only=True)
-        path_cache.close()
-
-        return paths
+        return self._get_path_cache_handle().get_paths(
+            entity_type, entity_id, primary_only=True
+        )
 
     def entity_from_path(self, path):
         """
@@ -765,11 +878,7 @@ class Sgtk(object):
                   if no path was associated.
         """
         # Use the path cache to look up all paths associated with this entity
-        path_cache = PathCache(self)
-        entity = path_cache.get_entity(path)
-        path_cache.close()
-
-        return entity
+        return self._get_path_cache_handle().get_entity(path)
 
     def context_empty(self):
         """
@@ -882,7 +991,11 @@ class Sgtk(object):
                           By default, the sync is incremental.
         :returns: List of folders that were synchronized.
         """
-        return folder.synchronize_folders(self, full_sync)
+        try:
+            return folder.synchronize_folders(self, full_sync)
+        finally:
+            if self.__path_cache_handle:
+                self.__path_cache_handle.invalidate()
 
     def create_filesystem_structure(self, entity_type, entity_id, engine=None):
         """
@@ -916,6 +1029,30 @@ class Sgtk(object):
         )
         return len(folders)
 
+    def create_filesystem_structure_for_entities(self, entities, engine=None):
+        """
+        Create folders and associated data on disk for several entities, possibly
+        of different types, at once.
+
+        This is equivalent to calling :meth:`create_filesystem_structure` for each
+        entity, but the folder creation schema is only processed once and the path
+        cache is only updated once for all the entities::
+
+            >>> tk.create_filesystem_structure_for_entities(
+            ...     [("Shot", 1234), ("Shot", 1235), ("Asset", 12)]
+            ... )
+
+        :param entities: List of (entity type, entity id) tuples.
+        :param engine: Optional engine name to indicate that a second, engine specific
+                       folder creation pass should be executed for a particular engine.
+                       See :meth:`create_filesystem_structure`.
+        :returns: The number of folders processed
+        """
+        folders = folder.process_filesystem_structure_for_entities(
+            self, entities, False, engine
+        )
+        return len(folders)
+
     def preview_filesystem_structure(self, entity_type, entity_id, engine=None):
         """
         Previews folders that would be created by :meth:`create_filesystem_structure`.
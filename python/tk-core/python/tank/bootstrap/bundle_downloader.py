@@ -52,6 +52,21 @@ class BundleDownloader(object):
         )
         self._hook_instance.init(connection, pipeline_config_id, descriptor)
 
+    def prepare_concurrent_download(self, descriptor):
+        """
+        Prepares a bundle to be downloaded by :meth:`download_bundle` from another
+        thread, see :meth:`IODescriptorBase.prepare_concurrent_download`.
+
+        Bundles downloaded through the bootstrap hook are never downloaded from
+        another thread, as the hook may use the Shotgun connection.
+
+        :param descriptor: Descriptor of the bundle to download.
+        :returns: True if the bundle can be downloaded from another thread.
+        """
+        if self._hook_instance.can_cache_bundle(descriptor):
+            return False
+        return descriptor._io_descriptor.prepare_concurrent_download()
+
     def download_bundle(self, descriptor):
         """
         Downloads a bundle referenced by a descriptor.
@@ -8,6 +8,7 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import concurrent.futures
 import os
 import sys
 import traceback
@@ -16,6 +17,7 @@ import pprint
 from . import constants
 
 from ..descriptor import create_descriptor, Descriptor
+from ..descriptor.io_descriptor.bundle_cache_index import g_bundle_cache_index
 from .errors import TankBootstrapError, TankMissingTankNameError
 
 from ..util import filesystem, version
@@ -72,6 +74,9 @@ class CachedConfiguration(Configuration):
         self._bundle_cache_fallback_paths = bundle_cache_fallback_paths
 
         self._config_writer = ConfigurationWriter(self._path, self._sg_connection)
+        # manifest of the dev or path descriptors, computed when checking if
+        # the configuration can be updated in place.
+        self._descriptor_manifest = None
 
     def __str__(self):
         """
@@ -229,12 +234,27 @@ class CachedConfiguration(Configuration):
             # our desired configuration's descriptor matches
             # the config that is already installed however the descriptor
             # reports that it is not immutable, e.g. it can change at any
-            # point (e.g like a dev or path descriptor). Assume a worst case
-            # in this case - that the config that is cached locally is
-            # not the same as the source descriptor it is based on.
+            # point (e.g like a dev or path descriptor). Compare its files
+            # with the ones it had when the config was written.
+            try:
+                self._descriptor_manifest = self._get_descriptor_manifest()
+            except Exception as e:
+                log.debug("Cannot snapshot the files of %r: %s" % (self._descriptor, e))
+                self._descriptor_manifest = None
+
+            if (
+                self._descriptor_manifest
+                and self._get_stored_descriptor_manifest() == self._descriptor_manifest
+            ):
+                log.debug(
+                    "The dev or path descriptors of your configuration haven't "
+                    "changed. Local config is up to date"
+                )
+                return self.LOCAL_CFG_UP_TO_DATE
+
             log.debug(
-                "Your configuration contains dev or path descriptors. "
-                "Triggering full config rebuild."
+                "Your configuration contains dev or path descriptors which "
+                "changed. Triggering config update."
             )
 
             return self.LOCAL_CFG_DIFFERENT
@@ -250,9 +270,27 @@ class CachedConfiguration(Configuration):
 
         This method fails gracefully and attempts to roll back to a
         stable state on failure.
+
+        Configurations using a dev or path descriptor are updated in place
+        when only the files of the config changed since it was written, see
+        :meth:`_update_configuration_incrementally`.
         """
+        if self._can_update_incrementally():
+            try:
+                self._update_configuration_incrementally()
+                return
+            except Exception:
+                log.debug(
+                    "An exception was raised when trying to update the config "
+                    "descriptor %r in place, it will be installed again. "
+                    "Exception traceback details: %s"
+                    % (self._descriptor.get_uri(), traceback.format_exc())
+                )
 
         self._config_writer.start_transaction()
+        # the manifest of the previous config no longer describes the config
+        # until this update completes.
+        self._config_writer.delete_descriptor_manifest()
 
         # stow away any previous versions of core and config folders
         try:
@@ -283,6 +321,20 @@ class CachedConfiguration(Configuration):
             self._try_initialize_configuration_cacher()
             core_descriptor = self._ensure_core_local()
 
+            # snapshot the files before they are copied, so files changed during
+            # the copy are updated the next time. The snapshot only allows the
+            # next updates to be incremental, so failing to take it doesn't
+            # prevent the config from being installed.
+            descriptor_manifest = None
+            if not self._descriptor.is_immutable():
+                try:
+                    descriptor_manifest = self._get_descriptor_manifest()
+                except Exception as e:
+                    log.warning(
+                        "Cannot snapshot the files of %r, it will be installed "
+                        "again the next time it is used: %s" % (self._descriptor, e)
+                    )
+
             # Log information about the core being setup with this config.
             self._log_core_information(core_descriptor)
 
@@ -298,37 +350,8 @@ class CachedConfiguration(Configuration):
                 # Old-style config, so copy the contents inside it.
                 self._descriptor.copy(os.path.join(self._path.current_os, "config"))
 
-            # if the config has a local bundle cache folder, append it to the
-            # list of fallback paths. this allows bundles to be included with
-            # the config, making it self contained and not requiring additional
-            # bundle downloads
-            local_bundle_cache_path = os.path.join(
-                self._descriptor.get_config_folder(), constants.BUNDLE_CACHE_FOLDER_NAME
-            )
-            if os.path.exists(local_bundle_cache_path):
-                log.debug(
-                    "Local bundle cache found in config. "
-                    "Adding local bundle cache as fallback path: %s"
-                    % (local_bundle_cache_path,)
-                )
-                self._bundle_cache_fallback_paths.append(local_bundle_cache_path)
-            else:
-                log.debug("No local bundle cache found in config.")
-
-            # write out config files
-            self._config_writer.write_install_location_file()
-            self._config_writer.write_config_info_file(self._descriptor)
-            self._config_writer.write_shotgun_file(self._descriptor)
-            self._config_writer.write_pipeline_config_file(
-                self._pipeline_config_id,
-                self._project_id,
-                self._plugin_id,
-                self._bundle_cache_fallback_paths,
-                self._descriptor,
-            )
-
-            # make sure roots file reflects current paths
-            self._config_writer.update_roots_file(self._descriptor)
+            self._add_local_bundle_cache_fallback_path()
+            self._write_config_files()
 
             # and lastly install core
             self._config_writer.install_core(core_descriptor)
@@ -389,6 +412,16 @@ class CachedConfiguration(Configuration):
             )
             log.debug("Latest backup cleanup complete.")
 
+            if descriptor_manifest:
+                # the config can now be updated in place when its files change.
+                try:
+                    self._config_writer.write_descriptor_manifest(descriptor_manifest)
+                except Exception as e:
+                    log.warning(
+                        "Failed to write the descriptor manifest of the "
+                        "configuration: %s" % e
+                    )
+
         # @todo - prime caches (yaml, path cache)
 
         # make sure tank command and interpreter files are up to date
@@ -396,6 +429,169 @@ class CachedConfiguration(Configuration):
 
         self._config_writer.end_transaction()
 
+    def _can_update_incrementally(self):
+        """
+        Checks if the configuration can be updated in place by
+        :meth:`_update_configuration_incrementally`.
+
+        :returns: True if the config uses a dev or path descriptor, was
+            completely written from the same descriptor and core, and only its
+            files changed since.
+        """
+        if self._descriptor.is_immutable():
+            return False
+
+        config_path = self._path.current_os
+        for path in [
+            os.path.join(config_path, "config"),
+            os.path.join(config_path, "install", "core"),
+        ]:
+            if not os.path.exists(path):
+                return False
+
+        if self._config_writer.is_transaction_pending():
+            return False
+
+        stored_manifest = self._get_stored_descriptor_manifest()
+        if not stored_manifest:
+            return False
+
+        if self._descriptor_manifest is None:
+            try:
+                self._descriptor_manifest = self._get_descriptor_manifest()
+            except Exception as e:
+                log.debug("Cannot snapshot the files of %r: %s" % (self._descriptor, e))
+                return False
+
+        # a different core requires a full install
+        for key in [
+            "deploy_generation",
+            "config_descriptor",
+            "core_descriptor",
+            "core",
+        ]:
+            if stored_manifest[key] != self._descriptor_manifest[key]:
+                return False
+
+        return True
+
+    def _update_configuration_incrementally(self):
+        """
+        Updates a configuration using a dev or path descriptor in place.
+
+        Only the files of the config which changed since it was written are
+        copied, and the files generated from Shotgun data are written again.
+        The core is left as is, as it didn't change, which saves backing up
+        and copying the whole config and core on each launch while the
+        config is being developed.
+
+        Must only be called when :meth:`_can_update_incrementally` is True.
+        """
+        stored_manifest = self._get_stored_descriptor_manifest()
+        descriptor_manifest = self._descriptor_manifest
+
+        self._config_writer.start_transaction()
+        self._config_writer.delete_descriptor_manifest()
+
+        self._descriptor.ensure_local()
+        self._try_initialize_configuration_cacher()
+
+        # v1 of the lean_config allows to run the config from the bundle cache.
+        if (
+            self._descriptor.get_associated_core_feature_info(
+                "bootstrap.lean_config.version", 0
+            )
+            < 1
+        ):
+            # Old-style config, so update the contents copied from it.
+            (copied_files, removed_files) = self._config_writer.sync_config(
+                self._descriptor,
+                stored_manifest["config"],
+                descriptor_manifest["config"],
+            )
+            log.debug(
+                "Updated config in place: %d files copied, %d files removed."
+                % (len(copied_files), len(removed_files))
+            )
+
+        self._add_local_bundle_cache_fallback_path()
+        self._write_config_files()
+        self._config_writer.write_descriptor_manifest(descriptor_manifest)
+
+        self._config_writer.end_transaction()
+
+    def _get_descriptor_manifest(self):
+        """
+        Returns a manifest of the files of the dev or path descriptors the
+        configuration is written from: the config descriptor and its core, if
+        it is a dev or path descriptor too.
+
+        :returns: Dictionary to compare with the manifest written when the
+            configuration was last updated.
+        """
+        manifest = {
+            "deploy_generation": constants.BOOTSTRAP_LOGIC_GENERATION,
+            "config_descriptor": self._descriptor.get_dict(),
+            # the same files as the ones copied by Descriptor.copy()
+            "config": filesystem.get_folder_snapshot(self._descriptor.get_path()),
+            "core_descriptor": self._descriptor.associated_core_descriptor,
+            "core": None,
+        }
+
+        if manifest["core_descriptor"]:
+            core_descriptor = self._descriptor.resolve_core_descriptor()
+            if not core_descriptor.is_immutable():
+                manifest["core"] = filesystem.get_folder_snapshot(
+                    core_descriptor.get_path()
+                )
+
+        return manifest
+
+    def _get_stored_descriptor_manifest(self):
+        """
+        :returns: The manifest written when the configuration was last updated,
+            or None if there is none.
+        """
+        return self._config_writer.read_descriptor_manifest()
+
+    def _add_local_bundle_cache_fallback_path(self):
+        """
+        If the config has a local bundle cache folder, append it to the
+        list of fallback paths. this allows bundles to be included with
+        the config, making it self contained and not requiring additional
+        bundle downloads
+        """
+        local_bundle_cache_path = os.path.join(
+            self._descriptor.get_config_folder(), constants.BUNDLE_CACHE_FOLDER_NAME
+        )
+        if os.path.exists(local_bundle_cache_path):
+            log.debug(
+                "Local bundle cache found in config. "
+                "Adding local bundle cache as fallback path: %s"
+                % (local_bundle_cache_path,)
+            )
+            self._bundle_cache_fallback_paths.append(local_bundle_cache_path)
+        else:
+            log.debug("No local bundle cache found in config.")
+
+    def _write_config_files(self):
+        """
+        Writes out the files generated in the config folder.
+        """
+        self._config_writer.write_install_location_file()
+        self._config_writer.write_config_info_file(self._descriptor)
+        self._config_writer.write_shotgun_file(self._descriptor)
+        self._config_writer.write_pipeline_config_file(
+            self._pipeline_config_id,
+            self._project_id,
+            self._plugin_id,
+            self._bundle_cache_fallback_paths,
+            self._descriptor,
+        )
+
+        # make sure roots file reflects current paths
+        self._config_writer.update_roots_file(self._descriptor)
+
     def _ensure_core_local(self):
         """
         Ensures that the core for the current config has been cached to disk.
@@ -478,7 +674,14 @@ class CachedConfiguration(Configuration):
         :param pipeline_configuration: PipelineConfiguration we're bootstrapping into.
         :param engine_constraint: Name of the engine to constrain the caching to.
         :param progress_cb: Callback to invoke to report progress on bundle caching. The expected
-            signature is: ``def progress_cb(message, current_bundle_idx, nb_total_bundles)``
+            signature is: ``def progress_cb(message, current_bundle_idx, nb_total_bundles)``.
+            It is always invoked from the calling thread with an increasing index.
+
+        Missing bundles are downloaded concurrently, except the ones which need
+        the Shotgun connection, see :meth:`IODescriptorBase.prepare_concurrent_download`.
+        Each download still goes through
+        :meth:`IODescriptorDownloadable.open_write_location`, so bundles are only
+        ever moved into the bundle cache once fully written.
 
         """
         log.debug("Checking that all bundles are cached locally...")
@@ -498,6 +701,10 @@ class CachedConfiguration(Configuration):
         # Reinitialize the configuration cacher so we use the new swapped core's.
         self._try_initialize_configuration_cacher()
 
+        # bundles may have been added to or removed from the bundle cache since
+        # it was indexed, so look them up on disk again.
+        g_bundle_cache_index.clear()
+
         descriptors = {}
         # pass 1 - populate list of all descriptors
         for env_name in pipeline_configuration.get_environments():
@@ -514,33 +721,136 @@ class CachedConfiguration(Configuration):
                 descriptor = env_obj.get_framework_descriptor(framework)
                 descriptors[descriptor.get_uri()] = descriptor
 
-        # pass 2 - download all apps
-        for idx, descriptor in enumerate(descriptors.values()):
-            if not descriptor.exists_local():
-                message = "Downloading %s (%s of %s)..." % (
+        # pass 2 - check which bundles are missing from the bundle cache
+        nb_descriptors = len(descriptors)
+        nb_processed = 0
+        missing_descriptors = []
+        for descriptor in descriptors.values():
+            if descriptor.exists_local():
+                message = "Checking %s (%s of %s)." % (
                     descriptor,
-                    idx + 1,
-                    len(descriptors),
+                    nb_processed + 1,
+                    nb_descriptors,
+                )
+                log.debug(
+                    "%s exists locally at '%s'.", descriptor, descriptor.get_path()
                 )
-                progress_cb(message, idx, len(descriptors))
+                progress_cb(message, nb_processed, nb_descriptors)
+                nb_processed += 1
+            else:
+                missing_descriptors.append(descriptor)
+
+        if not missing_descriptors:
+            return
+
+        # pass 3 - download the missing bundles through a pool of workers.
+        # Bundles which can't be downloaded from another thread, for example
+        # because they need the Shotgun connection, are downloaded from the
+        # calling thread meanwhile. Progress is always reported from the calling
+        # thread, in the order in which the downloads complete, so the progress
+        # index keeps increasing.
+        concurrent_descriptors = []
+        sequential_descriptors = []
+        for descriptor in missing_descriptors:
+            if self._prepare_concurrent_download(descriptor):
+                concurrent_descriptors.append(descriptor)
+            else:
+                sequential_descriptors.append(descriptor)
+
+        max_workers = max(
+            1,
+            min(self._get_bundle_download_workers(), len(concurrent_descriptors)),
+        )
+        log.debug(
+            "Downloading %d bundles using %d workers and %d bundles sequentially...",
+            len(concurrent_descriptors),
+            max_workers,
+            len(sequential_descriptors),
+        )
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for descriptor in concurrent_descriptors:
+                futures[pool.submit(self._download_bundle, descriptor)] = descriptor
+
+            for descriptor in sequential_descriptors:
                 try:
                     self._download_bundle(descriptor)
                 except Exception as e:
-                    log.error(
-                        "Downloading %r failed to complete successfully. This bundle will be skipped.",
-                        e,
-                    )
-                    log.exception(e)
-            else:
-                message = "Checking %s (%s of %s)." % (
-                    descriptor,
-                    idx + 1,
-                    len(descriptors),
+                    self._log_bundle_download_failure(e)
+                progress_cb(
+                    "Downloaded %s (%s of %s)."
+                    % (descriptor, nb_processed + 1, nb_descriptors),
+                    nb_processed,
+                    nb_descriptors,
                 )
-                log.debug(
-                    "%s exists locally at '%s'.", descriptor, descriptor.get_path()
+                nb_processed += 1
+
+            for future in concurrent.futures.as_completed(futures):
+                descriptor = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    self._log_bundle_download_failure(e)
+                progress_cb(
+                    "Downloaded %s (%s of %s)."
+                    % (descriptor, nb_processed + 1, nb_descriptors),
+                    nb_processed,
+                    nb_descriptors,
                 )
-                progress_cb(message, idx, len(descriptors))
+                nb_processed += 1
+
+    def _prepare_concurrent_download(self, descriptor):
+        """
+        Prepares a bundle to be downloaded from a worker thread by
+        :meth:`cache_bundles`.
+
+        :param descriptor: Descriptor of the bundle to download.
+        :returns: True if the bundle can be downloaded from a worker thread,
+            False if it must be downloaded from the calling thread.
+        """
+        try:
+            if self._bundle_downloader:
+                return self._bundle_downloader.prepare_concurrent_download(descriptor)
+            return descriptor._io_descriptor.prepare_concurrent_download()
+        except Exception as e:
+            # the download will run into the same problem and report it.
+            log.debug("Cannot download %s concurrently: %s" % (descriptor, e))
+            return False
+
+    def _log_bundle_download_failure(self, error):
+        """
+        Logs that a bundle couldn't be downloaded by :meth:`cache_bundles`.
+
+        :param error: The exception raised by the download.
+        """
+        log.error(
+            "Downloading %r failed to complete successfully. This bundle will be skipped.",
+            error,
+        )
+        log.exception(error)
+
+    def _get_bundle_download_workers(self):
+        """
+        Returns the number of bundles that can be downloaded concurrently.
+
+        The value can be overridden through the ``SGTK_BUNDLE_DOWNLOAD_WORKERS``
+        environment variable.
+
+        :returns: Number of download workers, always at least 1.
+        """
+        workers_str = os.environ.get(constants.BUNDLE_DOWNLOAD_WORKERS_ENV_VAR)
+        if not workers_str:
+            return constants.DEFAULT_BUNDLE_DOWNLOAD_WORKERS
+
+        try:
+            return max(1, int(workers_str))
+        except ValueError:
+            log.error(
+                "Environment variable %s value '%s' is not an integer number and "
+                "will be ignored."
+                % (constants.BUNDLE_DOWNLOAD_WORKERS_ENV_VAR, workers_str)
+            )
+            return constants.DEFAULT_BUNDLE_DOWNLOAD_WORKERS
 
     def _cleanup_backup_folders(
         self, config_backup_folder_path, core_backup_folder_path
@@ -10,13 +10,17 @@
 
 import os
 import sys
+import json
+import shutil
 import datetime
+import py_compile
 
 from . import constants
 
 from ..descriptor import Descriptor, create_descriptor, is_descriptor_version_missing
+from ..descriptor import constants as descriptor_constants
 
-from ..util import filesystem
+from ..util import bytecode, filesystem
 from ..util import StorageRoots
 from ..util.shotgun import connection
 from ..util.move_guard import MoveGuard
@@ -95,6 +99,14 @@ class ConfigurationWriter(object):
         log.debug("Copying core into place")
         core_descriptor.copy(core_target_path)
 
+        if os.environ.get(descriptor_constants.COMPILE_BUNDLES_ENV_VAR, "0") == "1":
+            # the installed core can be edited, so its byte code is checked
+            # against its sources.
+            bytecode.compile_folder(
+                core_target_path,
+                invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+            )
+
     def get_descriptor_metadata_file(self):
         """
         Returns the path to the metadata file holding descriptor information.
@@ -354,6 +366,114 @@ class ConfigurationWriter(object):
             # write yaml
             yaml.safe_dump(metadata, fh)
 
+    def get_descriptor_manifest_file(self):
+        """
+        Returns the path to the file holding the snapshot of the files of the
+        dev or path descriptors the configuration was written from. It is
+        stored next to the descriptor metadata file.
+
+        :return: path
+        """
+        return os.path.join(
+            os.path.dirname(self.get_descriptor_metadata_file()),
+            constants.DESCRIPTOR_MANIFEST_FILE,
+        )
+
+    def read_descriptor_manifest(self):
+        """
+        Reads the descriptor manifest written by :meth:`write_descriptor_manifest`.
+
+        :returns: The manifest dictionary, or None if there is no valid manifest.
+        """
+        manifest_file = self.get_descriptor_manifest_file()
+        try:
+            with open(manifest_file, "rt") as fh:
+                manifest = json.load(fh)
+        except (IOError, OSError):
+            return None
+        except Exception as e:
+            log.warning(
+                "Cannot parse file '%s' - ignoring. Error: %s" % (manifest_file, e)
+            )
+            return None
+
+        if (
+            not isinstance(manifest, dict)
+            or manifest.pop("version", None) != constants.DESCRIPTOR_MANIFEST_VERSION
+        ):
+            log.debug(
+                "Ignoring descriptor manifest '%s' of another version." % manifest_file
+            )
+            return None
+
+        return manifest
+
+    def write_descriptor_manifest(self, manifest):
+        """
+        Writes the descriptor manifest of the configuration.
+
+        The file is written next to its final location first and then moved in
+        place, so readers never see a partially written file.
+
+        :param dict manifest: Dictionary describing the files of the dev or path
+            descriptors the configuration was written from.
+        """
+        manifest = dict(manifest, version=constants.DESCRIPTOR_MANIFEST_VERSION)
+        manifest_file = self.get_descriptor_manifest_file()
+        tmp_file = "%s.%d.tmp" % (manifest_file, os.getpid())
+        try:
+            with open(tmp_file, "wt") as fh:
+                json.dump(manifest, fh)
+            os.replace(tmp_file, manifest_file)
+        except Exception:
+            filesystem.safe_delete_file(tmp_file)
+            raise
+
+    def delete_descriptor_manifest(self):
+        """
+        Deletes the descriptor manifest of the configuration, if any.
+        """
+        filesystem.safe_delete_file(self.get_descriptor_manifest_file())
+
+    @filesystem.with_cleared_umask
+    def sync_config(self, config_descriptor, old_snapshot, new_snapshot):
+        """
+        Updates a configuration previously copied from a config descriptor
+        with the files of the descriptor which changed since.
+
+        :param config_descriptor: Config descriptor object
+        :param dict old_snapshot: Snapshot of the files of the descriptor when
+            it was copied, as returned by
+            :meth:`~tank.util.filesystem.get_folder_snapshot`.
+        :param dict new_snapshot: Current snapshot of the files of the descriptor.
+        :returns: Tuple of the lists of the files which were copied and removed.
+        """
+        source_folder = config_descriptor.get_path()
+        config_folder = os.path.join(self._path.current_os, "config")
+
+        removed_files = sorted(set(old_snapshot) - set(new_snapshot))
+        for relative_path in removed_files:
+            target_file = os.path.join(config_folder, *relative_path.split("/"))
+            log.debug("Removing %s" % target_file)
+            filesystem.safe_delete_file(target_file)
+
+        copied_files = sorted(
+            relative_path
+            for (relative_path, signature) in new_snapshot.items()
+            if old_snapshot.get(relative_path) != signature
+        )
+        for relative_path in copied_files:
+            source_file = os.path.join(source_folder, *relative_path.split("/"))
+            target_file = os.path.join(config_folder, *relative_path.split("/"))
+            log.debug("Copying %s -> %s" % (source_file, target_file))
+            filesystem.ensure_folder_exists(os.path.dirname(target_file))
+            shutil.copy(source_file, target_file)
+            # same permissions as the ones copy_folder sets
+            if os.path.splitext(target_file)[1] in (".sh", ".bat", ".exe"):
+                os.chmod(target_file, 0o775)
+
+        return (copied_files, removed_files)
+
     def write_shotgun_file(self, descriptor):
         """
         Writes config/core/shotgun.yml
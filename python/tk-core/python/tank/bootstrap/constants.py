@@ -73,6 +73,39 @@ PIPELINE_CONFIG_ID_ENV_VAR = "SHOTGUN_PIPELINE_CONFIGURATION_ID"
 # environment variable that is used to indicate which bundle caches to be used.
 BUNDLE_CACHE_FALLBACK_PATHS_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_FALLBACK_PATHS"
 
+# environment variable that can be used to control how many bundles are
+# downloaded concurrently when caching the bundles of a configuration.
+# Setting it to 1 restores a strictly sequential download.
+BUNDLE_DOWNLOAD_WORKERS_ENV_VAR = "SGTK_BUNDLE_DOWNLOAD_WORKERS"
+
+# default number of concurrent bundle downloads. Most of the time spent
+# downloading from the app store is waiting on round trips rather than
+# on bandwidth, so a handful of workers gives the best results.
+DEFAULT_BUNDLE_DOWNLOAD_WORKERS = 4
+
+# environment variable that can be set to persist the listing of the packages
+# of a core next to it the first time it is imported from, so subsequent
+# launches can locate its modules without listing its folders again. This is
+# only meant for cores which never change, like the ones in the bundle cache.
+PERSIST_CORE_IMPORT_INDEX_ENV_VAR = "SGTK_PERSIST_CORE_IMPORT_INDEX"
+
+# name of the file the listing of the packages of a core is persisted to.
+CORE_IMPORT_INDEX_FILE_NAME = ".sgtk_import_index.json"
+
+# name of the file stored next to the descriptor metadata file of a cached
+# configuration using a dev or path descriptor. It holds a snapshot of the files
+# of the descriptor taken when the configuration was written, so unchanged
+# configurations don't need to be written again.
+DESCRIPTOR_MANIFEST_FILE = "descriptor_manifest.json"
+
+# version of the format of the descriptor manifest file.
+DESCRIPTOR_MANIFEST_VERSION = 1
+
+# environment variable that can be set to store byte code in the user's cache
+# folder when a bundle cache fallback path is read-only, instead of compiling
+# the code imported from it on each launch.
+USER_PYCACHE_ENV_VAR = "SGTK_USER_PYCACHE"
+
 # the name of the folder within the config where bundles are cached.
 BUNDLE_CACHE_FOLDER_NAME = "bundle_cache"
 
@@ -8,18 +8,164 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import importlib.machinery
 import importlib.util
+import json
 import os
 import sys
 import uuid
 import warnings
 
 from .. import LogManager
+from ..util import bytecode
+from ..util.timeline import Timeline, record_span
+from . import constants
 
 log = LogManager.get_logger(__name__)
 
 
+class _CorePackageIndex(object):
+    """
+    Listing of the package folders of a core, used to locate its modules
+    without probing the file system for each candidate location.
+
+    The listing is built by walking the core's package folders once, and can
+    be persisted next to the core so it doesn't need to be walked again. The
+    modification time of each folder is recorded with its listing, so a
+    persisted index is discarded when files were added to or removed from
+    the core after it was written.
+    """
+
+    # version of the persisted index, to be increased when its content changes.
+    _FORMAT_VERSION = 2
+
+    def __init__(self, core_path, folders):
+        """
+        :param str core_path: Path to the core the index is for.
+        :param dict folders: Dictionary keyed by folder path relative to the core,
+            using forward slashes, of tuples with the list of sub folder names,
+            the list of file names found in the folder and the modification
+            time of the folder in nanoseconds.
+        """
+        self._core_path = os.path.normpath(core_path)
+        self._folders = {}
+        self._mtimes = {}
+        for (relative_path, (dir_names, file_names, mtime)) in folders.items():
+            folder = os.path.normpath(
+                os.path.join(self._core_path, *relative_path.split("/"))
+            )
+            self._folders[folder] = (frozenset(dir_names), frozenset(file_names))
+            self._mtimes[folder] = mtime
+
+    @classmethod
+    def build(cls, core_path, package_names):
+        """
+        Builds the index by walking the package folders of a core.
+
+        :param str core_path: Path to the core.
+        :param list package_names: Names of the top level packages to index.
+        :returns: A :class:`_CorePackageIndex` instance.
+        """
+        folders = {}
+        for package_name in package_names:
+            package_path = os.path.join(core_path, package_name)
+            for (root, dir_names, file_names) in os.walk(package_path):
+                # byte code is never imported through the index.
+                if "__pycache__" in dir_names:
+                    dir_names.remove("__pycache__")
+                relative_path = os.path.relpath(root, core_path)
+                folders[relative_path.replace(os.path.sep, "/")] = (
+                    list(dir_names),
+                    [name for name in file_names if name.endswith(".py")],
+                    os.stat(root).st_mtime_ns,
+                )
+        # the core folder itself only needs to list the indexed packages.
+        folders["."] = (
+            [name for name in package_names if name.replace(".", "/") in folders],
+            [],
+            os.stat(core_path).st_mtime_ns,
+        )
+        return cls(core_path, folders)
+
+    @classmethod
+    def load(cls, index_path, core_path):
+        """
+        Loads a persisted index.
+
+        :param str index_path: Path to the persisted index.
+        :param str core_path: Path to the core the index is for.
+        :returns: A :class:`_CorePackageIndex` instance, or None if the index
+            couldn't be loaded.
+        """
+        try:
+            with open(index_path, "r") as fh:
+                data = json.load(fh)
+            if data.get("version") != cls._FORMAT_VERSION:
+                return None
+            package_index = cls(core_path, data["folders"])
+            # a folder modified since the index was written may have had
+            # modules added or removed.
+            for (folder, mtime) in package_index._mtimes.items():
+                if os.stat(folder).st_mtime_ns != mtime:
+                    log.debug(
+                        "Core import index %s is out of date, %s was modified."
+                        % (index_path, folder)
+                    )
+                    return None
+            return package_index
+        except Exception as e:
+            log.debug("Could not load core import index %s: %s" % (index_path, e))
+            return None
+
+    def save(self, index_path):
+        """
+        Persists the index. Failures are logged but not raised, since the
+        core folder may be read-only.
+
+        :param str index_path: Path to the file to write.
+        """
+        folders = {}
+        for (folder, (dir_names, file_names)) in self._folders.items():
+            relative_path = os.path.relpath(folder, self._core_path)
+            folders[relative_path.replace(os.path.sep, "/")] = (
+                sorted(dir_names),
+                sorted(file_names),
+                self._mtimes[folder],
+            )
+        tmp_path = "%s.%s.tmp" % (index_path, uuid.uuid4().hex)
+        try:
+            with open(tmp_path, "w") as fh:
+                json.dump({"version": self._FORMAT_VERSION, "folders": folders}, fh)
+            os.replace(tmp_path, index_path)
+        except Exception as e:
+            log.debug("Could not save core import index %s: %s" % (index_path, e))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def find_module_file(self, package_path, module_name):
+        """
+        Locates a module in a package folder.
+
+        :param str package_path: Path to the folder of the package.
+        :param str module_name: Name of the module.
+        :returns: The path to the module file, or None if it is not in the index.
+        """
+        listing = self._folders.get(os.path.normpath(package_path))
+        if listing is None:
+            return None
+        (dir_names, file_names) = listing
+        if module_name in dir_names:
+            module_folder = os.path.join(package_path, module_name)
+            (_, module_file_names) = self._folders.get(
+                os.path.normpath(module_folder), ((), ())
+            )
+            if "__init__.py" in module_file_names:
+                return os.path.join(module_folder, "__init__.py")
+            return None
+        if module_name + ".py" in file_names:
+            return os.path.join(package_path, module_name + ".py")
+        return None
+
+
 class CoreImportHandler(object):
     """
     A custom import handler to allow for core version switching.
@@ -37,6 +183,7 @@ class CoreImportHandler(object):
     NAMESPACES_TO_TRACK = ["tank", "sgtk", "tank_vendor"]
 
     @classmethod
+    @record_span("bootstrap")
     def swap_core(cls, core_path):
         """
         Swap the current core with the core located at the supplied path.
@@ -62,6 +209,9 @@ class CoreImportHandler(object):
         # logging to file is now disabled and will be renamed after the
         # main tank import of the new code.
 
+        # the spans recorded so far are handed over to the new core the same way.
+        timeline_state = Timeline().export_state()
+
         handler._swap_core(core_path)
 
         # because we are swapping out the code that we are currently running, Python is
@@ -109,6 +259,12 @@ class CoreImportHandler(object):
                 "have a LogManager.initialize_base_file_handler_from_path method defined."
             )
 
+        try:
+            tank.util.Timeline().import_state(timeline_state)
+        except AttributeError:
+            # older versions of the API don't record a timeline.
+            log.debug("Switching to a version of the core API without a timeline.")
+
     @classmethod
     def _initialize(cls):
         """
@@ -142,6 +298,10 @@ class CoreImportHandler(object):
         # before it is loaded.
         self._module_info = {}
 
+        # indexes of the package folders of the cores imported from,
+        # keyed by core path.
+        self._package_indexes = {}
+
     def __repr__(self):
         """
         A unique representation of the handler.
@@ -288,21 +448,26 @@ class CoreImportHandler(object):
             # file existence at creation time, so without this check it would
             # later raise FileNotFoundError instead of the expected ImportError
             # when the module doesn't exist on disk.
-            if os.path.isdir(os.path.join(package_path[0], module_name)):
-                module_file = os.path.join(
-                    package_path[0], module_name, "__init__.py"
-                )
-            else:
-                module_file = os.path.join(
-                    package_path[0], module_name + ".py"
-                )
+            module_file = self._get_package_index().find_module_file(
+                package_path[0], module_name
+            )
 
-            if not os.path.isfile(module_file):
-                return None
+            # Modules not found in the index, which can be outside of the
+            # core, are looked up on disk.
+            if module_file is None:
+                if os.path.isdir(os.path.join(package_path[0], module_name)):
+                    module_file = os.path.join(
+                        package_path[0], module_name, "__init__.py"
+                    )
+                else:
+                    module_file = os.path.join(package_path[0], module_name + ".py")
 
-            loader = importlib.machinery.SourceFileLoader(
-                module_fullname, module_file
-            )
+                if not os.path.isfile(module_file):
+                    return None
+
+            # a core in a read-only bundle cache has its byte code stored in
+            # the user's cache folder, see bytecode.use_user_pycache.
+            loader = bytecode.create_source_loader(module_fullname, module_file)
             spec = importlib.util.spec_from_loader(loader.name, loader)
             self._module_info[module_fullname] = spec
         except ImportError:
@@ -311,6 +476,35 @@ class CoreImportHandler(object):
 
         return spec
 
+    def _get_package_index(self):
+        """
+        Returns the index of the package folders of the current core, loading
+        or building it the first time the core is imported from.
+
+        :returns: A :class:`_CorePackageIndex` instance.
+        """
+        package_index = self._package_indexes.get(self._core_path)
+        if package_index:
+            return package_index
+
+        persist = bool(os.environ.get(constants.PERSIST_CORE_IMPORT_INDEX_ENV_VAR))
+        index_path = os.path.join(
+            self._core_path, constants.CORE_IMPORT_INDEX_FILE_NAME
+        )
+
+        if persist:
+            package_index = _CorePackageIndex.load(index_path, self._core_path)
+
+        if package_index is None:
+            package_index = _CorePackageIndex.build(
+                self._core_path, self.NAMESPACES_TO_TRACK
+            )
+            if persist:
+                package_index.save(index_path)
+
+        self._package_indexes[self._core_path] = package_index
+        return package_index
+
     def load_module(self, module_fullname):
         """Custom loader.
 
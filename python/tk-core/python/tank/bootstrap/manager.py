@@ -20,6 +20,8 @@ from ..pipelineconfig import PipelineConfiguration
 from .. import LogManager
 from ..errors import TankError
 from ..util import ShotgunPath
+from ..util import bytecode
+from ..util.timeline import record_span
 
 log = LogManager.get_logger(__name__)
 
@@ -662,6 +664,7 @@ class ToolkitManager(object):
 
         return path, config.descriptor
 
+    @record_span("bootstrap")
     def _cache_bundles(self, config, pc, engine_name, progress_callback):
         """
         Caches the bundles required by the configuration.
@@ -1065,6 +1068,7 @@ class ToolkitManager(object):
 
         return config
 
+    @record_span("bootstrap")
     def _bootstrap_sgtk(self, engine_name, entity, progress_callback=None):
         """
         Create an :class:`~sgtk.Sgtk` instance for the given entity and caches all applications.
@@ -1093,6 +1097,11 @@ class ToolkitManager(object):
 
         config = self._get_updated_configuration(entity, progress_callback)
 
+        if os.environ.get(constants.USER_PYCACHE_ENV_VAR, "0") == "1":
+            # make sure code imported from read-only bundle caches is only
+            # compiled once.
+            bytecode.use_user_pycache(self._get_bundle_cache_fallback_paths())
+
         # we can now boot up this config.
         self._report_progress(
             progress_callback, self._STARTING_TOOLKIT_RATE, "Starting up Toolkit..."
@@ -1108,6 +1117,7 @@ class ToolkitManager(object):
 
         return tk
 
+    @record_span("bootstrap")
     def _start_engine(self, tk, engine_name, entity, progress_callback=None):
         """
         Launch into the given engine.
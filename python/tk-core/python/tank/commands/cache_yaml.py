@@ -8,19 +8,15 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import os
-import fnmatch
-
-
 from .action_base import Action
 from ..errors import TankError
-from ..util import yaml_cache, pickle
+from ..util import yaml_cache_file, pickle
 
 
 class CacheYamlAction(Action):
     """
     Action that ensures that crawls a config, caching all YAML data found
-    to disk as pickled data.
+    to disk, as a binary yaml cache file and as pickled data.
     """
 
     def __init__(self):
@@ -72,15 +68,13 @@ class CacheYamlAction(Action):
 
         root_dir = self.tk.pipeline_configuration.get_path()
 
-        matches = []
-        for root, dir_names, file_names in os.walk(root_dir):
-            for file_name in fnmatch.filter(file_names, "*.yml"):
-                matches.append(os.path.join(root, file_name))
-        for path in matches:
-            log.debug("Caching %s..." % path)
-            yaml_cache.g_yaml_cache.get(path)
+        (cache_path, items) = yaml_cache_file.write_config_cache_file(
+            root_dir, self.tk.pipeline_configuration.get_yaml_cache_file_location()
+        )
+        log.debug("Wrote %s items to %s" % (len(items), cache_path))
 
-        items = yaml_cache.g_yaml_cache.get_cached_items()
+        # the pickled cache is still written for older versions of core
+        # which may use this configuration.
         pickle_path = self.tk.pipeline_configuration.get_yaml_cache_location()
         log.debug("Writing cache to %s" % pickle_path)
 
@@ -12,6 +12,8 @@
 Methods relating to the path cache
 """
 
+import time
+
 from ..errors import TankError
 from .. import path_cache
 from .. import folder
@@ -98,9 +100,20 @@ class SynchronizePathCache(Action):
                     "run this command with a --full flag."
                 )
 
-            folder.synchronize_folders(self.tk, full_sync)
+            def report_progress(nb_folders, elapsed):
+                log.info(
+                    "Downloaded %s folders (%.0f folders per second)..."
+                    % (nb_folders, nb_folders / max(elapsed, 0.001))
+                )
 
-            log.info("Local folder information has been synchronized.")
+            start_time = time.time()
+            folders = folder.synchronize_folders(self.tk, full_sync, report_progress)
+
+            log.info(
+                "Local folder information has been synchronized in %.1f seconds. "
+                "%s new folders were processed."
+                % (time.time() - start_time, len(folders))
+            )
 
         else:
             # remote cache not turned on for this project
@@ -14,7 +14,11 @@ from .action_base import Action
 from . import console_utils
 from . import util
 from ..platform.environment import WritableEnvironment
-from ..descriptor import CheckVersionConstraintsError
+from ..descriptor import (
+    CheckVersionConstraintsError,
+    clear_prefetched_versions,
+    prefetch_latest_versions,
+)
 from . import constants
 from ..util.version import is_version_number, is_version_newer
 from .. import pipelineconfig_utils
@@ -432,56 +436,93 @@ class AppUpdatesAction(Action):
                 # the item we are filtering on does not exist in this env
                 engines_to_process = []
 
-        for engine in engines_to_process:
+        self._prefetch_latest_versions(log, environment_obj, engines_to_process)
 
-            if self._terminate_requested:
-                break
+        try:
+            for engine in engines_to_process:
 
-            items.extend(
-                self._process_item(log, tk, environment_obj, engine_name=engine)
-            )
-            log.info("")
-
-            if app_instance_name is None:
-                # no filter - process all apps
-                apps_to_process = environment_obj.get_apps(engine)
-            else:
-                # there is a filter! Ensure the filter matches
-                # something in the current engine apps listing
-                if app_instance_name in environment_obj.get_apps(engine):
-                    # the filter matches something!
-                    apps_to_process = [app_instance_name]
-                else:
-                    # the app filter does not match anything in this engine
-                    apps_to_process = []
-
-            for app in apps_to_process:
                 if self._terminate_requested:
                     break
 
                 items.extend(
-                    self._process_item(
-                        log, tk, environment_obj, engine_name=engine, app_name=app
-                    )
+                    self._process_item(log, tk, environment_obj, engine_name=engine)
                 )
                 log.info("")
 
-        if len(environment_obj.get_frameworks()) > 0:
-            log.info("")
-            log.info("Frameworks:")
-            log.info("-" * 70)
+                if app_instance_name is None:
+                    # no filter - process all apps
+                    apps_to_process = environment_obj.get_apps(engine)
+                else:
+                    # there is a filter! Ensure the filter matches
+                    # something in the current engine apps listing
+                    if app_instance_name in environment_obj.get_apps(engine):
+                        # the filter matches something!
+                        apps_to_process = [app_instance_name]
+                    else:
+                        # the app filter does not match anything in this engine
+                        apps_to_process = []
+
+                for app in apps_to_process:
+                    if self._terminate_requested:
+                        break
+
+                    items.extend(
+                        self._process_item(
+                            log, tk, environment_obj, engine_name=engine, app_name=app
+                        )
+                    )
+                    log.info("")
 
-            for framework in environment_obj.get_frameworks():
-                if self._terminate_requested:
-                    break
-                items.extend(
-                    self._process_item(
-                        log, tk, environment_obj, framework_name=framework
+            if len(environment_obj.get_frameworks()) > 0:
+                log.info("")
+                log.info("Frameworks:")
+                log.info("-" * 70)
+
+                for framework in environment_obj.get_frameworks():
+                    if self._terminate_requested:
+                        break
+                    items.extend(
+                        self._process_item(
+                            log, tk, environment_obj, framework_name=framework
+                        )
                     )
-                )
+        finally:
+            # the prefetched versions are only valid while this environment
+            # is being checked.
+            clear_prefetched_versions()
 
         return items
 
+    def _prefetch_latest_versions(self, log, environment_obj, engines):
+        """
+        Retrieves in batch the version information of all the items of an
+        environment, so that checking each item for updates requires fewer
+        remote queries. The version information is released by
+        :meth:`_process_environment` once the environment has been checked.
+
+        :param log: Python logger
+        :param environment_obj: Environment object to update
+        :param engines: List of engine instance names which will be processed.
+        """
+        descriptors = []
+        constraint_patterns = []
+        for engine in engines:
+            descriptors.append(environment_obj.get_engine_descriptor(engine))
+            constraint_patterns.append(None)
+            for app in environment_obj.get_apps(engine):
+                descriptors.append(environment_obj.get_app_descriptor(engine, app))
+                constraint_patterns.append(None)
+        for framework in environment_obj.get_frameworks():
+            descriptors.append(environment_obj.get_framework_descriptor(framework))
+            # see _check_item_update_status for the framework version pattern.
+            constraint_patterns.append(framework.split("_")[-1])
+
+        try:
+            prefetch_latest_versions(descriptors, constraint_patterns)
+        except Exception as e:
+            # items will be checked one at a time and report any error.
+            log.debug("Could not prefetch latest versions: %s" % e)
+
     def _update_item(
         self,
         log,
@@ -82,6 +82,37 @@ PROFILING_LOG_CHANNEL = "sgtk.stopwatch"
 # environment variable that if set, enables debug logging in the engine
 DEBUG_LOGGING_ENV_VAR = "TK_DEBUG"
 
+# maximum number of log records kept in memory by LogManager.start_debug_capture
+DEBUG_CAPTURE_MAX_RECORDS = 10000
+
+# environment variable used to write the base log file from a background thread,
+# so logging doesn't block on file I/O. Overrides the user setting below.
+ASYNC_FILE_LOGGING_ENV_VAR = "SGTK_ASYNC_FILE_LOGGING"
+
+# section and name of the user setting used to write the base log file from a
+# background thread.
+ASYNC_FILE_LOGGING_SETTING = ("Logging", "async_file_logging")
+
+# maximum number of log records waiting to be written to the base log file when
+# writing it from a background thread. Records logged past that are dropped.
+ASYNC_FILE_LOGGING_MAX_RECORDS = 10000
+
+# environment variable used to switch path caches synchronized with Shotgun to
+# write-ahead logging, which is faster to write to but requires the path cache
+# to be stored on a local disk.
+PATH_CACHE_WAL_ENV_VAR = "SGTK_PATH_CACHE_WAL"
+
+# environment variable used to read path caches which are not synchronized with
+# Shotgun, and therefore stored with the project data, from a copy on local disk.
+PATH_CACHE_LOCAL_MIRROR_ENV_VAR = "SGTK_PATH_CACHE_LOCAL_MIRROR"
+
+# name of the local copy of a path cache stored with the project data.
+PATH_CACHE_MIRROR_FILE = "path_cache_mirror.db"
+
+# number of seconds during which the folder configuration is reused without
+# checking if the folder creation schema was modified.
+FOLDER_CONFIGURATION_CHECK_INTERVAL = 10
+
 # cache data for toolkit init
 TOOLKIT_INIT_CACHE_FILE = "toolkit_init.cache"
 
@@ -1555,27 +1555,16 @@ def from_path(tk, path, previous_context=None):
         "entity_types_in_path", []
     )
 
-    # get a cache handle
-    path_cache = PathCache(tk)
-
     # gather all roots as lower case
     project_roots = [
         x.lower() for x in tk.pipeline_configuration.get_data_roots().values()
     ]
 
-    # first gather entities
-    entities = []
-    secondary_entities = []
+    # first gather the path and its parent folders, up to the project root
+    paths = []
     curr_path = path
     while True:
-        curr_entity = path_cache.get_entity(curr_path)
-        if curr_entity:
-            # Don't worry about entity types we've already got in the context. In the future
-            # we should look for entity ids that conflict in order to flag a degenerate schema.
-            entities.append(curr_entity)
-
-        # add secondary entities
-        secondary_entities.extend(path_cache.get_secondary_entities(curr_path))
+        paths.append(curr_path)
 
         if curr_path.lower() in project_roots:
             # TODO this could fail with windows path variations
@@ -1591,7 +1580,10 @@ def from_path(tk, path, previous_context=None):
         else:
             curr_path = parent_path
 
-    path_cache.close()
+    # then look up their entities all at once. Don't worry about entity types we've
+    # already got in the context. In the future we should look for entity ids that
+    # conflict in order to flag a degenerate schema.
+    (entities, secondary_entities) = tk._get_path_cache_handle().get_entities(paths)
 
     # now populate the context
     # go from the root down, so that in the case there are a path with
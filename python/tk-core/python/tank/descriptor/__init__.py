@@ -9,7 +9,12 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 
-from .descriptor import Descriptor, create_descriptor
+from .descriptor import (
+    Descriptor,
+    clear_prefetched_versions,
+    create_descriptor,
+    prefetch_latest_versions,
+)
 from .descriptor_core import CoreDescriptor
 from .descriptor_bundle import AppDescriptor, FrameworkDescriptor, EngineDescriptor
 from .descriptor_config import ConfigDescriptor
@@ -30,6 +35,7 @@ from .io_descriptor import (
     descriptor_dict_to_uri,
     descriptor_uri_to_dict,
     is_descriptor_version_missing,
+    write_bundle_cache_manifest,
 )
 
 
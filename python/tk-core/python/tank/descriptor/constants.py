@@ -85,6 +85,29 @@ BUNDLE_CACHE_PATH_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_PATH"
 # environment variable used to disable connection to the app store
 DISABLE_APPSTORE_ACCESS_ENV_VAR = "SHOTGUN_DISABLE_APPSTORE_ACCESS"
 
+# environment variable used to compile the python files of bundles to byte
+# code once they are downloaded, so it doesn't happen on their first import.
+COMPILE_BUNDLES_ENV_VAR = "SGTK_COMPILE_BUNDLES"
+
+# environment variable used to read and maintain a manifest of the complete
+# bundles found in each bundle cache root, so they can be found without
+# accessing the file system.
+BUNDLE_CACHE_MANIFEST_ENV_VAR = "SGTK_BUNDLE_CACHE_MANIFEST"
+
+# name of the manifest file, stored at the root of a bundle cache.
+BUNDLE_CACHE_MANIFEST_FILE = "bundle_cache_manifest.json"
+
+# number of seconds during which a listing of a bundle cache folder is trusted
+# to rule out a bundle. Older listings are made again when a bundle is missing
+# from them, to pick up bundles written by other processes.
+BUNDLE_CACHE_LISTING_LIFETIME = 5
+
+# folder inside a downloaded bundle holding the download metadata.
+BUNDLE_CACHE_METADATA_FOLDER = "tk-metadata"
+
+# file written in the metadata folder once a bundle is completely downloaded.
+BUNDLE_CACHE_DOWNLOAD_COMPLETE_FILE = "install_complete"
+
 # the Descriptor types
 (
     DESCRIPTOR_APP,
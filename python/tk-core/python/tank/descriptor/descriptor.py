@@ -14,6 +14,7 @@ import copy
 from ..log import LogManager
 from ..util import filesystem
 from .io_descriptor import create_io_descriptor
+from .io_descriptor.base import IODescriptorBase
 from .errors import TankDescriptorError
 from ..util import LocalFileStorageManager
 from . import constants
@@ -121,6 +122,52 @@ def create_descriptor(
     )
 
 
+def prefetch_latest_versions(descriptors, constraint_patterns=None):
+    """
+    Retrieves the data needed to resolve the latest versions of several descriptors.
+
+    Descriptor types which support it, like app store descriptors, retrieve the
+    version information for all descriptors with fewer remote queries.
+    Subsequent calls to :meth:`Descriptor.find_latest_version` on these
+    descriptors then don't need to query the remote, until
+    :meth:`clear_prefetched_versions` is called. Callers are expected to call
+    it once they are done resolving the descriptors.
+
+    :param descriptors: List of :class:`Descriptor` instances.
+    :param constraint_patterns: Optional list of the constraint patterns which
+        will be passed to :meth:`Descriptor.find_latest_version`, one per
+        descriptor. An item can be ``None`` to leave the matching descriptor
+        unconstrained.
+    """
+    if constraint_patterns is None:
+        constraint_patterns = [None] * len(descriptors)
+
+    # group the low level descriptors by class so they can batch their queries
+    io_descriptors_per_class = {}
+    for (desc, constraint_pattern) in zip(descriptors, constraint_patterns):
+        io_descriptor = desc._io_descriptor
+        (io_descriptors, patterns) = io_descriptors_per_class.setdefault(
+            type(io_descriptor), ([], [])
+        )
+        io_descriptors.append(io_descriptor)
+        patterns.append(constraint_pattern)
+
+    for (
+        io_descriptor_class,
+        (io_descriptors, patterns),
+    ) in io_descriptors_per_class.items():
+        io_descriptor_class.prefetch_latest_versions(io_descriptors, patterns)
+
+
+def clear_prefetched_versions():
+    """
+    Releases the data retrieved by :meth:`prefetch_latest_versions`, so that
+    :meth:`Descriptor.find_latest_version` queries the remote again.
+    """
+    for io_descriptor_class in set(IODescriptorBase._factory.values()):
+        io_descriptor_class.clear_prefetched_versions()
+
+
 def _get_default_bundle_cache_root():
     """
     Returns the cache location for the default bundle cache.
@@ -14,6 +14,7 @@ from .factory import (
     descriptor_dict_to_uri,
     is_descriptor_version_missing,
 )
+from .bundle_cache_index import write_bundle_cache_manifest
 
 
 def _initialize_descriptor_factory():
@@ -18,6 +18,7 @@ import http.client
 import json
 import os
 import sys
+import threading
 import typing
 import urllib.parse
 import urllib.request
@@ -63,6 +64,16 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
     # cache app store connections for performance
     _app_store_connections = {}
+    _app_store_connections_lock = threading.Lock()
+
+    # Shotgun API instances are not thread safe, so threads other than the one
+    # which created an app store connection use their own copy of it.
+    _app_store_thread_connections = threading.local()
+
+    # app store version records retrieved by prefetch_latest_versions until
+    # clear_prefetched_versions is called, keyed by (site url, bundle type,
+    # bundle name).
+    _prefetched_versions = {}
 
     # internal app store mappings
     (APP, FRAMEWORK, ENGINE, CONFIG, CORE) = range(5)
@@ -442,6 +453,8 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         :param download_path: The path to which the descriptor is downloaded to.
         """
+        super()._post_download(download_path)
+
         # write a stats record to the tank app store
         try:
             # connect to the app store
@@ -723,38 +736,20 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         log.debug("No compatible cached version found")
 
-    @LogManager.log_timing
-    def get_latest_version(self, constraint_pattern=None):
+    def __find_versions(self, constraint_pattern):
         """
-        Returns a descriptor object that represents the latest version.
-
-        This method will connect to the toolkit app store and download
-        metadata to determine the latest version.
+        Retrieves the app store records for the bundle and its versions.
 
-        :param constraint_pattern: If this is specified, the query will be constrained
-               by the given pattern. Version patterns are on the following forms:
-
-                - v0.1.2, v0.12.3.2, v0.1.3beta - a specific version
-                - v0.12.x - get the highest v0.12 version
-                - v1.x.x - get the highest v1 version
-
-        :returns: IODescriptorAppStore object
+        :param constraint_pattern: Version constraint pattern which will be
+            applied to the versions, or None.
+        :returns: Tuple with the bundle entity record (None for core) and a list
+            of version records, most recent first.
         """
-        log.debug(
-            f"Determining latest version for {self} given constraint pattern {constraint_pattern}"
-        )
-
         # connect to the app store
         (sg, _) = self.__create_sg_app_store_connection()
 
         # get latest get the filter logic for what to exclude
-        if constants.APP_STORE_QA_MODE_ENV_VAR in os.environ:
-            sg_filter = [["sg_status_list", "is_not", "bad"]]
-        else:
-            sg_filter = [
-                ["sg_status_list", "is_not", "rev"],
-                ["sg_status_list", "is_not", "bad"],
-            ]
+        sg_filter = self.__get_version_filters()
 
         if self._bundle_type != self.CORE:
             # find the main entry
@@ -796,6 +791,214 @@ class IODescriptorAppStore(IODescriptorDownloadable):
             limit=limit,
         )
 
+        return (sg_bundle_data, sg_versions)
+
+    @staticmethod
+    def __get_version_filters():
+        """
+        :returns: Shotgun filters excluding the versions which shouldn't be used.
+        """
+        if constants.APP_STORE_QA_MODE_ENV_VAR in os.environ:
+            return [["sg_status_list", "is_not", "bad"]]
+        else:
+            return [
+                ["sg_status_list", "is_not", "rev"],
+                ["sg_status_list", "is_not", "bad"],
+            ]
+
+    def __get_prefetched_versions_key(self):
+        """
+        :returns: Key of the descriptor in the prefetched versions cache.
+        """
+        return (self._sg_connection.base_url, self._bundle_type, self._name)
+
+    def __get_prefetched_versions(self, constraint_pattern):
+        """
+        Returns the version records retrieved for this bundle by
+        :meth:`prefetch_latest_versions`.
+
+        :param constraint_pattern: Version constraint pattern which will be
+            applied to the versions, or None.
+        :returns: Tuple with the bundle entity record and the version records,
+            or None if the needed records were not prefetched.
+        """
+        prefetched = self._prefetched_versions.get(self.__get_prefetched_versions_key())
+        if prefetched is None:
+            return None
+
+        (sg_bundle_data, sg_versions, all_versions) = prefetched
+        if not all_versions and (
+            self._label is not None or constraint_pattern is not None
+        ):
+            # only the latest version was retrieved.
+            return None
+
+        return (sg_bundle_data, sg_versions)
+
+    @classmethod
+    @LogManager.log_timing
+    def prefetch_latest_versions(cls, io_descriptors, constraint_patterns):
+        """
+        Retrieves the app store version records for a list of descriptors.
+
+        Rather than issuing a couple of queries per descriptor, the bundles of
+        all descriptors of a given type are retrieved in one query and their
+        versions in another one, newest first, so the number of queries doesn't
+        depend on the number of descriptors. The records are then used by
+        :meth:`get_latest_version` until :meth:`clear_prefetched_versions` is
+        called.
+
+        The app store metadata cache of the descriptors which are already in
+        the bundle cache is also refreshed.
+
+        Descriptors which are not app store descriptors are ignored.
+
+        :param io_descriptors: List of :class:`IODescriptorBase` instances.
+        :param constraint_patterns: List of the constraint patterns which will
+            be passed to :meth:`get_latest_version`, one per descriptor.
+        """
+        # group descriptors per site and bundle type
+        descriptors_per_type = {}
+        for (descriptor, constraint_pattern) in zip(
+            io_descriptors, constraint_patterns
+        ):
+            if not isinstance(descriptor, cls):
+                continue
+            key = (descriptor._sg_connection.base_url, descriptor._bundle_type)
+            descriptors_per_type.setdefault(key, []).append(
+                (descriptor, constraint_pattern)
+            )
+
+        for descriptors_of_type in descriptors_per_type.values():
+            cls.__prefetch_versions_of_type(descriptors_of_type)
+
+    @classmethod
+    def clear_prefetched_versions(cls):
+        """
+        Releases the version records retrieved by :meth:`prefetch_latest_versions`.
+        """
+        cls._prefetched_versions.clear()
+
+    @classmethod
+    def __prefetch_versions_of_type(cls, descriptors):
+        """
+        Retrieves the app store version records for descriptors sharing
+        the same site and bundle type.
+
+        :param descriptors: List of (:class:`IODescriptorAppStore`, constraint
+            pattern) tuples.
+        """
+        bundle_type = descriptors[0][0]._bundle_type
+        (sg, _) = descriptors[0][0].__create_sg_app_store_connection()
+        sg_filter = cls.__get_version_filters()
+        order = [{"field_name": "created_at", "direction": "desc"}]
+
+        # records for each bundle name, as (sg_bundle_data, sg_versions,
+        # all_versions)
+        records = {}
+
+        if bundle_type == cls.CORE:
+            # core doesn't have a parent entity for its versions, the latest
+            # version is enough unless a label or a constraint applies.
+            all_versions = any(
+                descriptor._label is not None or constraint_pattern is not None
+                for (descriptor, constraint_pattern) in descriptors
+            )
+            sg_versions = sg.find(
+                constants.TANK_CORE_VERSION_ENTITY_TYPE,
+                filters=sg_filter,
+                fields=cls._VERSION_FIELDS_TO_CACHE,
+                order=order,
+                limit=0 if all_versions else 1,
+            )
+            for (descriptor, _) in descriptors:
+                records[descriptor._name] = (None, sg_versions, all_versions)
+        else:
+            names = sorted(set(descriptor._name for (descriptor, _) in descriptors))
+            sg_bundles = sg.find(
+                cls._APP_STORE_OBJECT[bundle_type],
+                [["sg_system_name", "in", names]],
+                cls._BUNDLE_FIELDS_TO_CACHE,
+            )
+            link_field = cls._APP_STORE_LINK[bundle_type]
+            entity_type = cls._APP_STORE_VERSION[bundle_type]
+
+            # a single query for the versions of all the bundles rather than
+            # one per bundle. All versions are returned, so the records can
+            # be used whatever label or constraint pattern applies.
+            versions_per_bundle = {}
+            if sg_bundles:
+                sg_versions = sg.find(
+                    entity_type,
+                    filters=sg_filter + [[link_field, "in", sg_bundles]],
+                    fields=cls._VERSION_FIELDS_TO_CACHE + [link_field],
+                    order=order,
+                )
+                for sg_version in sg_versions:
+                    bundle_id = sg_version.pop(link_field)["id"]
+                    versions_per_bundle.setdefault(bundle_id, []).append(sg_version)
+
+            for sg_bundle in sg_bundles:
+                records[sg_bundle["sg_system_name"]] = (
+                    sg_bundle,
+                    versions_per_bundle.get(sg_bundle["id"], []),
+                    True,
+                )
+
+        log.debug(
+            "Prefetched app store data for %d bundles of type %s."
+            % (len(records), bundle_type)
+        )
+
+        for (descriptor, _) in descriptors:
+            if descriptor._name not in records:
+                # not in the app store, get_latest_version will report it.
+                continue
+            (sg_bundle_data, sg_versions, all_versions) = records[descriptor._name]
+            cls._prefetched_versions[descriptor.__get_prefetched_versions_key()] = (
+                sg_bundle_data,
+                sg_versions,
+                all_versions,
+            )
+
+            # keep the metadata of the version currently in use up to date.
+            cached_path = descriptor.get_path()
+            if not cached_path:
+                continue
+            for sg_version in sg_versions:
+                if sg_version["code"] == descriptor._version:
+                    descriptor.__refresh_metadata(
+                        cached_path, sg_bundle_data, sg_version
+                    )
+                    break
+
+    @LogManager.log_timing
+    def get_latest_version(self, constraint_pattern=None):
+        """
+        Returns a descriptor object that represents the latest version.
+
+        This method will connect to the toolkit app store and download
+        metadata to determine the latest version.
+
+        :param constraint_pattern: If this is specified, the query will be constrained
+               by the given pattern. Version patterns are on the following forms:
+
+                - v0.1.2, v0.12.3.2, v0.1.3beta - a specific version
+                - v0.12.x - get the highest v0.12 version
+                - v1.x.x - get the highest v1 version
+
+        :returns: IODescriptorAppStore object
+        """
+        log.debug(
+            f"Determining latest version for {self} given constraint pattern {constraint_pattern}"
+        )
+
+        prefetched = self.__get_prefetched_versions(constraint_pattern)
+        if prefetched:
+            log.debug(f"Using prefetched app store version data for {self}")
+            (sg_bundle_data, sg_versions) = prefetched
+        else:
+            (sg_bundle_data, sg_versions) = self.__find_versions(constraint_pattern)
         log.debug(
             f"Downloaded data for {len(sg_versions)} versions from Flow Production Tracking."
         )
@@ -976,90 +1179,125 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         sg_url = self._sg_connection.base_url
 
-        if sg_url not in self._app_store_connections:
+        with self._app_store_connections_lock:
+            if sg_url not in self._app_store_connections:
+                self._app_store_connections[sg_url] = self.__connect_to_app_store() + (
+                    threading.get_ident(),
+                )
+            (app_store_sg, script_user, thread_id) = self._app_store_connections[sg_url]
 
-            # Connect to associated Shotgun site and retrieve the credentials to use to
-            # connect to the app store site
-            try:
-                (script_name, script_key) = self.__get_app_store_key_from_shotgun()
-            except urllib.error.HTTPError as e:
-                if e.code == 403:
-                    # edge case alert!
-                    # this is likely because our session token in shotgun has expired.
-                    # The authentication system is based around wrapping the shotgun API,
-                    # and requesting authentication if needed. Because the app store
-                    # credentials is a separate endpoint and doesn't go via the shotgun
-                    # API, we have to explicitly check.
-                    #
-                    # trigger a refresh of our session token by issuing a shotgun API call
-                    self._sg_connection.find_one("HumanUser", [])
-                    # and retry
-                    (script_name, script_key) = self.__get_app_store_key_from_shotgun()
-                else:
-                    raise
-
-            app_store = os.environ.get("SGTK_APP_STORE", constants.SGTK_APP_STORE)
-
-            log.debug("Connecting to %s..." % app_store)
-            # Connect to the app store and resolve the script user id we are connecting with.
-            # Set the timeout explicitly so we ensure the connection won't hang in cases where
-            # a response is not returned in a reasonable amount of time.
-            app_store_sg = shotgun_api3.Shotgun(
-                app_store,
-                script_name=script_name,
-                api_key=script_key,
+        if thread_id == threading.get_ident():
+            return (app_store_sg, script_user)
+
+        # use a copy of the connection in other threads. The app store
+        # credentials are reused, so they are only retrieved once per site.
+        thread_connections = self._app_store_thread_connections.__dict__.setdefault(
+            "connections", {}
+        )
+        if sg_url not in thread_connections:
+            thread_sg = shotgun_api3.Shotgun(
+                app_store_sg.base_url,
+                script_name=app_store_sg.config.script_name,
+                api_key=app_store_sg.config.api_key,
                 http_proxy=self.__get_app_store_proxy_setting(),
                 connect=False,
             )
-            # set the default timeout for app store connections
-            app_store_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
+            thread_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
+            thread_connections[sg_url] = thread_sg
 
-            # determine the script user running currently
-            # get the API script user ID from shotgun
-            try:
-                script_user = app_store_sg.find_one(
-                    "ApiUser",
-                    filters=[["firstname", "is", script_name]],
-                    fields=["type", "id"],
-                )
-            except shotgun_api3.AuthenticationFault:
-                raise InvalidAppStoreCredentialsError(
-                    "The Toolkit App Store credentials found in PTR are invalid.\n"
-                    "Please contact support at %s to resolve this issue." % SUPPORT_URL
-                )
-            # Connection errors can occur for a variety of reasons. For example, there is no
-            # internet access or there is a proxy server blocking access to the Toolkit app store.
-            except (
-                httplib2.HttpLib2Error,
-                httplib2.socks.HTTPError,
-                http.client.HTTPException,
-            ) as e:
-                raise TankAppStoreConnectionError(e)
-            # In cases where there is a firewall/proxy blocking access to the app store, sometimes
-            # the firewall will drop the connection instead of rejecting it. The API request will
-            # timeout which unfortunately results in a generic SSLError with only the message text
-            # to give us a clue why the request failed.
-            # The exception raised in this case is "ssl.SSLError: The read operation timed out"
-            except httplib2.ssl.SSLError as e:
-                if "timed" in str(e):
-                    raise TankAppStoreConnectionError(
-                        "Connection to %s timed out: %s"
-                        % (app_store_sg.config.server, e)
-                    )
-                else:
-                    # other type of ssl error
-                    raise TankAppStoreError(e)
-            except Exception as e:
-                raise TankAppStoreError(e)
+        return (thread_connections[sg_url], script_user)
+
+    def __connect_to_app_store(self):
+        """
+        Connects to the Toolkit app store, retrieving the app store credentials
+        of the client site.
+
+        This uses the connection to the client site, so it must be called from
+        the thread owning it.
+
+        :returns: (sg, dict) where the first item is the shotgun api instance and the second
+                  is an sg entity dictionary (keys type/id) corresponding to to the user used
+                  to connect to the app store.
+        """
+        # Connect to associated Shotgun site and retrieve the credentials to use to
+        # connect to the app store site
+        try:
+            (script_name, script_key) = self.__get_app_store_key_from_shotgun()
+        except urllib.error.HTTPError as e:
+            if e.code == 403:
+                # edge case alert!
+                # this is likely because our session token in shotgun has expired.
+                # The authentication system is based around wrapping the shotgun API,
+                # and requesting authentication if needed. Because the app store
+                # credentials is a separate endpoint and doesn't go via the shotgun
+                # API, we have to explicitly check.
+                #
+                # trigger a refresh of our session token by issuing a shotgun API call
+                self._sg_connection.find_one("HumanUser", [])
+                # and retry
+                (script_name, script_key) = self.__get_app_store_key_from_shotgun()
+            else:
+                raise
+
+        app_store = os.environ.get("SGTK_APP_STORE", constants.SGTK_APP_STORE)
+
+        log.debug("Connecting to %s..." % app_store)
+        # Connect to the app store and resolve the script user id we are connecting with.
+        # Set the timeout explicitly so we ensure the connection won't hang in cases where
+        # a response is not returned in a reasonable amount of time.
+        app_store_sg = shotgun_api3.Shotgun(
+            app_store,
+            script_name=script_name,
+            api_key=script_key,
+            http_proxy=self.__get_app_store_proxy_setting(),
+            connect=False,
+        )
+        # set the default timeout for app store connections
+        app_store_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
 
-            if script_user is None:
-                raise TankAppStoreError(
-                    "Could not evaluate the current App Store User! Please contact support."
+        # determine the script user running currently
+        # get the API script user ID from shotgun
+        try:
+            script_user = app_store_sg.find_one(
+                "ApiUser",
+                filters=[["firstname", "is", script_name]],
+                fields=["type", "id"],
+            )
+        except shotgun_api3.AuthenticationFault:
+            raise InvalidAppStoreCredentialsError(
+                "The Toolkit App Store credentials found in PTR are invalid.\n"
+                "Please contact support at %s to resolve this issue." % SUPPORT_URL
+            )
+        # Connection errors can occur for a variety of reasons. For example, there is no
+        # internet access or there is a proxy server blocking access to the Toolkit app store.
+        except (
+            httplib2.HttpLib2Error,
+            httplib2.socks.HTTPError,
+            http.client.HTTPException,
+        ) as e:
+            raise TankAppStoreConnectionError(e)
+        # In cases where there is a firewall/proxy blocking access to the app store, sometimes
+        # the firewall will drop the connection instead of rejecting it. The API request will
+        # timeout which unfortunately results in a generic SSLError with only the message text
+        # to give us a clue why the request failed.
+        # The exception raised in this case is "ssl.SSLError: The read operation timed out"
+        except httplib2.ssl.SSLError as e:
+            if "timed" in str(e):
+                raise TankAppStoreConnectionError(
+                    "Connection to %s timed out: %s" % (app_store_sg.config.server, e)
                 )
+            else:
+                # other type of ssl error
+                raise TankAppStoreError(e)
+        except Exception as e:
+            raise TankAppStoreError(e)
 
-            self._app_store_connections[sg_url] = (app_store_sg, script_user)
+        if script_user is None:
+            raise TankAppStoreError(
+                "Could not evaluate the current App Store User! Please contact support."
+            )
 
-        return self._app_store_connections[sg_url]
+        return (app_store_sg, script_user)
 
     def __get_app_store_proxy_setting(self):
         """
@@ -1101,15 +1339,17 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         log.debug("Retrieving app store credentials from %s" % sg.base_url)
 
-        # handle proxy setup by pulling the proxy details from the main shotgun connection
+        # handle proxy setup by pulling the proxy details from the main shotgun connection.
+        # The opener isn't installed globally, as bundles may be downloaded concurrently.
         if sg.config.proxy_handler:
             opener = urllib.request.build_opener(sg.config.proxy_handler)
-            urllib.request.install_opener(opener)
+        else:
+            opener = urllib.request.build_opener()
 
         # now connect to our site and use a special url to retrieve the app store script key
         session_token = sg.get_session_token()
         post_data = {"session_token": session_token}
-        response = urllib.request.urlopen(
+        response = opener.open(
             "%s/api3/sgtk_install_script" % sg.base_url,
             urllib.parse.urlencode(post_data).encode("utf-8"),
         )
@@ -1128,6 +1368,16 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         return data["script_name"], data["script_key"]
 
+    def prepare_concurrent_download(self):
+        """
+        Connects to the app store from the calling thread, as this uses the
+        site connection, so the download can then happen in another thread.
+
+        :returns: True
+        """
+        self.__create_sg_app_store_connection()
+        return True
+
     def has_remote_access(self):
         """
         Probes if the current descriptor is able to handle
@@ -22,6 +22,7 @@ from ...util import sgre as re
 from ...util.version import is_version_newer, is_version_newer_or_equal
 from .. import constants
 from ..errors import TankDescriptorError, TankMissingManifestError
+from .bundle_cache_index import g_bundle_cache_index
 
 log = LogManager.get_logger(__name__)
 
@@ -780,6 +781,7 @@ class IODescriptorBase(object):
         # pass an empty skip list to ensure we copy things like the .git folder
         filesystem.ensure_folder_exists(new_cache_path, permissions=0o777)
         filesystem.copy_folder(source_cache_path, new_cache_path, skip_list=[])
+        g_bundle_cache_index.invalidate(new_cache_path)
         return True
 
     ###############################################################################################
@@ -828,6 +830,20 @@ class IODescriptorBase(object):
         """
         pass
 
+    def prepare_concurrent_download(self):
+        """
+        Prepares this descriptor to be downloaded by :meth:`download_local` from
+        another thread, while other descriptors are downloaded.
+
+        This is called from the thread which owns the Shotgun connection of the
+        descriptor. Descriptor types which need that connection to download
+        reimplement this method to do what is not thread safe up front, or to
+        refuse being downloaded from another thread.
+
+        :returns: True if the descriptor can be downloaded from another thread.
+        """
+        return True
+
     def get_latest_version(self, constraint_pattern=None):
         """
         Returns a descriptor object that represents the latest version.
@@ -843,6 +859,31 @@ class IODescriptorBase(object):
         """
         raise NotImplementedError
 
+    @classmethod
+    def prefetch_latest_versions(cls, io_descriptors, constraint_patterns):
+        """
+        Retrieves, in as few remote requests as possible, the data needed to
+        resolve the latest version of several descriptors of this type.
+
+        Descriptor types which can batch their remote queries reimplement this
+        method so that subsequent calls to :meth:`get_latest_version` do not
+        need to query the remote again, until :meth:`clear_prefetched_versions`
+        is called. The default implementation does nothing.
+
+        :param io_descriptors: List of descriptors of this type.
+        :param constraint_patterns: List of the constraint patterns which will
+            be passed to :meth:`get_latest_version`, one per descriptor.
+        """
+        pass
+
+    @classmethod
+    def clear_prefetched_versions(cls):
+        """
+        Releases the data retrieved by :meth:`prefetch_latest_versions`.
+        The default implementation does nothing.
+        """
+        pass
+
     def get_latest_cached_version(self, constraint_pattern=None):
         """
         Returns a descriptor object that represents the latest version
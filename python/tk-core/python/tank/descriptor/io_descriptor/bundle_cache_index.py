@@ -0,0 +1,410 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+In memory index of the bundles found in the bundle cache roots.
+"""
+
+import json
+import os
+import threading
+import time
+
+from .. import constants
+from ... import LogManager
+
+log = LogManager.get_logger(__name__)
+
+# Version of the manifest file format.
+MANIFEST_VERSION = 1
+
+# Maximum depth of a bundle folder below a bundle cache root, reached by the
+# legacy <root>/apps/app_store/<name>/<version> layout.
+_MAX_BUNDLE_DEPTH = 4
+
+
+class BundleCacheIndex(object):
+    """
+    Answers whether bundles are present in the bundle cache roots without
+    checking each candidate location on disk.
+
+    The first time a folder of a bundle cache root is needed, its sub folders
+    are listed and the listing is kept. Looking up a bundle walks these listings
+    from the root down to the bundle folder, so a bundle missing from a root,
+    typically a fallback root, is usually ruled out from listings already made
+    for other bundles. Bundles found complete on disk are remembered.
+
+    Results are only trusted for
+    :data:`~tank.descriptor.constants.BUNDLE_CACHE_LISTING_LIFETIME` seconds: a
+    folder missing from an older listing is looked up again on disk, so bundles
+    written by other processes are picked up, and a bundle known to be complete
+    for longer is checked again on disk, so bundles removed from the bundle
+    cache are no longer reported. Listings and known bundles are also dropped
+    when a folder is invalidated, and the whole index is cleared before bundles
+    are cached for a configuration.
+
+    When the :data:`~tank.descriptor.constants.BUNDLE_CACHE_MANIFEST_ENV_VAR`
+    environment variable is set to ``1``, the complete bundles of a root are
+    also read from a manifest file stored at its root, and bundles downloaded to
+    a root are added to its manifest. The manifest only lists bundles known to
+    be complete, so bundles missing from it are still looked up through the
+    listings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # normalized folder path -> (time of the listing, set of the names of
+        # its sub folders, or None if it couldn't be listed).
+        self._listings = {}
+        # normalized path of the bundles known to be complete -> time they
+        # were last seen on disk, or 0 if they were only read from a manifest.
+        self._complete_bundles = {}
+        # roots for which the manifest was read.
+        self._manifest_roots = set()
+
+        self._lookups = 0
+        self._cached_lookups = 0
+        self._nb_listings = 0
+
+    def exists(self, root, path, check_bundle):
+        """
+        Checks if a bundle is present in a bundle cache root.
+
+        :param str root: Bundle cache root.
+        :param str path: Path to the bundle, inside the root.
+        :param check_bundle: Callable validating a bundle folder found on disk,
+            for example that it was completely downloaded. It is called with the
+            path of the folder and returns a boolean.
+        :returns: True if the bundle is present and valid.
+        """
+        root = os.path.normpath(root)
+        path = os.path.normpath(path)
+        if self._use_manifest():
+            self._read_manifest(root)
+
+        key = os.path.normcase(path)
+        with self._lock:
+            self._lookups += 1
+            seen_time = self._complete_bundles.get(key)
+            if (
+                seen_time is not None
+                and time.time() - seen_time < constants.BUNDLE_CACHE_LISTING_LIFETIME
+            ):
+                self._cached_lookups += 1
+                return True
+
+        if seen_time is not None:
+            # the bundle was complete, only check it is still there.
+            if os.path.isdir(path):
+                with self._lock:
+                    self._complete_bundles[key] = time.time()
+                return True
+            log.debug("Bundle %s was removed from the bundle cache." % path)
+            self.invalidate(path)
+            return False
+
+        if not self._folder_exists(root, path):
+            return False
+
+        if not check_bundle(path):
+            return False
+
+        with self._lock:
+            self._complete_bundles[key] = time.time()
+        return True
+
+    def add_bundle(self, root, path):
+        """
+        Records a bundle written to a bundle cache root by this process.
+
+        :param str root: Bundle cache root.
+        :param str path: Path to the complete bundle, inside the root.
+        """
+        root = os.path.normpath(root)
+        path = os.path.normpath(path)
+        self.invalidate(path)
+        with self._lock:
+            self._complete_bundles[os.path.normcase(path)] = time.time()
+
+        if self._use_manifest():
+            self._add_to_manifest(root, path)
+
+    def invalidate(self, path):
+        """
+        Drops the listings of a folder and of its parent folders, and the
+        bundles known to be complete inside the folder, so changes made to
+        them are picked up.
+
+        :param str path: Path of a folder which was created, modified or removed.
+        """
+        path = os.path.normpath(path)
+        key = os.path.normcase(path)
+        with self._lock:
+            for bundle_key in list(self._complete_bundles):
+                if bundle_key == key or bundle_key.startswith(key + os.path.sep):
+                    del self._complete_bundles[bundle_key]
+            while True:
+                self._listings.pop(os.path.normcase(path), None)
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+
+    def clear(self):
+        """
+        Drops all listings and known bundles.
+        """
+        with self._lock:
+            self._listings.clear()
+            self._complete_bundles.clear()
+            self._manifest_roots.clear()
+
+    @property
+    def stats(self):
+        """
+        :returns: Dictionary with the number of bundle ``lookups`` done, the
+            number of ``cached_lookups`` answered from the bundles already known
+            to be complete and the number of folder ``listings`` made.
+        """
+        return {
+            "lookups": self._lookups,
+            "cached_lookups": self._cached_lookups,
+            "listings": self._nb_listings,
+        }
+
+    def _folder_exists(self, root, path):
+        """
+        Checks if a folder exists inside a root, from the listings of its
+        parent folders. A folder missing from a listing which expired is
+        looked up again with a new listing.
+
+        :param str root: Normalized path of the root.
+        :param str path: Normalized path of the folder.
+        :returns: True if the folder exists.
+        """
+        relative_path = os.path.relpath(path, root)
+        if relative_path == os.curdir:
+            return os.path.isdir(path)
+
+        folder = root
+        for name in relative_path.split(os.path.sep):
+            name = os.path.normcase(name)
+            (listing_time, sub_folders) = self._get_sub_folders(folder)
+            if sub_folders is None or name not in sub_folders:
+                if time.time() - listing_time < constants.BUNDLE_CACHE_LISTING_LIFETIME:
+                    return False
+                (_, sub_folders) = self._list_sub_folders(folder)
+                if sub_folders is None or name not in sub_folders:
+                    return False
+            folder = os.path.join(folder, name)
+        return True
+
+    def _get_sub_folders(self, folder):
+        """
+        Returns the names of the sub folders of a folder, listing it if needed.
+
+        :param str folder: Normalized path of the folder.
+        :returns: Tuple of the time of the listing and of the set of normalized
+            names, which is None if the folder doesn't exist.
+        """
+        listing = self._listings.get(os.path.normcase(folder))
+        if listing is not None:
+            return listing
+        return self._list_sub_folders(folder)
+
+    def _list_sub_folders(self, folder):
+        """
+        Lists the sub folders of a folder on disk and keeps the listing.
+
+        :param str folder: Normalized path of the folder.
+        :returns: Tuple of the time of the listing and of the set of normalized
+            names, which is None if the folder doesn't exist.
+        """
+        listing_time = time.time()
+        sub_folders = set()
+        try:
+            for dir_entry in os.scandir(folder):
+                try:
+                    if dir_entry.is_dir():
+                        sub_folders.add(os.path.normcase(dir_entry.name))
+                except OSError:
+                    continue
+        except OSError:
+            sub_folders = None
+
+        listing = (listing_time, sub_folders)
+        with self._lock:
+            self._nb_listings += 1
+            self._listings[os.path.normcase(folder)] = listing
+        return listing
+
+    def _use_manifest(self):
+        """
+        :returns: True if manifest files should be read and maintained.
+        """
+        return os.environ.get(constants.BUNDLE_CACHE_MANIFEST_ENV_VAR, "0") == "1"
+
+    def _read_manifest(self, root):
+        """
+        Reads the manifest of a root, if it wasn't already.
+
+        :param str root: Normalized path of the root.
+        """
+        if root in self._manifest_roots:
+            return
+
+        with self._lock:
+            if root in self._manifest_roots:
+                return
+            bundle_paths = _load_manifest(root)
+            for bundle_path in bundle_paths:
+                # bundles may have been removed since the manifest was written.
+                self._complete_bundles.setdefault(os.path.normcase(bundle_path), 0)
+            self._manifest_roots.add(root)
+
+        if bundle_paths:
+            log.debug(
+                "Read %s bundles from the manifest of bundle cache %s."
+                % (len(bundle_paths), root)
+            )
+
+    def _add_to_manifest(self, root, path):
+        """
+        Adds a bundle to the manifest of a root.
+
+        Failing to update the manifest is not an error, the bundle will be
+        found on disk instead.
+
+        :param str root: Normalized path of the root.
+        :param str path: Normalized path of the bundle.
+        """
+        with self._lock:
+            bundle_paths = _load_manifest(root)
+            if path in bundle_paths:
+                return
+            bundle_paths.append(path)
+            try:
+                _save_manifest(root, bundle_paths)
+            except Exception as e:
+                log.debug(
+                    "Could not add %s to the manifest of bundle cache %s: %s"
+                    % (path, root, e)
+                )
+
+
+def _get_manifest_path(root):
+    """
+    :param str root: Bundle cache root.
+    :returns: Path to the manifest file of the root.
+    """
+    return os.path.join(root, constants.BUNDLE_CACHE_MANIFEST_FILE)
+
+
+def _load_manifest(root):
+    """
+    Reads the manifest file of a root.
+
+    :param str root: Normalized path of the root.
+    :returns: List of the normalized paths of the bundles listed in the
+        manifest, empty if there is no valid manifest.
+    """
+    manifest_path = _get_manifest_path(root)
+    try:
+        with open(manifest_path, "rt") as fh:
+            manifest = json.load(fh)
+    except (IOError, OSError):
+        return []
+    except Exception as e:
+        log.debug("Ignoring invalid bundle cache manifest %s: %s" % (manifest_path, e))
+        return []
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        log.debug(
+            "Ignoring bundle cache manifest %s of another version." % manifest_path
+        )
+        return []
+
+    return [
+        os.path.normpath(os.path.join(root, *relative_path.split("/")))
+        for relative_path in manifest.get("bundles", [])
+    ]
+
+
+def _save_manifest(root, bundle_paths):
+    """
+    Writes the manifest file of a root.
+
+    The file is written next to its final location first and then moved in
+    place, so readers never see a partially written file.
+
+    :param str root: Normalized path of the root.
+    :param bundle_paths: List of the normalized paths of the bundles in the root.
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "bundles": sorted(
+            os.path.relpath(bundle_path, root).replace(os.path.sep, "/")
+            for bundle_path in bundle_paths
+        ),
+    }
+    manifest_path = _get_manifest_path(root)
+    tmp_path = "%s.%d.tmp" % (manifest_path, os.getpid())
+    try:
+        with open(tmp_path, "wt") as fh:
+            json.dump(manifest, fh, indent=1)
+        os.replace(tmp_path, manifest_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_bundle_cache_manifest(root):
+    """
+    Scans a bundle cache root and writes a manifest of the complete bundles it
+    contains.
+
+    The manifest is only read when the
+    :data:`~tank.descriptor.constants.BUNDLE_CACHE_MANIFEST_ENV_VAR` environment
+    variable is set to ``1``. Bundles downloaded by cores which don't mark
+    downloads as complete are not listed, and are found on disk instead.
+
+    .. note:: Bundles removed from a root after its manifest was written are
+        still checked for on disk, so the manifest should be written again when
+        a bundle cache is cleaned up.
+
+    :param str root: Bundle cache root.
+    :returns: The number of bundles in the manifest.
+    """
+    root = os.path.normpath(root)
+    bundle_paths = []
+    for (folder, dir_names, _) in os.walk(root):
+        if folder == root:
+            # skip temporary downloads.
+            dir_names[:] = [name for name in dir_names if name != "tmp"]
+            continue
+
+        complete_file = os.path.join(
+            folder,
+            constants.BUNDLE_CACHE_METADATA_FOLDER,
+            constants.BUNDLE_CACHE_DOWNLOAD_COMPLETE_FILE,
+        )
+        if os.path.exists(complete_file):
+            bundle_paths.append(folder)
+            dir_names[:] = []
+        elif os.path.relpath(folder, root).count(os.path.sep) + 1 >= _MAX_BUNDLE_DEPTH:
+            dir_names[:] = []
+
+    _save_manifest(root, bundle_paths)
+    log.debug("Wrote manifest of %s bundles in %s." % (len(bundle_paths), root))
+    return len(bundle_paths)
+
+
+g_bundle_cache_index = BundleCacheIndex()
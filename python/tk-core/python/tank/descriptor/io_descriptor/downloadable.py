@@ -13,8 +13,10 @@ import os
 import uuid
 
 from .base import IODescriptorBase
+from .bundle_cache_index import g_bundle_cache_index
+from .. import constants
 from ..errors import TankDescriptorIOError
-from ...util import filesystem
+from ...util import bytecode, filesystem
 
 from ... import LogManager
 
@@ -44,7 +46,44 @@ class IODescriptorDownloadable(IODescriptorBase):
                 # .. code that will be executed post download.
     """
 
-    _DOWNLOAD_TRANSACTION_COMPLETE_FILE = "install_complete"
+    _DOWNLOAD_TRANSACTION_COMPLETE_FILE = constants.BUNDLE_CACHE_DOWNLOAD_COMPLETE_FILE
+
+    def get_path(self):
+        """
+        Returns the path to the folder where this item resides. If no
+        cache exists for this path, None is returned.
+
+        Locations inside the bundle cache roots are looked up through the
+        bundle cache index rather than checked on disk one by one.
+        """
+        for path in self._get_cache_paths():
+            root = self._get_cache_root(path)
+            if root is None:
+                if self._exists_local(path):
+                    return path
+            elif g_bundle_cache_index.exists(root, path, self._exists_local):
+                return path
+
+        return None
+
+    def _get_cache_root(self, path):
+        """
+        Returns the bundle cache root a cache path is in.
+
+        :param str path: Path returned by :meth:`_get_cache_paths`.
+        :returns: The innermost bundle cache root containing the path, or None.
+        """
+        path = os.path.normcase(os.path.normpath(path))
+        cache_root = None
+        for root in self._fallback_roots + [self._bundle_cache_root]:
+            if not root:
+                continue
+            normalized_root = os.path.normcase(os.path.normpath(root))
+            if path.startswith(normalized_root + os.path.sep) and (
+                cache_root is None or len(root) > len(cache_root)
+            ):
+                cache_root = root
+        return cache_root
 
     def download_local(self):
         """
@@ -55,6 +94,14 @@ class IODescriptorDownloadable(IODescriptorBase):
         if self.exists_local():
             return
 
+        # the bundle cache index doesn't see bundles downloaded by other processes
+        # since it listed the bundle cache, so check on disk before downloading.
+        for path in self._get_cache_paths():
+            if self._exists_local(path):
+                log.debug("%s was downloaded to %s by another process." % (self, path))
+                g_bundle_cache_index.invalidate(path)
+                return
+
         with self.open_write_location() as temporary_path:
             # attempt to download the descriptor to the temporary path.
             log.debug(
@@ -219,6 +266,10 @@ class IODescriptorDownloadable(IODescriptorBase):
             # download completed ok! Run post processing
             self._post_download(target)
 
+        # the bundle is now complete in the primary bundle cache, whether it was
+        # moved there by us or by another process.
+        g_bundle_cache_index.add_bundle(self._bundle_cache_root, target)
+
     def _get_temporary_cache_path(self):
         """
         Returns a temporary download cache path for this descriptor.
@@ -244,10 +295,15 @@ class IODescriptorDownloadable(IODescriptorBase):
         """
         Method executed after a descriptor has been downloaded successfully.
 
+        If enabled, the python files of the descriptor are compiled to byte code.
+
         :param download_path: The path on disk to which the descriptor has been
         downloaded.
         """
-        pass
+        if os.environ.get(constants.COMPILE_BUNDLES_ENV_VAR, "0") == "1":
+            # downloaded descriptors never change, so the byte code doesn't
+            # need to be checked against the sources.
+            bytecode.compile_folder(download_path)
 
     def _exists_local(self, path):
         """
@@ -301,4 +357,4 @@ class IODescriptorDownloadable(IODescriptorBase):
         # Do not set this as a hidden folder (with a . in front) in case somebody does a
         # rm -rf * or a manual deletion of the files. This will ensure this is treated just like
         # any other file.
-        return os.path.join(path, "tk-metadata")
+        return os.path.join(path, constants.BUNDLE_CACHE_METADATA_FOLDER)
@@ -329,6 +329,15 @@ class IODescriptorShotgunEntity(IODescriptorDownloadable):
             # no cached version exists
             return None
 
+    def prepare_concurrent_download(self):
+        """
+        Shotgun descriptors are downloaded with the site connection, which
+        isn't thread safe, so they are never downloaded from another thread.
+
+        :returns: False
+        """
+        return False
+
     def has_remote_access(self):
         """
         Probes if the current descriptor is able to handle
@@ -13,5 +13,10 @@ This module contains functionality relating to folder creation.
 
 """
 
-from .operations import process_filesystem_structure, synchronize_folders
-from .configuration import read_ignore_files
+from .operations import (
+    process_filesystem_structure,
+    process_filesystem_structure_for_entities,
+    synchronize_folders,
+)
+from .configuration import read_ignore_files, get_schema_signature, FolderConfiguration
+from .folder_io import FolderIOReceiver
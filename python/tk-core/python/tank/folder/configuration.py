@@ -52,6 +52,34 @@ def read_ignore_files(schema_config_path):
     return ignore_files
 
 
+def get_schema_signature(schema_config_path):
+    """
+    Returns a value which changes whenever a file or folder of the schema is
+    added, removed or modified, so a :class:`FolderConfiguration` built from
+    it can be reused until then.
+
+    :param schema_config_path: Path to the schema.
+    :returns: A value which can be compared for equality.
+    """
+    signature = []
+    for (folder, dir_names, file_names) in os.walk(schema_config_path):
+        dir_names.sort()
+        for name in [os.curdir] + sorted(file_names):
+            try:
+                stat = os.stat(os.path.join(folder, name))
+            except OSError:
+                # removed while walking the schema, it will be read again.
+                continue
+            signature.append(
+                (
+                    os.path.relpath(os.path.join(folder, name), schema_config_path),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+            )
+    return tuple(signature)
+
+
 class FolderConfiguration(object):
     """
     Class that loads the schema from disk and constructs folder objects.
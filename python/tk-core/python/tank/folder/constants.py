@@ -14,3 +14,13 @@ PRIMARY_STORAGE_NAME = "primary"
 
 # hooks that are used during folder creation.
 PROCESS_FOLDER_CREATION_HOOK_NAME = "process_folder_creation"
+
+# environment variable that can be used to control how many file system
+# operations are carried out concurrently when creating folders. Setting it to
+# 1 carries them out one at a time.
+FOLDER_CREATION_WORKERS_ENV_VAR = "SGTK_FOLDER_CREATION_WORKERS"
+
+# default number of concurrent file system operations when creating folders.
+# Creating folders on network storage is mostly spent waiting on round trips
+# to the server, so they are best overlapped.
+DEFAULT_FOLDER_CREATION_WORKERS = 8
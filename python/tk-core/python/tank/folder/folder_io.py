@@ -16,11 +16,22 @@ Known constraints:
 
 """
 
+import collections
+import concurrent.futures
+import os
+import shutil
+import threading
+import time
+
 from . import constants
 from ..errors import TankError
+from ..log import LogManager
+from ..util import is_windows
 
 from ..path_cache import PathCache
 
+log = LogManager.get_logger(__name__)
+
 
 class FolderIOReceiver(object):
     """
@@ -33,8 +44,10 @@ class FolderIOReceiver(object):
 
         :param tk: A tk api instance
         :param preview: boolean set to true if run in preview mode
-        :param entity_type: string with the sg entity type from the main folder creation request
-        :param entity_ids: list of ids of the sg object for which folder creation was requested.
+        :param entity_type: string with the sg entity type from the main folder creation request,
+                            or None if it was made for entities of different types.
+        :param entity_ids: list of ids of the sg object for which folder creation was requested,
+                           or list of (entity type, id) tuples if entity_type is None.
 
         """
         self._tk = tk
@@ -48,7 +61,7 @@ class FolderIOReceiver(object):
     # methods to call to actually execute the folder creation logic
 
     @classmethod
-    def sync_path_cache(cls, tk, full_sync):
+    def sync_path_cache(cls, tk, full_sync, progress_callback=None):
         """
         Synchronizes the path cache folders.
         This happens as part of execute_folder_creation(), but sometimes it is
@@ -56,8 +69,14 @@ class FolderIOReceiver(object):
 
         :param tk: A tk API instance
         :param full_sync: Do a full sync
+        :param progress_callback: Optional callable reporting the progress of a
+            full sync, see :meth:`PathCache.synchronize`.
         :returns: A list of paths which were calculated to be created
         """
+        if full_sync:
+            # the path cache is rebuilt, release the connection used for lookups.
+            tk._close_path_cache_handle()
+
         path_cache = PathCache(tk)
 
         try:
@@ -68,7 +87,7 @@ class FolderIOReceiver(object):
 
             # new items that were not locally available are returned
             # as a list of dicts with keys id, type, name, configuration and path
-            rd = path_cache.synchronize(full_sync)
+            rd = path_cache.synchronize(full_sync, progress_callback)
 
             # for each item we get back from the path cache synchronization,
             # issue a remote entity folder request and pass that down to
@@ -111,6 +130,29 @@ class FolderIOReceiver(object):
 
         return folders
 
+    @staticmethod
+    def execute_items(items, preview_mode, max_workers=None):
+        """
+        Carries out the file system operations requested by folder creation items,
+        as passed to the process_folder_creation core hook, using a pool of threads.
+
+        Folders are created level by level, so parent folders are always created
+        before their children. The existence of a folder is not checked when its
+        parent was just created. Files and symbolic links are then created once all
+        the folders exist. Remote entity folders are ignored.
+
+        The time spent on each type of action is reported in the debug logs.
+
+        :param items: List of folder creation items, see the process_folder_creation hook.
+        :param preview_mode: If True, only compute what would be created.
+        :param max_workers: Number of operations carried out concurrently. Defaults to
+            the value of the ``SGTK_FOLDER_CREATION_WORKERS`` environment variable, or 8.
+        :returns: List of the files and folders created, in the order of the items.
+        """
+        if max_workers is None:
+            max_workers = _get_folder_creation_workers()
+        return _FolderItemsExecutor(preview_mode, max_workers).execute(items)
+
     def execute_folder_creation(self):
         """
         Runs the actual folder execution.
@@ -307,3 +349,208 @@ class FolderIOReceiver(object):
                 "action": "symlink",
             }
         )
+
+
+def _get_folder_creation_workers():
+    """
+    Returns the number of file system operations that can be carried out
+    concurrently when creating folders.
+
+    The value can be overridden through the ``SGTK_FOLDER_CREATION_WORKERS``
+    environment variable.
+
+    :returns: Number of workers, always at least 1.
+    """
+    workers_str = os.environ.get(constants.FOLDER_CREATION_WORKERS_ENV_VAR)
+    if not workers_str:
+        return constants.DEFAULT_FOLDER_CREATION_WORKERS
+
+    try:
+        return max(1, int(workers_str))
+    except ValueError:
+        log.error(
+            "Environment variable %s value '%s' is not an integer number and "
+            "will be ignored."
+            % (constants.FOLDER_CREATION_WORKERS_ENV_VAR, workers_str)
+        )
+        return constants.DEFAULT_FOLDER_CREATION_WORKERS
+
+
+class _FolderItemsExecutor(object):
+    """
+    Carries out the file system operations of folder creation items concurrently.
+    See :meth:`FolderIOReceiver.execute_items`.
+    """
+
+    # actions creating folders.
+    FOLDER_ACTIONS = ("entity_folder", "folder")
+
+    # actions creating files or links in existing folders.
+    FILE_ACTIONS = ("copy", "create_file", "symlink")
+
+    def __init__(self, preview_mode, max_workers):
+        """
+        :param preview_mode: If True, only compute what would be created.
+        :param max_workers: Number of operations carried out concurrently.
+        """
+        self._preview_mode = preview_mode
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        # action -> [number of items, time spent in seconds]
+        self._timings = collections.OrderedDict()
+
+    def execute(self, items):
+        """
+        Carries out the operations.
+
+        :param items: List of folder creation items.
+        :returns: List of the files and folders created, in the order of the items.
+        """
+        start_time = time.time()
+
+        # index of the first item for each folder, grouped by folder depth so that
+        # parents are processed before their children.
+        folder_indices = {}
+        folders_by_depth = collections.defaultdict(list)
+        file_indices = []
+        for (idx, item) in enumerate(items):
+            action = item.get("action")
+            if action in self.FOLDER_ACTIONS:
+                path = os.path.normpath(item.get("path"))
+                if path not in folder_indices:
+                    folder_indices[path] = idx
+                    folders_by_depth[path.count(os.path.sep)].append(path)
+            elif action in self.FILE_ACTIONS:
+                file_indices.append(idx)
+            # nothing to do for remote entity folders, they were already created
+            # on the shared storage. See the process_folder_creation hook.
+
+        created = [False] * len(items)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers
+        ) as pool:
+            created_folders = set()
+            for depth in sorted(folders_by_depth):
+                paths = folders_by_depth[depth]
+                results = pool.map(
+                    lambda path: self._make_folder(
+                        items[folder_indices[path]],
+                        path,
+                        os.path.dirname(path) in created_folders,
+                    ),
+                    paths,
+                )
+                for (path, was_created) in zip(paths, list(results)):
+                    if was_created:
+                        created_folders.add(path)
+                        created[folder_indices[path]] = True
+
+            results = pool.map(lambda idx: self._make_file(items[idx]), file_indices)
+            for (idx, was_created) in zip(file_indices, list(results)):
+                created[idx] = was_created
+
+        locations = []
+        for (item, was_created) in zip(items, created):
+            if was_created:
+                if item.get("action") == "copy":
+                    locations.append(item.get("target_path"))
+                else:
+                    locations.append(item.get("path"))
+
+        for (action, (nb_items, elapsed)) in self._timings.items():
+            log.debug(
+                "Processed %d '%s' folder creation items in %.3f seconds "
+                "of file system time." % (nb_items, action, elapsed)
+            )
+        log.debug(
+            "Processed %d folder creation items in %.3f seconds with %d workers."
+            % (len(items), time.time() - start_time, self._max_workers)
+        )
+        return locations
+
+    def _make_folder(self, item, path, parent_created):
+        """
+        Creates a folder if it doesn't exist.
+
+        :param item: Folder creation item.
+        :param path: Normalized path of the folder.
+        :param parent_created: True if the parent folder was just created.
+        :returns: True if the folder was created.
+        """
+        start_time = time.time()
+        try:
+            if not parent_created and os.path.exists(path):
+                return False
+            if not self._preview_mode:
+                # create the folder using open permissions
+                if parent_created:
+                    os.mkdir(path, 0o777)
+                else:
+                    os.makedirs(path, 0o777)
+            return True
+        finally:
+            self._add_timing(item.get("action"), time.time() - start_time)
+
+    def _make_file(self, item):
+        """
+        Copies or creates a file, or creates a symbolic link, if it doesn't exist.
+
+        :param item: Folder creation item.
+        :returns: True if the file or link was created.
+        """
+        action = item.get("action")
+        start_time = time.time()
+        try:
+            if action == "symlink":
+                # no windows support
+                if is_windows():
+                    return False
+                path = item.get("path")
+                # note use of lexists to check existance of symlink
+                # rather than what symlink is pointing at
+                if os.path.lexists(path):
+                    return False
+                if not self._preview_mode:
+                    os.symlink(item.get("target"), path)
+                return True
+
+            elif action == "copy":
+                target_path = item.get("target_path")
+                if os.path.exists(target_path):
+                    return False
+                if not self._preview_mode:
+                    # do a standard file copy
+                    shutil.copy(item.get("source_path"), target_path)
+                    # set permissions to open
+                    os.chmod(target_path, 0o666)
+                return True
+
+            else:
+                # create a new file based on content
+                path = item.get("path")
+                parent_folder = os.path.dirname(path)
+                if not self._preview_mode:
+                    # other items may be creating the same parent folder.
+                    os.makedirs(parent_folder, 0o777, exist_ok=True)
+                if os.path.exists(path):
+                    return False
+                if not self._preview_mode:
+                    with open(path, "wb") as fp:
+                        fp.write(item.get("content", "").encode("utf-8"))
+                    # and set permissions to open
+                    os.chmod(path, 0o666)
+                return True
+        finally:
+            self._add_timing(action, time.time() - start_time)
+
+    def _add_timing(self, action, elapsed):
+        """
+        Records the time spent processing an item.
+
+        :param action: Action of the item.
+        :param elapsed: Time spent, in seconds.
+        """
+        with self._lock:
+            timing = self._timings.setdefault(action, [0, 0.0])
+            timing[0] += 1
+            timing[1] += elapsed
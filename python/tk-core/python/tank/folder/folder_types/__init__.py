@@ -16,7 +16,7 @@ folder types that can be created.
 from .errors import EntityLinkTypeMismatch
 from .static import Static
 from .listfield import ListField
-from .entity import Entity
+from .entity import Entity, EntityCache
 from .project import Project
 from .user import UserWorkspace
 from .step import ShotgunStep
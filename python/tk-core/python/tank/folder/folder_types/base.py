@@ -66,7 +66,7 @@ class Folder(object):
         """
         return self._parent
 
-    def extract_shotgun_data_upwards(self, sg, shotgun_data):
+    def extract_shotgun_data_upwards(self, sg, shotgun_data, entity_cache=None):
         """
         Extract data from shotgun for a specific pathway upwards through the
         schema.
@@ -77,11 +77,15 @@ class Folder(object):
         :param sg: Shotgun API instance
         :param shotgun_data: Shotgun data dictionary. For more information,
                              see the Entity implementation.
+        :param entity_cache: Optional :class:`EntityCache` with Shotgun data
+                             prefetched for the current folder creation request.
         """
         if self._parent is None:
             return shotgun_data
         else:
-            return self._parent.extract_shotgun_data_upwards(sg, shotgun_data)
+            return self._parent.extract_shotgun_data_upwards(
+                sg, shotgun_data, entity_cache
+            )
 
     def get_parents(self):
         """
@@ -119,7 +123,14 @@ class Folder(object):
         )
 
     def create_folders(
-        self, io_receiver, path, sg_data, is_primary, explicit_child_list, engine
+        self,
+        io_receiver,
+        path,
+        sg_data,
+        is_primary,
+        explicit_child_list,
+        engine,
+        entity_cache=None,
     ):
         """
         Recursive folder creation. Creates folders for this node and all its children.
@@ -154,6 +165,9 @@ class Folder(object):
         :param engine: String used to limit folder creation. If engine is not None, folder creation
                        traversal will include nodes that have their deferred flag set.
 
+        :param entity_cache: Optional :class:`EntityCache` with the Shotgun data of the
+                             current folder creation request.
+
         :returns: Nothing
         """
 
@@ -162,7 +176,9 @@ class Folder(object):
             return
 
         # run the actual folder creation
-        created_data = self._create_folders_impl(io_receiver, path, sg_data)
+        created_data = self._create_folders_impl(
+            io_receiver, path, sg_data, entity_cache
+        )
 
         # and recurse down to children
         if explicit_child_list:
@@ -192,6 +208,7 @@ class Folder(object):
                         is_primary=False,
                         explicit_child_list=[],
                         engine=engine,
+                        entity_cache=entity_cache,
                     )
 
                 # and then recurse down our specific recursion path
@@ -202,6 +219,7 @@ class Folder(object):
                     is_primary=True,
                     explicit_child_list=explicit_ch,
                     engine=engine,
+                    entity_cache=entity_cache,
                 )
 
         else:
@@ -217,16 +235,19 @@ class Folder(object):
                         is_primary=False,
                         explicit_child_list=[],
                         engine=engine,
+                        entity_cache=entity_cache,
                     )
 
     ###############################################################################################
     # private/protected methods
 
-    def _create_folders_impl(self, io_receiver, parent_path, sg_data):
+    def _create_folders_impl(self, io_receiver, parent_path, sg_data, entity_cache):
         """
         Folder creation implementation. Implemented by all subclasses.
 
-        Should return a list of tuples. Each tuple is a path + a matching shotgun data dictionary
+        Should return a list of tuples. Each tuple is a path + a matching shotgun data dictionary.
+        Shotgun queries should go through entity_cache, the :class:`EntityCache` of the
+        current folder creation request, when it is not None.
         """
         raise NotImplementedError
 
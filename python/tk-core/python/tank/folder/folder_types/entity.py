@@ -10,8 +10,10 @@
 
 import os
 import copy
+import collections
 
 from ...errors import TankError
+from ...log import LogManager
 from ...util import shotgun_entity
 
 from .errors import EntityLinkTypeMismatch
@@ -19,6 +21,8 @@ from .base import Folder
 from .expression_tokens import FilterExpressionToken
 from .util import translate_filter_tokens, resolve_shotgun_filters
 
+log = LogManager.get_logger(__name__)
+
 
 class Entity(Folder):
     """
@@ -134,7 +138,19 @@ class Entity(Folder):
         """
         return []
 
-    def _create_folders_impl(self, io_receiver, parent_path, sg_data):
+    def _get_filters(self):
+        """
+        Returns the filters the entities of this folder are queried with when
+        creating folders.
+
+        Can be subclassed for special cases. The returned filters are resolved
+        into a copy, see :meth:`resolve_shotgun_filters`, and are not modified.
+
+        :returns: Shotgun API filter dictionary, with interleaved tokens.
+        """
+        return self._filters
+
+    def _create_folders_impl(self, io_receiver, parent_path, sg_data, entity_cache):
         """
         Creates folders.
         """
@@ -208,7 +224,7 @@ class Entity(Folder):
         # we should only process this single entity. If not, then use the query filter
 
         # first, resolve the filter queries for the current ids passed in via tokens
-        resolved_filters = resolve_shotgun_filters(self._filters, sg_data)
+        resolved_filters = resolve_shotgun_filters(self._get_filters(), sg_data)
 
         # see if the sg_data dictionary has a "seed" entity type matching our entity type
         my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
@@ -244,7 +260,62 @@ class Entity(Folder):
 
         return entities
 
-    def extract_shotgun_data_upwards(self, sg, shotgun_data):
+    def _get_upwards_query(self):
+        """
+        Returns what is needed to query the Shotgun data of this entity when
+        extracting data upwards, see :meth:`extract_shotgun_data_upwards`.
+
+        :returns: Tuple with a dictionary of the link fields to retrieve mapped to the
+                  token they resolve, the list of fields to retrieve and the list of
+                  filter conditions, without the id condition.
+        """
+        link_map = {}
+        fields_to_retrieve = []
+        additional_filters = []
+
+        # TODO: Support nested conditions
+        for condition in self._filters["conditions"]:
+            vals = condition["values"]
+
+            # note the $FROM$ condition below - this is a bit of a hack to make sure we exclude
+            # the special $FROM$ step based culling filter that is commonly used. Because steps are
+            # sort of free floating and not associated with an entity, removing them from the
+            # resolve should be fine in most cases.
+
+            # so - if at the shot level, we have defined the following filter:
+            # filters: [ { "path": "sg_sequence", "relation": "is", "values": [ "$sequence" ] } ]
+            # the $sequence will be represented by a Token object and we need to get a value for
+            # this token. We fetch the id for this token and then, as we recurse upwards, and process
+            # the parent folder level (the sequence), this id will be the "seed" when we populate that
+            # level.
+
+            if (
+                vals[0]
+                and isinstance(vals[0], FilterExpressionToken)
+                and not condition["path"].startswith("$FROM$")
+            ):
+                expr_token = vals[0]
+                # we should get this field (eg. 'sg_sequence')
+                fields_to_retrieve.append(condition["path"])
+                # add to our map for later processing map['sg_sequence'] = 'Sequence'
+                # note that for List fields, the key is EntityType.field
+                link_map[condition["path"]] = expr_token
+
+            elif not condition["path"].startswith("$FROM$"):
+                # this is a normal filter (we exclude the $FROM$ stuff since it is weird
+                # and specific to steps.) So for example 'name must begin with X' - we want
+                # to include these in the query where we are looking for the object, to
+                # ensure that assets with names starting with X are not created for an
+                # asset folder node which explicitly excludes these via its filters.
+                additional_filters.append(condition)
+
+        # add some extra fields apart from the stuff in the config
+        field_name = shotgun_entity.get_sg_entity_name_field(self._entity_type)
+        fields_to_retrieve.append(field_name)
+
+        return (link_map, fields_to_retrieve, additional_filters)
+
+    def extract_shotgun_data_upwards(self, sg, shotgun_data, entity_cache=None):
         """
         Extracts the shotgun data necessary to create this object and all its parents.
         The shotgun_data input needs to contain a dictionary with a "seed". For example:
@@ -274,6 +345,9 @@ class Entity(Folder):
         NOTE! Because we are using a dictionary where we key by type, it would not be possible
         to have a pathway where the same entity type exists multiple times. For example an
         asset / sub asset relationship.
+
+        If an :class:`EntityCache` is passed, records prefetched in it are used instead of
+        querying Shotgun.
         """
 
         tokens = copy.deepcopy(shotgun_data)
@@ -290,49 +364,12 @@ class Entity(Folder):
         my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
         if my_sg_data_key in tokens:
 
-            link_map = {}
-            fields_to_retrieve = []
-            additional_filters = []
-
-            # TODO: Support nested conditions
-            for condition in self._filters["conditions"]:
-                vals = condition["values"]
-
-                # note the $FROM$ condition below - this is a bit of a hack to make sure we exclude
-                # the special $FROM$ step based culling filter that is commonly used. Because steps are
-                # sort of free floating and not associated with an entity, removing them from the
-                # resolve should be fine in most cases.
-
-                # so - if at the shot level, we have defined the following filter:
-                # filters: [ { "path": "sg_sequence", "relation": "is", "values": [ "$sequence" ] } ]
-                # the $sequence will be represented by a Token object and we need to get a value for
-                # this token. We fetch the id for this token and then, as we recurse upwards, and process
-                # the parent folder level (the sequence), this id will be the "seed" when we populate that
-                # level.
-
-                if (
-                    vals[0]
-                    and isinstance(vals[0], FilterExpressionToken)
-                    and not condition["path"].startswith("$FROM$")
-                ):
-                    expr_token = vals[0]
-                    # we should get this field (eg. 'sg_sequence')
-                    fields_to_retrieve.append(condition["path"])
-                    # add to our map for later processing map['sg_sequence'] = 'Sequence'
-                    # note that for List fields, the key is EntityType.field
-                    link_map[condition["path"]] = expr_token
-
-                elif not condition["path"].startswith("$FROM$"):
-                    # this is a normal filter (we exclude the $FROM$ stuff since it is weird
-                    # and specific to steps.) So for example 'name must begin with X' - we want
-                    # to include these in the query where we are looking for the object, to
-                    # ensure that assets with names starting with X are not created for an
-                    # asset folder node which explicitly excludes these via its filters.
-                    additional_filters.append(condition)
-
-            # add some extra fields apart from the stuff in the config
+            (
+                link_map,
+                fields_to_retrieve,
+                additional_filters,
+            ) = self._get_upwards_query()
             field_name = shotgun_entity.get_sg_entity_name_field(self._entity_type)
-            fields_to_retrieve.append(field_name)
 
             # TODO: AND the id query with this folder's query to make sure this path is
             # valid for the current entity. Throw error if not so driver code knows to
@@ -340,15 +377,22 @@ class Entity(Folder):
             # appears in several locations in the filesystem and that the filters are responsible
             # for determining which location to use for a particular asset.
             my_id = tokens[my_sg_data_key]["id"]
-            additional_filters.append(
-                {"path": "id", "relation": "is", "values": [my_id]}
-            )
-
-            # append additional filter cruft
-            filter_dict = {"logical_operator": "and", "conditions": additional_filters}
-
-            # carry out find
-            rec = sg.find_one(self._entity_type, filter_dict, fields_to_retrieve)
+            if entity_cache is not None and entity_cache.has_record(self, my_id):
+                # the entity was prefetched for the current folder creation request.
+                rec = entity_cache.get_record(self, my_id)
+            else:
+                additional_filters.append(
+                    {"path": "id", "relation": "is", "values": [my_id]}
+                )
+
+                # append additional filter cruft
+                filter_dict = {
+                    "logical_operator": "and",
+                    "conditions": additional_filters,
+                }
+
+                # carry out find
+                rec = sg.find_one(self._entity_type, filter_dict, fields_to_retrieve)
 
             # there are now two reasons why find_one did not return:
             # - the specified entity id does not exist or has been deleted
@@ -361,7 +405,17 @@ class Entity(Folder):
             if not rec:
 
                 # check if it is a missing id or just a filtered out thing
-                if sg.find_one(self._entity_type, [["id", "is", my_id]]) is None:
+                if entity_cache is not None and entity_cache.has_entity(
+                    self._entity_type, my_id
+                ):
+                    exists = entity_cache.entity_exists(self._entity_type, my_id)
+                else:
+                    exists = (
+                        sg.find_one(self._entity_type, [["id", "is", my_id]])
+                        is not None
+                    )
+
+                if not exists:
                     raise TankError(
                         "Could not find PTR %s with id %s as required by "
                         "the folder creation setup." % (self._entity_type, my_id)
@@ -413,4 +467,187 @@ class Entity(Folder):
             return tokens
 
         else:
-            return self._parent.extract_shotgun_data_upwards(sg, tokens)
+            return self._parent.extract_shotgun_data_upwards(sg, tokens, entity_cache)
+
+
+class EntityCache(object):
+    """
+    Shotgun data of the entities needed by a folder creation request.
+
+    Extracting Shotgun data upwards, see :meth:`Entity.extract_shotgun_data_upwards`,
+    queries each entity along the pathway of a requested entity, and queries it
+    again to check if it exists when it doesn't match the filters of the schema.
+    The cache collects instead the entities needed by all the requested entities
+    at each level of the schema, and fetches them with a single query per schema
+    node and batch of ids.
+
+    A cache is only valid for a single folder creation request.
+    """
+
+    # maximum number of ids queried at once.
+    BATCH_SIZE = 500
+
+    def __init__(self, sg):
+        """
+        :param sg: Shotgun API instance
+        """
+        self._sg = sg
+        # (folder object, entity id) -> record, or None if the entity doesn't
+        # match the filters of the folder object.
+        self._records = {}
+        # (entity type, entity id) -> True if the entity exists
+        self._entities = {}
+        # (entity type, filters) -> result of a find_one query
+        self._find_one_results = {}
+
+    def has_record(self, folder_obj, entity_id):
+        """
+        :param folder_obj: :class:`Entity` folder object.
+        :param entity_id: Shotgun entity id.
+        :returns: True if the record of the entity was prefetched for the folder object.
+        """
+        return (folder_obj, entity_id) in self._records
+
+    def get_record(self, folder_obj, entity_id):
+        """
+        :param folder_obj: :class:`Entity` folder object.
+        :param entity_id: Shotgun entity id.
+        :returns: Shotgun record of the entity, or None if it doesn't match the filters
+                  of the folder object.
+        """
+        return self._records[(folder_obj, entity_id)]
+
+    def has_entity(self, entity_type, entity_id):
+        """
+        :param entity_type: Shotgun entity type.
+        :param entity_id: Shotgun entity id.
+        :returns: True if it is known whether the entity exists.
+        """
+        return (entity_type, entity_id) in self._entities
+
+    def entity_exists(self, entity_type, entity_id):
+        """
+        :param entity_type: Shotgun entity type.
+        :param entity_id: Shotgun entity id.
+        :returns: True if the entity exists.
+        """
+        return self._entities[(entity_type, entity_id)]
+
+    def find_one(self, entity_type, filters):
+        """
+        Finds a single entity, returning the result of an identical query made
+        earlier in the request rather than querying Shotgun again.
+
+        :param entity_type: Shotgun entity type.
+        :param filters: Shotgun filters.
+        :returns: Shotgun record, or None if no entity matches the filters.
+        """
+        key = (entity_type, str(filters))
+        if key not in self._find_one_results:
+            self._find_one_results[key] = self._sg.find_one(entity_type, filters)
+        return self._find_one_results[key]
+
+    def prefetch(self, seeds):
+        """
+        Fetches the Shotgun data needed to extract data upwards from folder objects,
+        level by level.
+
+        :param seeds: List of (folder object, entity id) tuples, where the folder objects
+                      are the :class:`Entity` nodes data will be extracted from.
+        """
+        pending = collections.OrderedDict()
+        for (folder_obj, entity_id) in seeds:
+            pending.setdefault(folder_obj, set()).add(entity_id)
+
+        nb_queries = 0
+        while pending:
+            next_pending = collections.OrderedDict()
+            for (folder_obj, entity_ids) in pending.items():
+                nb_queries += self._fetch(folder_obj, entity_ids, next_pending)
+            pending = next_pending
+
+        log.debug(
+            "Prefetched %d records for folder creation with %d queries."
+            % (len(self._records), nb_queries)
+        )
+
+    def _fetch(self, folder_obj, entity_ids, pending):
+        """
+        Fetches the records of entities for a folder object, and adds the entities they
+        link to to the ids pending for the parent folder objects.
+
+        :param folder_obj: :class:`Entity` folder object.
+        :param entity_ids: Set of entity ids.
+        :param pending: Dictionary of the entity ids pending for each folder object,
+                        updated in place.
+        :returns: The number of Shotgun queries made.
+        """
+        entity_ids = sorted(
+            entity_id
+            for entity_id in entity_ids
+            if (folder_obj, entity_id) not in self._records
+        )
+        if not entity_ids:
+            return 0
+
+        entity_type = folder_obj.get_entity_type()
+        (link_map, fields, conditions) = folder_obj._get_upwards_query()
+        parents = [
+            parent for parent in folder_obj.get_parents() if isinstance(parent, Entity)
+        ]
+
+        nb_queries = 0
+        missing_ids = []
+        for idx in range(0, len(entity_ids), self.BATCH_SIZE):
+            batch_ids = entity_ids[idx : idx + self.BATCH_SIZE]
+            filters = {
+                "logical_operator": "and",
+                "conditions": conditions
+                + [{"path": "id", "relation": "in", "values": batch_ids}],
+            }
+            records = dict(
+                (rec["id"], rec) for rec in self._sg.find(entity_type, filters, fields)
+            )
+            nb_queries += 1
+
+            for entity_id in batch_ids:
+                rec = records.get(entity_id)
+                self._records[(folder_obj, entity_id)] = rec
+                if rec is None:
+                    missing_ids.append(entity_id)
+                    continue
+
+                self._entities[(entity_type, entity_id)] = True
+
+                # the entities linked to are extracted by the parent folder objects
+                for (field, link_obj) in link_map.items():
+                    value = rec.get(field)
+                    if (
+                        not isinstance(value, dict)
+                        or value.get("type") != link_obj.get_entity_type()
+                    ):
+                        continue
+                    for parent in parents:
+                        parent_key = FilterExpressionToken.sg_data_key_for_folder_obj(
+                            parent
+                        )
+                        if parent_key == link_obj.get_sg_data_key():
+                            pending.setdefault(parent, set()).add(value["id"])
+
+        # find out which of the entities not matching the filters don't exist
+        missing_ids = [
+            entity_id
+            for entity_id in missing_ids
+            if (entity_type, entity_id) not in self._entities
+        ]
+        for idx in range(0, len(missing_ids), self.BATCH_SIZE):
+            batch_ids = missing_ids[idx : idx + self.BATCH_SIZE]
+            existing_ids = set(
+                rec["id"]
+                for rec in self._sg.find(entity_type, [["id", "in", batch_ids]], ["id"])
+            )
+            nb_queries += 1
+            for entity_id in batch_ids:
+                self._entities[(entity_type, entity_id)] = entity_id in existing_ids
+
+        return nb_queries
@@ -124,7 +124,7 @@ class ListField(Folder):
         """
         return self._field_name
 
-    def _create_folders_impl(self, io_receiver, parent_path, sg_data):
+    def _create_folders_impl(self, io_receiver, parent_path, sg_data, entity_cache):
         """
         Creates a list field folder.
         """
@@ -122,8 +122,6 @@ class Static(Folder):
         self._create_with_parent = create_with_parent
         self._tk = tk
 
-        self._cached_sg_data = {}
-
     def is_dynamic(self):
         """
         Returns true if this folder node requires some sort of dynamic input
@@ -142,7 +140,7 @@ class Static(Folder):
         # base class implementation
         return super()._should_item_be_processed(engine_str, is_primary)
 
-    def _create_folders_impl(self, io_receiver, parent_path, sg_data):
+    def _create_folders_impl(self, io_receiver, parent_path, sg_data, entity_cache):
         """
         Creates a static folder.
         """
@@ -186,20 +184,17 @@ class Static(Folder):
             resolved_filters["conditions"].append(id_filter)
 
             # depending on the filter, it is possible that the same static query will
-            # be generated more than once - so cache the results so that we can minimize
-            # shotgun queries.
-            hash_key = hash(str(resolved_filters))
-
-            if hash_key in self._cached_sg_data:
-                data = self._cached_sg_data[hash_key]
-
+            # be generated more than once - so the results are cached for the current
+            # folder creation request so that we can minimize shotgun queries.
+            if entity_cache is not None:
+                data = entity_cache.find_one(
+                    self._constrain_node.get_entity_type(), resolved_filters
+                )
             else:
                 # call out to shotgun
                 data = self._tk.shotgun.find_one(
                     self._constrain_node.get_entity_type(), resolved_filters
                 )
-                # and cache it
-                self._cached_sg_data[hash_key] = data
 
             if data is None:
                 # no match! this means that our constraints filter did not match the current object
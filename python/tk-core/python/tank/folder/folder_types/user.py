@@ -54,10 +54,6 @@ class UserWorkspace(Entity):
         constructor
         """
 
-        # lazy setup: we defer the lookup of the current user until the folder node
-        # is actually being utilized, see extract_shotgun_data_upwards() below
-        self._user_initialized = False
-
         # user work spaces are always deferred so make sure to add a setting to the metadata
         # note: This should ideally be a parameter passed to the base class.
         metadata["defer_creation"] = True
@@ -74,45 +70,35 @@ class UserWorkspace(Entity):
             create_with_parent=True,
         )
 
-    def create_folders(
-        self, io_receiver, path, sg_data, is_primary, explicit_child_list, engine
-    ):
-        """
-        Inherited and wrapps base class implementation
+    def _get_filters(self):
         """
+        Returns the filters of the folder, with the current user added.
 
-        # first we need to check to see if folders should be created. if the
-        # folder creation is deferred, for example, until a specific engine
-        # is run.
-        if not self._should_item_be_processed(engine, is_primary):
-            return
-
-        # wraps around the Entity.create_folders() method and adds
-        # the current user to the filer query in case this has not already been done.
-        # having this set up before the first call to create_folders rather than in the
-        # constructor is partly for performance, but primarily so that a valid current user
-        # isn't required unless you actually create a user sandbox folder. For example,
-        # if you have a dedicated machine that creates higher level folders, this machine
-        # shouldn't need to have a user id set up - only the artists that actually create
-        # the user folders should need to.
-
-        if not self._user_initialized:
-
-            # this query confirms that there is a matching HumanUser in shotgun for the local login
-            user = login.get_current_user(self._tk)
-
-            if not user:
-                msg = (
-                    "Folder Creation Error: Could not find a HumanUser in PTR with login "
-                    "matching the local login. Check that the local login corresponds to a "
-                    "user in shotgun."
-                )
-                raise TankError(msg)
-
-            user_filter = {"path": "id", "relation": "is", "values": [user["id"]]}
-            self._filters["conditions"].append(user_filter)
-            self._user_initialized = True
-
-        return Entity.create_folders(
-            self, io_receiver, path, sg_data, is_primary, explicit_child_list, engine
-        )
+        The current user is looked up when folders are created rather than in
+        the constructor, partly for performance, but primarily so that a valid
+        current user isn't required unless you actually create a user sandbox
+        folder. For example, if you have a dedicated machine that creates higher
+        level folders, this machine shouldn't need to have a user id set up -
+        only the artists that actually create the user folders should need to.
+
+        The filter is added to a copy on each folder creation request, since the
+        folder configuration is shared by requests made by different users.
+
+        :returns: Shotgun API filter dictionary, with interleaved tokens.
+        """
+        # this query confirms that there is a matching HumanUser in shotgun for the local login
+        user = login.get_current_user(self._tk)
+
+        if not user:
+            msg = (
+                "Folder Creation Error: Could not find a HumanUser in PTR with login "
+                "matching the local login. Check that the local login corresponds to a "
+                "user in shotgun."
+            )
+            raise TankError(msg)
+
+        user_filter = {"path": "id", "relation": "is", "values": [user["id"]]}
+        return {
+            "logical_operator": self._filters["logical_operator"],
+            "conditions": self._filters["conditions"] + [user_filter],
+        }
@@ -13,14 +13,22 @@ Main entry points for folder creation.
 
 """
 
-from .configuration import FolderConfiguration
+import collections
+
 from .folder_io import FolderIOReceiver
-from .folder_types import EntityLinkTypeMismatch
+from .folder_types import EntityLinkTypeMismatch, EntityCache
 from ..errors import TankError
 
 
 def create_single_folder_item(
-    tk, config_obj, io_receiver, entity_type, entity_id, sg_task_data, engine
+    tk,
+    config_obj,
+    io_receiver,
+    entity_type,
+    entity_id,
+    sg_task_data,
+    engine,
+    entity_cache=None,
 ):
     """
     Creates folders for an entity type and an entity id.
@@ -31,6 +39,8 @@ def create_single_folder_item(
     :param entity_id: Shotgun entity id
     :param sg_task_data: shotgun task id if this folder creation is associated with a particular task
     :param engine: Engine to create folders for / indicate second pass if not None.
+    :param entity_cache: Optional EntityCache with the Shotgun data prefetched for the
+                         current folder creation request.
     """
     # TODO: Confirm this entity exists and is in this project
     # Recurse over entire tree and find find all Entity folders of this type
@@ -54,7 +64,7 @@ def create_single_folder_item(
         # in order to create folders.
         try:
             shotgun_entity_data = folder_obj.extract_shotgun_data_upwards(
-                tk.shotgun, entity_id_seed
+                tk.shotgun, entity_id_seed, entity_cache
             )
         except EntityLinkTypeMismatch:
             # the seed entity id object does not satisfy the link
@@ -92,19 +102,23 @@ def create_single_folder_item(
             True,
             folder_objects_to_recurse,
             engine,
+            entity_cache,
         )
 
 
-def synchronize_folders(tk, full_sync):
+def synchronize_folders(tk, full_sync, progress_callback=None):
     """
     Synchronizes any remote folders to ensure they are present both
     in the file system and in any local folder caches
 
     :param tk: A tk API instance
     :param full_sync: Do a full sync
+    :param progress_callback: Optional callable, called while a full sync
+        downloads folders with the number of folders downloaded so far and
+        the number of seconds elapsed.
     :returns: list of items processed
     """
-    return FolderIOReceiver.sync_path_cache(tk, full_sync)
+    return FolderIOReceiver.sync_path_cache(tk, full_sync, progress_callback)
 
 
 def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
@@ -124,10 +138,7 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
     :returns: list of items processed
 
     """
-
-    # check that engine is either a string or None
-    if not (isinstance(engine, str) or engine is None):
-        raise ValueError("engine parameter needs to be a string or None")
+    _validate_engine(engine)
 
     # Ensure ids is a list
     if not isinstance(entity_ids, (list, tuple)):
@@ -144,12 +155,90 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
     if len(entity_ids) == 0:
         return
 
-    # create schema builder
-    schema_cfg_folder = tk.pipeline_configuration.get_schema_config_location()
-    config = FolderConfiguration(tk, schema_cfg_folder)
+    # get the schema builder
+    config = tk._get_folder_configuration()
+
+    # all things to create
+    items = _get_folder_items(tk, config, entity_type, entity_ids)
+
+    # create an object to receive all IO requests
+    io_receiver = FolderIOReceiver(tk, preview, entity_type, entity_ids)
+
+    return _create_folders(tk, config, io_receiver, items, engine)
+
+
+def process_filesystem_structure_for_entities(tk, entities, preview, engine):
+    """
+    Creates filesystem structure in Tank based on Shotgun and a schema config
+    for entities of different types at once. The schema is only read once and
+    the path cache is only updated once for all the entities.
+    Internal implementation.
+
+    :param tk: A tk instance
+    :param entities: list of (entity type, entity id) tuples to process
+    :param preview: enable dry run mode?
+    :param engine: A string representation matching a level in the schema. See
+                   :meth:`process_filesystem_structure`.
+
+    :returns: list of items processed
+    """
+    _validate_engine(engine)
+
+    # group the ids by entity type, keeping the order of the request
+    entity_ids_by_type = collections.OrderedDict()
+    for (entity_type, entity_id) in entities:
+        if not isinstance(entity_id, int):
+            raise ValueError(
+                "Entity id '%s' of type %s is not an int." % (entity_id, entity_type)
+            )
+        entity_ids_by_type.setdefault(entity_type, []).append(entity_id)
+
+    if len(entity_ids_by_type) == 0:
+        return []
+
+    # get the schema builder
+    config = tk._get_folder_configuration()
 
     # all things to create
     items = []
+    for (entity_type, entity_ids) in entity_ids_by_type.items():
+        items.extend(_get_folder_items(tk, config, entity_type, entity_ids))
+
+    # create an object to receive all IO requests
+    if len(entity_ids_by_type) == 1:
+        ((entity_type, entity_ids),) = entity_ids_by_type.items()
+        io_receiver = FolderIOReceiver(tk, preview, entity_type, entity_ids)
+    else:
+        io_receiver = FolderIOReceiver(
+            tk, preview, None, [tuple(entity) for entity in entities]
+        )
+
+    return _create_folders(tk, config, io_receiver, items, engine)
+
+
+def _validate_engine(engine):
+    """
+    Checks the engine parameter of a folder creation request.
+
+    :param engine: Engine name or None.
+    :raises ValueError: If the engine is not a string or None.
+    """
+    # check that engine is either a string or None
+    if not (isinstance(engine, str) or engine is None):
+        raise ValueError("engine parameter needs to be a string or None")
+
+
+def _get_folder_items(tk, config, entity_type, entity_ids):
+    """
+    Returns the entities to create folders for, from a folder creation request.
+
+    :param tk: A tk instance
+    :param config: a FolderConfiguration object representing the folder configuration
+    :param entity_type: A shotgun entity type to create folders for
+    :param entity_ids: list of entity ids to process
+    :returns: list of dictionaries with keys type, id and sg_task_data
+    """
+    items = []
 
     #################################################################################
     #
@@ -206,13 +295,42 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
         for i in entity_ids:
             items.append({"type": entity_type, "id": i, "sg_task_data": None})
 
-    # create an object to receive all IO requests
-    io_receiver = FolderIOReceiver(tk, preview, entity_type, entity_ids)
+    return items
+
+
+def _create_folders(tk, config, io_receiver, items, engine):
+    """
+    Creates the folders of entities and updates the path cache.
+
+    :param tk: A tk instance
+    :param config: a FolderConfiguration object representing the folder configuration
+    :param io_receiver: a FolderIOReceiver representing the folder operation callbacks
+    :param items: list of dictionaries returned by :meth:`_get_folder_items`
+    :param engine: Engine to create folders for / indicate second pass if not None.
+    :returns: list of items processed
+    """
+    # fetch the Shotgun data needed to resolve the folders of all the entities
+    # at once, rather than entity by entity.
+    entity_cache = EntityCache(tk.shotgun)
+    entity_cache.prefetch(
+        [
+            (folder_obj, i["id"])
+            for i in items
+            for folder_obj in config.get_folder_objs_for_entity_type(i["type"])
+        ]
+    )
 
     # now loop over all individual objects and create folders
     for i in items:
         create_single_folder_item(
-            tk, config, io_receiver, i["type"], i["id"], i["sg_task_data"], engine
+            tk,
+            config,
+            io_receiver,
+            i["type"],
+            i["id"],
+            i["sg_task_data"],
+            engine,
+            entity_cache,
         )
 
     folders_created = io_receiver.execute_folder_creation()
@@ -16,6 +16,7 @@ import sys
 import logging
 import inspect
 import threading
+import time
 from .util.loader import load_plugin
 from . import LogManager
 from .errors import (
@@ -469,14 +470,28 @@ class _HooksCache(object):
     A thread-safe cache of loaded hooks.  This uses the hook file path
     and base class as the key to cache all hooks loaded by Toolkit in
     the current session.
+
+    The modification time and size of hook files are recorded when they are
+    loaded, so hooks modified on disk are loaded again the next time they are
+    requested, while unchanged hooks are shared by all the Toolkit instances of
+    the session. Hooks are loaded outside of the cache lock, so only threads
+    requesting the same hook wait for each other.
     """
 
     def __init__(self):
         """
         Construction
         """
+        # (hook path, base class) -> (hook class, hook file signature)
         self._cache = {}
         self._cache_lock = threading.Lock()
+        # (hook path, base class) -> lock held while loading the hook
+        self._load_locks = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+        self._load_time = 0.0
 
     def thread_exclusive(func):
         """
@@ -507,35 +522,94 @@ class _HooksCache(object):
         Clear the hook cache
         """
         self._cache = {}
+        self._load_locks = {}
 
-    @thread_exclusive
-    def find(self, hook_path, hook_base_class):
+    def clear_stale(self):
         """
-        Find a hook in the cache using the hook path and base class
+        Remove the hooks whose file was modified or removed since they were
+        loaded, along with the hooks derived from them.
+        """
+        with self._cache_lock:
+            entries = list(self._cache.items())
 
-        :param hook_path:       The path to the hook to find
-        :param hook_base_class: The base class for the hook to find
-        :returns:               The Hook class if found, None if not
+        stale_entries = []
+        for (key, entry) in entries:
+            try:
+                if _get_hook_file_signature(key[0]) == entry[1]:
+                    continue
+            except OSError:
+                pass
+            stale_entries.append((key, entry))
+
+        with self._cache_lock:
+            for (key, entry) in stale_entries:
+                # the hook may have been reloaded or removed in the meantime
+                if self._cache.get(key) is entry:
+                    self._remove(key)
+
+    def get(self, hook_path, hook_base_class, hook_file_signature, load_hook):
+        """
+        Find a hook in the cache using the hook path and base class, loading
+        it if it isn't cached yet or if its file was modified since it was
+        loaded.
+
+        :param hook_path:           The path to the hook to find
+        :param hook_base_class:     The base class for the hook to find
+        :param hook_file_signature: Signature of the hook file, as returned by
+                                    :meth:`_get_hook_file_signature`
+        :param load_hook:           Callable loading and returning the Hook class
+        :returns:                   The Hook class
         """
         # The unique cache key is a tuple of the path and the base class to allow
         # loading of classes with different bases from the same file
         key = (hook_path, hook_base_class)
-        return self._cache.get(key, None)
+        with self._cache_lock:
+            hook_class = self._find(key, hook_file_signature)
+            if hook_class:
+                return hook_class
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # another thread may have loaded the hook in the meantime - this is
+            # to avoid different threads ending up using different instances of
+            # the loaded class.
+            with self._cache_lock:
+                hook_class = self._find(key, hook_file_signature)
+                if hook_class:
+                    return hook_class
+                self._misses += 1
+
+            start_time = time.time()
+            hook_class = load_hook()
+            load_time = time.time() - start_time
+
+            with self._cache_lock:
+                self._load_time += load_time
+                if key in self._cache:
+                    log.debug("Reloading modified hook %s" % hook_path)
+                    self._reloads += 1
+                    self._remove(key)
+                self._cache[key] = (hook_class, hook_file_signature)
+                self._load_locks[key] = load_lock
+            return hook_class
 
+    @property
     @thread_exclusive
-    def add(self, hook_path, hook_base_class, hook_class):
+    def stats(self):
         """
-        Add the specified hook to the cache if it isn't already present
-
-        :param hook_path:       The path to the hook to add
-        :param hook_base_class: The base class for the hook to add
-        :param hook_class:      The Hook class to add
+        :returns: Dictionary with the number of ``hooks`` in the cache, the
+            number of requests answered from the cache (``hits``), the number of
+            hooks loaded (``misses``), how many of them were reloaded because
+            their file was modified (``reloads``) and the total time spent
+            loading hooks in seconds (``load_time``).
         """
-        # The unique cache key is a tuple of the path and the base class to allow
-        # loading of classes with different bases from the same file
-        key = (hook_path, hook_base_class)
-        if key not in self._cache:
-            self._cache[key] = hook_class
+        return {
+            "hooks": len(self._cache),
+            "hits": self._hits,
+            "misses": self._misses,
+            "reloads": self._reloads,
+            "load_time": self._load_time,
+        }
 
     @thread_exclusive
     def __len__(self):
@@ -544,6 +618,46 @@ class _HooksCache(object):
         """
         return len(self._cache)
 
+    def _find(self, key, hook_file_signature):
+        """
+        Find an up to date hook in the cache. Must be called with the cache
+        lock held.
+
+        :param key:                 (hook path, base class) tuple
+        :param hook_file_signature: Current signature of the hook file
+        :returns:                   The Hook class if found, None if not
+        """
+        entry = self._cache.get(key)
+        if entry and entry[1] == hook_file_signature:
+            self._hits += 1
+            return entry[0]
+        return None
+
+    def _remove(self, key):
+        """
+        Remove a hook from the cache, along with the hooks which were loaded
+        with it as their base class. Must be called with the cache lock held.
+
+        :param key: (hook path, base class) tuple
+        """
+        (hook_class, _) = self._cache.pop(key)
+        self._load_locks.pop(key, None)
+        for derived_key in [k for k in self._cache if k[1] is hook_class]:
+            if derived_key in self._cache:
+                self._remove(derived_key)
+
+
+def _get_hook_file_signature(hook_path):
+    """
+    Returns a signature of a hook file, which changes when the file is modified.
+
+    :param hook_path: Path to the hook file.
+    :returns: Tuple of the modification time and size of the file.
+    :raises OSError: If the file can't be accessed.
+    """
+    stat = os.stat(hook_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 _hooks_cache = _HooksCache()
 _current_hook_baseclass = threading.local()
@@ -556,6 +670,30 @@ def clear_hooks_cache():
     _hooks_cache.clear()
 
 
+def clear_stale_hooks():
+    """
+    Removes the hook classes whose file was modified or removed since they
+    were loaded from the cache where tank keeps hook classes.
+
+    Modified hooks are also loaded again when they are next requested, this
+    allows releasing them early.
+    """
+    _hooks_cache.clear_stale()
+
+
+def get_hooks_cache_stats():
+    """
+    Returns statistics about the cache where tank keeps hook classes.
+
+    :returns: Dictionary with the number of ``hooks`` in the cache, the
+        number of requests answered from the cache (``hits``), the number of
+        hooks loaded (``misses``), how many of them were reloaded because
+        their file was modified (``reloads``) and the total time spent
+        loading hooks in seconds (``load_time``).
+    """
+    return _hooks_cache.stats
+
+
 def execute_hook(hook_path, parent, **kwargs):
     """
     Executes a hook, old-school style.
@@ -683,19 +821,20 @@ def create_hook_instance(hook_paths, parent, base_class=None):
 
     for hook_path in hook_paths:
 
-        if not os.path.exists(hook_path):
+        try:
+            hook_file_signature = _get_hook_file_signature(hook_path)
+        except OSError:
             raise TankFileDoesNotExistError(
                 "Cannot execute hook '%s' - this file does not exist on disk!"
                 % hook_path
             )
 
-        # look to see if we've already loaded this hook into the cache
-        found_hook_class = _hooks_cache.find(hook_path, _current_hook_baseclass.value)
-        if not found_hook_class:
-            # load the hook class from the hook file and cache it - this explicitly looks for a
-            # single class from the hook file that is derived from the current base (or 'Hook' for
-            # backwards compatibility).
-
+        def load_hook():
+            """
+            Load the hook class from the hook file - this explicitly looks for a
+            single class from the hook file that is derived from the current base
+            (or 'Hook' for backwards compatibility).
+            """
             # determine any alternate base classes to look for in addition to the current base:
             alternate_base_classes = []
             if _current_hook_baseclass.value != Hook:
@@ -704,22 +843,17 @@ def create_hook_instance(hook_paths, parent, base_class=None):
                 alternate_base_classes.append(Hook)
 
             # try to load the hook class:
-            loaded_hook_class = load_plugin(
+            return load_plugin(
                 hook_path,
                 valid_base_class=_current_hook_baseclass.value,
                 alternate_base_classes=alternate_base_classes,
             )
 
-            # add it to the cache...
-            _hooks_cache.add(
-                hook_path, _current_hook_baseclass.value, loaded_hook_class
-            )
-
-            # ...and find it again - this is to avoid different threads ending up using
-            # different instances of the loaded class.
-            found_hook_class = _hooks_cache.find(
-                hook_path, _current_hook_baseclass.value
-            )
+        # look to see if we've already loaded this hook into the cache, loading
+        # and caching it otherwise.
+        found_hook_class = _hooks_cache.get(
+            hook_path, _current_hook_baseclass.value, hook_file_signature, load_hook
+        )
 
         # keep track of the current base class:
         _current_hook_baseclass.value = found_hook_class
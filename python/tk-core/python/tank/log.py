@@ -180,6 +180,15 @@ automatically enabled and end users do not need to worry about this.
 If you want debug logging to be written to these files, enable the
 global debug flag.
 
+Log files are written synchronously by default. Set the ``SGTK_ASYNC_FILE_LOGGING``
+environment variable to ``1``, or the ``async_file_logging`` setting of the
+``[Logging]`` section of the user settings to ``true``, to write them from a
+background thread instead, so logging doesn't block on file I/O.
+
+Alternatively, :meth:`LogManager.start_debug_capture` keeps the log records
+which are not written to these files in memory, so they can be written only
+if something goes wrong, for example during the startup of an application.
+
     .. note:: If you are writing a toolkit plugin, we recommend
               that you initialize logging early on in your code by
               calling :meth:`LogManager.initialize_base_file_handler`.
@@ -221,10 +230,13 @@ For more information, see https://docs.python.org/2/library/logging.handlers.htm
 """
 
 
+import collections
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, RotatingFileHandler
 import os
+import queue
 import sys
+import threading
 import time
 import weakref
 import uuid
@@ -272,6 +284,28 @@ class LogManager(object):
                 self, filename, mode, maxBytes, backupCount, encoding
             )
             self._disable_rollover = False
+            self._defer_flush = False
+
+        def flush(self):
+            """
+            Flushes the stream, unless records are being written by :meth:`write_batch`.
+            """
+            if not self._defer_flush:
+                RotatingFileHandler.flush(self)
+
+        def write_batch(self, records):
+            """
+            Writes log records, flushing the stream once they are all written.
+
+            :param list records: Log records to write, regardless of their level.
+            """
+            self._defer_flush = True
+            try:
+                for record in records:
+                    self.handle(record)
+            finally:
+                self._defer_flush = False
+                self.flush()
 
         def doRollover(self):
             """
@@ -382,6 +416,179 @@ class LogManager(object):
                 self, record
             )
 
+    class _AsyncFileHandler(QueueHandler):
+        """
+        Writes log records to a :class:`_SafeRotatingFileHandler` from a background
+        thread, so logging in any thread doesn't block on file I/O.
+
+        Records are queued and written in batches, flushing the file once per batch.
+        The queue is bounded: records logged while it is full are dropped, and the
+        number of records dropped is written to the file once there is room again.
+        """
+
+        # Maximum number of records written between two flushes of the file.
+        BATCH_SIZE = 100
+
+        def __init__(self, file_handler, max_records):
+            """
+            :param file_handler: The :class:`_SafeRotatingFileHandler` to write to.
+            :param int max_records: Maximum number of records waiting to be written.
+            """
+            QueueHandler.__init__(self, queue.Queue(max_records))
+            self._file_handler = file_handler
+            # number of records dropped since the last batch was written. The
+            # handler lock can't guard it, as it is held by logging.shutdown while
+            # waiting for the writer thread in close().
+            self._dropped_records = 0
+            self._dropped_records_lock = threading.Lock()
+            self._writer = threading.Thread(
+                target=self._write_records, name="LogFileWriter"
+            )
+            # Never prevent the process from exiting. logging.shutdown closes the
+            # handler, which writes the records left in the queue.
+            self._writer.daemon = True
+            self._writer.start()
+
+        def enqueue(self, record):
+            """
+            Queues a record, or drops it if the queue is full.
+
+            :param record: The log record, as prepared by :meth:`prepare`.
+            """
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                with self._dropped_records_lock:
+                    self._dropped_records += 1
+
+        def close(self):
+            """
+            Writes the records left in the queue and stops the writer thread.
+            Closing more than once has no effect.
+            """
+            if self._writer.is_alive():
+                # Waits for room in the queue, so no record is dropped.
+                self.queue.put(None)
+                self._writer.join()
+            QueueHandler.close(self)
+
+        def _write_records(self):
+            """
+            Writes the queued records, from the writer thread, until :meth:`close`
+            is called.
+            """
+            stopped = False
+            while not stopped:
+                # Waits for a record, then takes the ones already queued.
+                records = [self.queue.get()]
+                while records[-1] is not None and len(records) < self.BATCH_SIZE:
+                    try:
+                        records.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if records[-1] is None:
+                    records.pop()
+                    stopped = True
+
+                with self._dropped_records_lock:
+                    dropped_records = self._dropped_records
+                    self._dropped_records = 0
+
+                if dropped_records:
+                    records.append(
+                        logging.makeLogRecord(
+                            {
+                                "name": log.name,
+                                "levelno": logging.WARNING,
+                                "levelname": logging.getLevelName(logging.WARNING),
+                                "msg": "%d log records were dropped, as they were "
+                                "logged faster than they could be written to disk."
+                                % dropped_records,
+                            }
+                        )
+                    )
+
+                self._file_handler.write_batch(records)
+
+    class _DebugCaptureHandler(logging.Handler):
+        """
+        Keeps the most recent log records which are not written by the file handlers
+        of the toolkit root logger in memory, until they are written to these file
+        handlers or discarded by :meth:`stop`.
+
+        Records are only formatted when they are written.
+        """
+
+        def __init__(self, root_logger, max_records):
+            """
+            :param root_logger: The toolkit root logger.
+            :param int max_records: Maximum number of records kept in memory.
+            """
+            logging.Handler.__init__(self, logging.DEBUG)
+            self._root_logger = root_logger
+            self._records = collections.deque(maxlen=max_records)
+            self._dropped_records = 0
+
+        def emit(self, record):
+            """
+            Keeps the record in memory, unless it is written to a log file.
+
+            :param record: The log record.
+            """
+            for handler in self._get_file_handlers():
+                if record.levelno >= handler.level:
+                    return
+
+            if len(self._records) == self._records.maxlen:
+                self._dropped_records += 1
+            self._records.append(record)
+
+        def stop(self, flush):
+            """
+            Stops capturing log records. Stopping more than once has no effect.
+
+            This may be called from a different core than the one which started the
+            capture, as the records are written to the file handlers attached to the
+            toolkit root logger when stopping.
+
+            :param bool flush: If True, the captured records are written to the
+                file handlers of the toolkit root logger, regardless of their level.
+                Otherwise they are discarded.
+            """
+            self._root_logger.removeHandler(self)
+
+            records = list(self._records)
+            self._records.clear()
+
+            if flush and records:
+                log.info(
+                    "Writing %d log records captured since %s "
+                    "(%d older records were dropped)."
+                    % (
+                        len(records),
+                        time.strftime(
+                            "%Y-%m-%d %H:%M:%S", time.localtime(records[0].created)
+                        ),
+                        self._dropped_records,
+                    )
+                )
+                for handler in self._get_file_handlers():
+                    for record in records:
+                        # Handler.handle doesn't filter on the level of the handler.
+                        handler.handle(record)
+
+        def _get_file_handlers(self):
+            """
+            :returns: The handlers of the toolkit root logger writing to log files,
+                directly or from a background thread.
+            """
+            return [
+                handler
+                for handler in self._root_logger.handlers
+                if isinstance(handler, (logging.FileHandler, QueueHandler))
+            ]
+
     def __new__(cls, *args, **kwargs):
         #
         # note - this init isn't currently threadsafe.
@@ -395,6 +602,9 @@ class LogManager(object):
             # for writing generic toolkit logs to disk
             instance._std_file_handler = None
             instance._std_file_handler_log_file = None
+            # handler writing to the file handler from a background thread, if
+            # async file logging is enabled
+            instance._std_file_queue_handler = None
 
             # collection of weak references to handlers
             # that were created via the log manager.
@@ -553,6 +763,8 @@ class LogManager(object):
         # process backdoor logger
         if self.base_file_handler:
             self.base_file_handler.setLevel(new_log_level)
+        if self._std_file_queue_handler:
+            self._std_file_queue_handler.setLevel(new_log_level)
 
         # log notifications
         if self._global_debug:
@@ -689,6 +901,35 @@ class LogManager(object):
 
         return handler
 
+    def start_debug_capture(self, max_records=constants.DEBUG_CAPTURE_MAX_RECORDS):
+        """
+        Starts keeping the log records which are not written to the log files in
+        memory, for example debug records when :meth:`global_debug` is off::
+
+            capture = LogManager().start_debug_capture()
+            try:
+                ...
+            except Exception:
+                # write the debug records leading to the error to the log file
+                capture.stop(flush=True)
+                raise
+            else:
+                capture.stop(flush=False)
+
+        This is much cheaper than writing every debug record to disk, as records
+        are only formatted and written when flushed. The capture keeps going after
+        a core swap.
+
+        :param int max_records: Maximum number of records kept in memory. Older
+            records are dropped.
+
+        :returns: Handler capturing the records. Its ``stop(flush)`` method stops
+            the capture, writing the records to the log files if ``flush`` is True.
+        """
+        handler = self._DebugCaptureHandler(self._root_logger, max_records)
+        self._root_logger.addHandler(handler)
+        return handler
+
     def uninitialize_base_file_handler(self):
         """
         Uninitialize base file handler created with :meth:`initialize_base_file_handler`.
@@ -706,13 +947,46 @@ class LogManager(object):
             "Tearing down existing log handler '%s' (%s)"
             % (base_log_file, self._std_file_handler)
         )
-        self._root_logger.removeHandler(self._std_file_handler)
+        if self._std_file_queue_handler:
+            self._root_logger.removeHandler(self._std_file_queue_handler)
+            # write the records still waiting to be written
+            self._std_file_queue_handler.close()
+            self._std_file_queue_handler = None
+        else:
+            self._root_logger.removeHandler(self._std_file_handler)
         self._std_file_handler = None
         self._std_file_handler_log_file = None
 
         # return the previous base log file path.
         return base_log_file
 
+    def _is_async_file_logging_enabled(self):
+        """
+        Checks if the base log file should be written from a background thread.
+
+        This is enabled by setting the ``SGTK_ASYNC_FILE_LOGGING`` environment
+        variable to ``1``, or the ``async_file_logging`` setting of the ``[Logging]``
+        section of the user settings to ``true``. The environment variable takes
+        precedence over the user setting.
+
+        :returns: True if the base log file should be written from a background thread.
+        """
+        if constants.ASYNC_FILE_LOGGING_ENV_VAR in os.environ:
+            return os.environ[constants.ASYNC_FILE_LOGGING_ENV_VAR] == "1"
+
+        # avoid cyclic references
+        from .util import UserSettings
+
+        try:
+            return bool(
+                UserSettings().get_boolean_setting(
+                    *constants.ASYNC_FILE_LOGGING_SETTING
+                )
+            )
+        except Exception as e:
+            log.debug("Unable to read the async file logging user setting: %s" % e)
+            return False
+
     def initialize_base_file_handler(self, log_name):
         """
         Create a file handler and attach it to the stgk base logger.
@@ -804,10 +1078,26 @@ class LogManager(object):
         )
 
         self._std_file_handler.setFormatter(formatter)
-        self._root_logger.addHandler(self._std_file_handler)
+
+        if self._is_async_file_logging_enabled():
+            # the file is written from a background thread, so the level is
+            # checked before records are queued.
+            self._std_file_queue_handler = self._AsyncFileHandler(
+                self._std_file_handler, constants.ASYNC_FILE_LOGGING_MAX_RECORDS
+            )
+            self._std_file_queue_handler.setLevel(self._std_file_handler.level)
+            self._root_logger.addHandler(self._std_file_queue_handler)
+        else:
+            self._root_logger.addHandler(self._std_file_handler)
 
         # log the fact that we set up the log file :)
-        log.debug("Writing to standard log file %s" % log_file)
+        log.debug(
+            "Writing to standard log file %s%s"
+            % (
+                log_file,
+                " from a background thread" if self._std_file_queue_handler else "",
+            )
+        )
 
         # return previous log name
         return previous_log_file
@@ -16,16 +16,23 @@ all Tank items in the file system are kept.
 
 import collections
 import sqlite3
+import struct
 import sys
 import os
 import itertools
 import json
+import threading
+import time
+import weakref
 
 from .platform.engine import show_global_busy, clear_global_busy
 from . import constants
 from .errors import TankError
 from . import LogManager
 from .util.login import get_current_user
+from .util.local_file_storage import LocalFileStorageManager
+from .util.lru_cache import LRUCache
+from .util import filesystem
 
 # Shotgun field definitions to store the path cache data
 SHOTGUN_ENTITY = "FilesystemLocation"
@@ -62,35 +69,44 @@ class PathCache(object):
     # to do so.
     SHOTGUN_ENTITY_QUERY_BATCH_SIZE = 500
 
-    def __init__(self, tk):
+    def __init__(self, tk, check_same_thread=True):
         """
         Constructor.
 
         :param tk: Toolkit API instance
+        :param check_same_thread: If False, the database connection can be used
+            from other threads than the one which created it. Accesses then need
+            to be serialized by the caller.
         """
         self._connection = None
+        self._mirror = None
         self._tk = tk
         self._sync_with_sg = tk.pipeline_configuration.get_shotgun_path_cache_enabled()
 
         if tk.pipeline_configuration.has_associated_data_roots():
             self._path_cache_disabled = False
-            self._init_db()
+            self._init_db(check_same_thread)
             self._roots = tk.pipeline_configuration.get_data_roots()
         else:
             # no primary location found. Path cache therefore does not exist!
             # go into a no-path-cache-mode
             self._path_cache_disabled = True
 
-    def _init_db(self):
+    def _init_db(self, check_same_thread=True):
         """
         Sets up the database
+
+        :param check_same_thread: If False, the database connection can be used
+            from other threads than the one which created it.
         """
         # first, make way for the path cache file. This call
         # will ensure that there is a valid folder and file on
         # disk, created with all the right permissions etc.
         path_cache_file = self._get_path_cache_location()
 
-        self._connection = sqlite3.connect(path_cache_file)
+        self._connection = sqlite3.connect(
+            path_cache_file, check_same_thread=check_same_thread
+        )
 
         # this is to handle unicode properly - make sure that sqlite returns
         # str objects for TEXT fields rather than unicode. Note that any unicode
@@ -175,9 +191,84 @@ class PathCache(object):
 
                     self._connection.commit()
 
+            if (
+                self._sync_with_sg
+                and os.environ.get(constants.PATH_CACHE_WAL_ENV_VAR, "0") == "1"
+            ):
+                # path caches synchronized with Shotgun can always be rebuilt, so
+                # trade some durability for faster writes. Write-ahead logging
+                # doesn't work over network file systems, hence it is opt-in.
+                c.execute("PRAGMA journal_mode=WAL")
+                c.execute("PRAGMA synchronous=NORMAL")
+
         finally:
             c.close()
 
+        if (
+            not self._sync_with_sg
+            and os.environ.get(constants.PATH_CACHE_LOCAL_MIRROR_ENV_VAR, "0") == "1"
+        ):
+            self._init_mirror(path_cache_file, check_same_thread)
+
+    def _init_mirror(self, path_cache_file, check_same_thread=True):
+        """
+        Sets up the local copy of a path cache stored on shared storage, which
+        is then used for lookups. Falls back on reading the path cache itself if
+        the copy can't be set up.
+
+        :param path_cache_file: Path to the path cache database.
+        :param check_same_thread: If False, the database connection can be used
+            from other threads than the one which created it.
+        """
+        mirror_root = LocalFileStorageManager.get_configuration_root(
+            self._tk.shotgun_url,
+            self._tk.pipeline_configuration.get_project_id(),
+            None,
+            self._tk.pipeline_configuration.get_shotgun_id(),
+            LocalFileStorageManager.CACHE,
+        )
+        mirror_file = os.path.join(mirror_root, constants.PATH_CACHE_MIRROR_FILE)
+        try:
+            filesystem.ensure_folder_exists(mirror_root)
+            self._mirror = _PathCacheMirror(
+                path_cache_file, mirror_file, check_same_thread
+            )
+            self._mirror.refresh(self._connection)
+        except Exception as e:
+            log.warning(
+                "Could not copy the path cache %s to %s, it will be read directly: %s"
+                % (path_cache_file, mirror_file, e)
+            )
+            self._close_mirror()
+
+    def _get_read_connection(self):
+        """
+        Returns the database connection to use for lookups: the one to the
+        local copy of the path cache if there is one, brought up to date with
+        the path cache first, or the one to the path cache itself.
+
+        :returns: :class:`sqlite3.Connection`
+        """
+        if self._mirror is not None:
+            try:
+                self._mirror.refresh(self._connection)
+                return self._mirror.connection
+            except Exception as e:
+                log.warning(
+                    "Could not update the local copy of the path cache, "
+                    "it will be read directly: %s" % e
+                )
+                self._close_mirror()
+        return self._connection
+
+    def _close_mirror(self):
+        """
+        Stops using the local copy of the path cache.
+        """
+        if self._mirror is not None:
+            self._mirror.close()
+            self._mirror = None
+
     def _get_path_cache_location(self):
         """
         Creates the path cache file and returns its location on disk.
@@ -299,6 +390,7 @@ class PathCache(object):
         """
         Close the database connection.
         """
+        self._close_mirror()
         if self._connection is not None:
             self._connection.close()
             self._connection = None
@@ -306,7 +398,7 @@ class PathCache(object):
     ############################################################################################
     # shotgun synchronization (PTR data pushed into path cache database)
 
-    def synchronize(self, full_sync=False):
+    def synchronize(self, full_sync=False, progress_callback=None):
         """
         Ensure the local path cache is in sync with Shotgun.
 
@@ -314,6 +406,8 @@ class PathCache(object):
         launch the busy overlay window.
 
         :param full_sync: Boolean to indicate that a full sync should be carried out.
+        :param progress_callback: Optional callable reporting the progress of a
+            full sync. See :meth:`_replay_folder_entities`.
 
         :returns: A list of remote items which were detected, created remotely
                   and not existing in this path cache. These are returned as a list of
@@ -337,7 +431,7 @@ class PathCache(object):
 
             # check if we should do a full sync
             if full_sync:
-                return self._do_full_sync(c)
+                return self._do_full_sync(c, progress_callback)
 
             # first get the last synchronized event log event.
             res = c.execute("SELECT max(last_id) FROM event_log_sync")
@@ -349,7 +443,7 @@ class PathCache(object):
             # expect back something like [(249660,)] for a running cache and [(None,)] for a clear
             if len(data) != 1 or data[0] is None:
                 # we should do a full sync
-                return self._do_full_sync(c)
+                return self._do_full_sync(c, progress_callback)
 
             # we have an event log id - so check if there are any more recent events
             event_log_id = data[0]
@@ -408,7 +502,7 @@ class PathCache(object):
                 log.debug(
                     "No sync information in the event log. Falling back on a full sync."
                 )
-                return self._do_full_sync(c)
+                return self._do_full_sync(c, progress_callback)
 
             elif response[0]["id"] != event_log_id:
                 # there is either no event log data at all or a gap
@@ -420,7 +514,7 @@ class PathCache(object):
                     "like the event log has been truncated, so falling back "
                     "on a full sync." % (event_log_id, response[0]["id"])
                 )
-                return self._do_full_sync(c)
+                return self._do_full_sync(c, progress_callback)
 
             elif len(response) == 1 and response[0]["id"] == event_log_id:
                 # nothing has changed since the last sync
@@ -583,7 +677,7 @@ class PathCache(object):
                 "id": self._tk.pipeline_configuration.get_project_id(),
             }
 
-    def _do_full_sync(self, cursor):
+    def _do_full_sync(self, cursor, progress_callback=None):
         """
         Ensure the local path cache is in sync with Shotgun.
 
@@ -595,6 +689,8 @@ class PathCache(object):
             - path
 
         :param cursor: Sqlite database cursor
+        :param progress_callback: Optional callable reporting the progress of the
+            sync. See :meth:`_replay_folder_entities`.
         """
 
         show_global_busy(
@@ -628,7 +724,9 @@ class PathCache(object):
             else:
                 max_event_log_id = sg_data["id"]
 
-            data = self._replay_folder_entities(cursor, max_event_log_id)
+            data = self._replay_folder_entities(
+                cursor, max_event_log_id, progress_callback
+            )
 
         finally:
             clear_global_busy()
@@ -877,17 +975,27 @@ class PathCache(object):
 
         return sg_data
 
-    def _replay_folder_entities(self, cursor, max_event_log_id):
+    def _replay_folder_entities(self, cursor, max_event_log_id, progress_callback=None):
         """
         Downloads all the filesystem location entities from Shotgun and repopulates the
         path cache with them.
 
+        Entities are downloaded in batches, each of which is written to a temporary
+        table before downloading the next one, so the entities of a whole project
+        never have to be held in memory. The path cache tables are then replaced
+        with the content of the temporary table in a single transaction, so other
+        processes never see a partially synchronized path cache and are only
+        locked out of the database once all the data has been downloaded.
+
         Lastly, this method updates the event_log_sync marker in the sqlite database
         that tracks what the most recent event log id was being synced.
 
         :param cursor: Sqlite database cursor
         :param max_event_log_id: max event log marker to write to the path
                                  cache database after a full operation.
+        :param progress_callback: Optional callable, called after each batch is
+            downloaded with the number of filesystem locations downloaded so far
+            and the number of seconds elapsed since the sync started.
         :returns: A list of remote items which were detected, created remotely
                   and not existing in this path cache. These are returned as a list of
                   dictionaries, each containing keys:
@@ -898,31 +1006,208 @@ class PathCache(object):
         """
         log.debug("Fetching already registered folders from Flow Production Tracking...")
 
-        sg_data = self._get_filesystem_location_entities(folder_ids=None)
+        # the temporary table lives in a separate database private to this
+        # connection, so filling it doesn't lock the path cache.
+        cursor.executescript(
+            """
+            DROP TABLE IF EXISTS temp.path_cache_sync;
 
-        # complete sync - clear our tables first
-        log.debug("Full sync - clearing local sqlite path cache tables...")
-        cursor.execute("DELETE FROM event_log_sync")
-        cursor.execute("DELETE FROM shotgun_status")
-        cursor.execute("DELETE FROM path_cache")
+            CREATE TEMP TABLE path_cache_sync (shotgun_id integer primary key, entity_type text, entity_id integer, entity_name text, root text, path text, primary_entity integer, local_path text);
+            """
+        )
 
-        return_data = []
+        start_time = time.time()
+        nb_records = 0
+        try:
+            for sg_data in self._iter_filesystem_location_entities():
+                rows = []
+                for fsl_entity in sg_data:
+                    mapping = self._resolve_filesystem_location_entry(fsl_entity)
+                    if mapping:
+                        (
+                            entity,
+                            is_primary,
+                            local_os_path,
+                            root_name,
+                            db_path,
+                        ) = mapping
+                        rows.append(
+                            (
+                                fsl_entity["id"],
+                                entity["type"],
+                                entity["id"],
+                                entity["name"],
+                                root_name,
+                                db_path,
+                                is_primary,
+                                local_os_path,
+                            )
+                        )
+                cursor.executemany(
+                    "INSERT INTO path_cache_sync VALUES(?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._connection.commit()
 
-        for x in sg_data:
-            imported_data = self._import_filesystem_location_entry(cursor, x)
-            if imported_data:
-                return_data.append(imported_data)
+                nb_records += len(sg_data)
+                elapsed = time.time() - start_time
+                log.debug(
+                    "Downloaded %s records (%.0f records per second)..."
+                    % (nb_records, nb_records / max(elapsed, 0.001))
+                )
+                if progress_callback:
+                    progress_callback(nb_records, elapsed)
 
-        # lastly, save the id of this event log entry for purpose of future syncing
-        # note - we don't maintain a list of event log entries but just a single
-        # value in the db, so start by clearing the table.
+            log.debug("...Retrieved %s records.", nb_records)
 
-        self._update_last_event_log_synced(cursor, max_event_log_id)
+            # complete sync - clear our tables first
+            log.debug("Full sync - replacing local sqlite path cache tables...")
+            cursor.execute("DELETE FROM event_log_sync")
+            cursor.execute("DELETE FROM shotgun_status")
+            cursor.execute("DELETE FROM path_cache")
 
-        self._connection.commit()
+            # records already in the path cache, duplicates coming from Shotgun,
+            # are skipped, so only the first of them is associated with the row.
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO path_cache(entity_type, entity_id, entity_name, root, path, primary_entity)
+                SELECT entity_type, entity_id, entity_name, root, path, primary_entity
+                FROM path_cache_sync ORDER BY shotgun_id
+                """
+            )
+            self._check_primary_entities_are_unique(cursor)
+
+            # because these records came from shotgun, insert a record in the
+            # shotgun_status table to indicate that they exist in sg
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO shotgun_status(path_cache_id, shotgun_id)
+                SELECT pc.rowid, pcs.shotgun_id
+                FROM path_cache_sync pcs
+                JOIN path_cache pc
+                ON  pc.entity_type = pcs.entity_type
+                AND pc.entity_id = pcs.entity_id
+                AND pc.root = pcs.root
+                AND pc.path = pcs.path
+                AND pc.primary_entity = pcs.primary_entity
+                ORDER BY pcs.shotgun_id
+                """
+            )
+
+            # lastly, save the id of this event log entry for purpose of future syncing
+            # note - we don't maintain a list of event log entries but just a single
+            # value in the db, so start by clearing the table.
+            self._update_last_event_log_synced(cursor, max_event_log_id)
+
+            self._connection.commit()
+
+        except Exception:
+            self._connection.rollback()
+            raise
+
+        # and return the entries which made it into the path cache, which are
+        # all new since the path cache was emptied.
+        return_data = []
+        res = cursor.execute(
+            """
+            SELECT pcs.entity_type, pcs.entity_id, pcs.entity_name, pcs.local_path
+            FROM shotgun_status ss
+            JOIN path_cache_sync pcs ON pcs.shotgun_id = ss.shotgun_id
+            ORDER BY ss.path_cache_id
+            """
+        )
+        for (entity_type, entity_id, entity_name, local_os_path) in res:
+            return_data.append(
+                {
+                    "entity": {
+                        "id": entity_id,
+                        "name": entity_name,
+                        "type": entity_type,
+                    },
+                    "path": local_os_path,
+                    "metadata": SG_METADATA_FIELD,
+                }
+            )
+
+        cursor.execute("DROP TABLE temp.path_cache_sync")
+
+        elapsed = time.time() - start_time
+        log.debug(
+            "Imported %s folders in %.1f seconds (%.0f records per second)."
+            % (len(return_data), elapsed, nb_records / max(elapsed, 0.001))
+        )
 
         return return_data
 
+    def _iter_filesystem_location_entities(self):
+        """
+        Retrieves all the filesystem location entities of the project from
+        Shotgun, one batch at a time.
+
+        Batches are requested by increasing id, so each query starts where the
+        previous one ended instead of paging through the results.
+
+        :returns: Generator of lists of FilesystemLocation entity dictionaries,
+            with the same keys as the ones returned by
+            :meth:`_get_filesystem_location_entities`.
+        """
+        project_entity = self._get_project_link()
+        log.debug(
+            "Getting all the project's FilesystemLocation entries. "
+            "Project id: %s" % (project_entity["id"] if project_entity else None)
+        )
+
+        last_id = 0
+        while True:
+            sg_data = self._tk.shotgun.find(
+                SHOTGUN_ENTITY,
+                [["project", "is", project_entity], ["id", "greater_than", last_id]],
+                [
+                    "id",
+                    SG_METADATA_FIELD,
+                    SG_IS_PRIMARY_FIELD,
+                    SG_ENTITY_ID_FIELD,
+                    SG_PATH_FIELD,
+                    SG_ENTITY_TYPE_FIELD,
+                    SG_ENTITY_NAME_FIELD,
+                ],
+                [{"field_name": "id", "direction": "asc"}],
+                limit=self.SHOTGUN_ENTITY_QUERY_BATCH_SIZE,
+            )
+            if not sg_data:
+                break
+            yield sg_data
+            if len(sg_data) < self.SHOTGUN_ENTITY_QUERY_BATCH_SIZE:
+                break
+            last_id = sg_data[-1]["id"]
+
+    def _check_primary_entities_are_unique(self, cursor):
+        """
+        Ensures that no path of the path cache is associated with more than one
+        primary entity.
+
+        :param cursor: Database cursor.
+        :raises TankError: If a path has more than one primary entity.
+        """
+        res = cursor.execute(
+            """
+            SELECT root, path
+            FROM path_cache
+            WHERE primary_entity = 1
+            GROUP BY root, path
+            HAVING count(*) > 1
+            LIMIT 1
+            """
+        )
+        data = list(res)
+        if data:
+            (root_name, db_path) = data[0]
+            path = self._dbpath_to_path(self._roots.get(root_name, ""), db_path)
+            raise TankError(
+                "Database concurrency problems: The path '%s' is "
+                "associated with more than one PTR entity. Please re-run "
+                "folder creation to try again." % path
+            )
+
     def _update_last_event_log_synced(self, cursor, event_log_id):
         """
         Saves into the db the last event processed from Shotgun.
@@ -941,6 +1226,47 @@ class PathCache(object):
 
         :param cursor: Database cursor.
         :type :class:`sqlite3.Cursor`
+        :param dict fsl_entry: Filesystem location entity dictionary. See
+            :meth:`_resolve_filesystem_location_entry`.
+        """
+        mapping = self._resolve_filesystem_location_entry(fsl_entity)
+        if mapping is None:
+            return None
+        (entity, is_primary, local_os_path, _, _) = mapping
+
+        # all validation checks seem ok - go ahead and make the changes.
+        new_rowid = self._add_db_mapping(cursor, local_os_path, entity, is_primary)
+        if new_rowid:
+            # something was inserted into the db!
+            # because this record came from shotgun, insert a record in the
+            # shotgun_status table to indicate that this record exists in sg
+            cursor.execute(
+                "INSERT INTO shotgun_status(path_cache_id, shotgun_id) " "VALUES(?, ?)",
+                (new_rowid, fsl_entity["id"]),
+            )
+
+            # and add this entry to our list of new things that we will return later on.
+            return {
+                "entity": entity,
+                "path": local_os_path,
+                "metadata": SG_METADATA_FIELD,
+            }
+
+        else:
+            # Note: edge case - for some reason there was already an entry in the path cache
+            # representing this. This could be because of duplicate entries and is
+            # not necessarily an anomaly. It could also happen because a previos sync failed
+            # at some point half way through.
+            log.debug(
+                "Found existing record for '%s', %s. Skipping."
+                % (local_os_path, entity)
+            )
+            return None
+
+    def _resolve_filesystem_location_entry(self, fsl_entity):
+        """
+        Resolves the entity and local path of a filesystem location.
+
         :param dict fsl_entry: Filesystem location entity dictionary with keys:
             - id
             - type
@@ -950,6 +1276,10 @@ class PathCache(object):
             - path
             - linked_entity_type
             - code
+        :returns: Tuple with the entity dictionary, whether the path is the primary
+            location of the entity, the local path, the storage root name and the
+            database path, or None if the location doesn't resolve to a path in one
+            of the storage roots of the project.
         """
         # get entity data from our entry
         entity = {
@@ -1031,34 +1361,13 @@ class PathCache(object):
             log.debug("Could not resolve storages - skipping: %s" % e)
             return None
 
-        # all validation checks seem ok - go ahead and make the changes.
-        new_rowid = self._add_db_mapping(cursor, local_os_path, entity, is_primary)
-        if new_rowid:
-            # something was inserted into the db!
-            # because this record came from shotgun, insert a record in the
-            # shotgun_status table to indicate that this record exists in sg
-            cursor.execute(
-                "INSERT INTO shotgun_status(path_cache_id, shotgun_id) " "VALUES(?, ?)",
-                (new_rowid, fsl_entity["id"]),
-            )
-
-            # and add this entry to our list of new things that we will return later on.
-            return {
-                "entity": entity,
-                "path": local_os_path,
-                "metadata": SG_METADATA_FIELD,
-            }
-
-        else:
-            # Note: edge case - for some reason there was already an entry in the path cache
-            # representing this. This could be because of duplicate entries and is
-            # not necessarily an anomaly. It could also happen because a previos sync failed
-            # at some point half way through.
-            log.debug(
-                "Found existing record for '%s', %s. Skipping."
-                % (local_os_path, entity)
-            )
-            return None
+        return (
+            entity,
+            is_primary,
+            local_os_path,
+            root_name,
+            self._path_to_dbpath(relative_path),
+        )
 
     def _gen_param_string(self, items):
         """
@@ -1280,9 +1589,11 @@ class PathCache(object):
                       - metadata: folder configuration metadata
 
         :param entity_type: sg entity type for the original high level folder creation
-                            request that represents this series of mappings
+                            request that represents this series of mappings, or None
+                            if the request was made for entities of different types.
         :param entity_ids: list of sg entity ids (ints) that represents which objects triggered
-                           the high level folder creation request.
+                           the high level folder creation request, or list of
+                           (entity type, id) tuples if entity_type is None.
 
         """
         if self._path_cache_disabled:
@@ -1313,11 +1624,15 @@ class PathCache(object):
             if self._sync_with_sg and len(data_for_sg) > 0:
 
                 # first, a summary of what we are up to for the event log description
-                entity_ids = ", ".join([str(x) for x in entity_ids])
-                desc = "Created folders on disk for %ss with id: %s" % (
-                    entity_type,
-                    entity_ids,
-                )
+                if entity_type is None:
+                    entities = ", ".join(["%s %s" % x for x in entity_ids])
+                    desc = "Created folders on disk for entities: %s" % entities
+                else:
+                    entity_ids = ", ".join([str(x) for x in entity_ids])
+                    desc = "Created folders on disk for %ss with id: %s" % (
+                        entity_type,
+                        entity_ids,
+                    )
 
                 # now push to shotgun
                 (event_log_id, sg_id_lookup) = self._upload_cache_data_to_shotgun(
@@ -1595,7 +1910,7 @@ class PathCache(object):
 
         # use built in cursor unless specifically provided - means this
         # is part of a larger transaction
-        c = cursor or self._connection.cursor()
+        c = cursor or self._get_read_connection().cursor()
 
         try:
             if primary_only:
@@ -1659,7 +1974,7 @@ class PathCache(object):
 
         # use built in cursor unless specifically provided - means this
         # is part of a larger transaction
-        c = cursor or self._connection.cursor()
+        c = cursor or self._get_read_connection().cursor()
 
         try:
             db_path = self._path_to_dbpath(relative_path)
@@ -1703,7 +2018,7 @@ class PathCache(object):
             # eg. doesn't belong to the project
             return []
 
-        c = self._connection.cursor()
+        c = self._get_read_connection().cursor()
         try:
             db_path = self._path_to_dbpath(relative_path)
             res = c.execute(
@@ -1723,6 +2038,96 @@ class PathCache(object):
 
         return matches
 
+    def get_entities_for_paths(self, paths):
+        """
+        Returns the primary and secondary entities of several paths at once.
+
+        This is equivalent to calling :meth:`get_entity` and
+        :meth:`get_secondary_entities` for each path, but only runs a single
+        query per storage root, which makes it well suited to look up a path
+        and all its parent folders.
+
+        :param paths: List of paths on disk.
+        :returns: Dictionary keyed by path of tuples with the primary entity
+                  of the path, or None, and the list of its secondary entities.
+        :raises TankError: If a path has more than one primary entity.
+        """
+        entities = dict((path, (None, [])) for path in paths)
+
+        if self._path_cache_disabled:
+            # no entries because we don't have a path cache
+            return entities
+
+        # group the paths by storage root, as db paths are relative to them.
+        paths_by_root = collections.defaultdict(dict)
+        for path in paths:
+            try:
+                root_path, relative_path = self._separate_root(path)
+            except TankError:
+                # fail gracefully if path is not a valid path
+                # eg. doesn't belong to the project
+                continue
+            paths_by_root[root_path][self._path_to_dbpath(relative_path)] = path
+
+        c = self._get_read_connection().cursor()
+        try:
+            for root_path, db_paths in paths_by_root.items():
+                db_path_list = list(db_paths.keys())
+                for i in range(
+                    0, len(db_path_list), self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT
+                ):
+                    chunk = db_path_list[i : i + self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT]
+                    res = c.execute(
+                        "SELECT path, entity_type, entity_id, entity_name, primary_entity "
+                        "FROM path_cache WHERE root = ? AND path IN (%s)"
+                        % self._gen_param_string(chunk),
+                        [root_path] + chunk,
+                    )
+                    for (db_path, entity_type, entity_id, entity_name, primary) in res:
+                        path = db_paths[db_path]
+                        # convert to string, not unicode!
+                        entity = {
+                            "type": str(entity_type),
+                            "id": entity_id,
+                            "name": str(entity_name),
+                        }
+                        (primary_entity, secondary_entities) = entities[path]
+                        if not primary:
+                            secondary_entities.append(entity)
+                        elif primary_entity is None:
+                            entities[path] = (entity, secondary_entities)
+                        else:
+                            # never supposed to happen!
+                            raise TankError(
+                                "More than one entry in path database for %s!" % path
+                            )
+        finally:
+            c.close()
+
+        return entities
+
+    def get_data_version(self):
+        """
+        Returns a value which changes whenever another connection commits
+        changes to the path cache database, in this process or another one.
+
+        :returns: A value which can be compared for equality, or None if there
+            is no path cache.
+        """
+        if self._path_cache_disabled:
+            return None
+
+        c = self._get_read_connection().cursor()
+        try:
+            data_version = c.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            c.close()
+
+        if self._mirror is not None:
+            # the local copy may have been updated through this connection.
+            return (data_version, self._mirror.change_counter)
+        return data_version
+
     def ensure_all_entries_are_in_shotgun(self):
         """
         Ensures that all the path cache data in this database is also registered in Shotgun.
@@ -1891,3 +2296,361 @@ class PathCache(object):
         log.info(
             "Migration complete. %s records created in Flow Production Tracking" % len(sg_valid_records)
         )
+
+
+class _PathCacheMirror(object):
+    """
+    Copy on local disk of a path cache stored with the project data, so lookups
+    don't go over the network file system.
+
+    Path caches which are not synchronized with Shotgun don't track their
+    changes in the ``event_log_sync`` table, so changes are detected through
+    the file change counter which sqlite stores in the header of the database
+    and increments on every write transaction. The copy is then brought up to
+    date by copying the path cache records added since the last refresh, or
+    by copying the whole database again if records were removed.
+
+    Only the path cache is read from the copy, all changes are made to the
+    path cache itself.
+    """
+
+    # offset and size of the fields of the database header used.
+    # See https://www.sqlite.org/fileformat.html#the_database_header
+    _HEADER_SIZE = 100
+    _WRITE_VERSION_OFFSET = 18
+    _CHANGE_COUNTER_OFFSET = 24
+
+    # columns copied for each path cache record.
+    _COLUMNS = "entity_type, entity_id, entity_name, root, path, primary_entity"
+
+    def __init__(self, path_cache_file, mirror_file, check_same_thread=True):
+        """
+        :param path_cache_file: Path to the path cache database.
+        :param mirror_file: Path to the copy of the database.
+        :param check_same_thread: If False, the database connection can be used
+            from other threads than the one which created it.
+        """
+        self._path_cache_file = path_cache_file
+        self._mirror_file = mirror_file
+        self._change_counter = None
+        self._connection = sqlite3.connect(
+            mirror_file, check_same_thread=check_same_thread
+        )
+        self._connection.text_factory = str
+
+    @property
+    def connection(self):
+        """
+        Connection to the copy of the path cache.
+        """
+        return self._connection
+
+    @property
+    def change_counter(self):
+        """
+        File change counter of the path cache when the copy was last updated.
+        """
+        return self._change_counter
+
+    def close(self):
+        """
+        Closes the connection to the copy of the path cache.
+        """
+        self._connection.close()
+
+    def refresh(self, path_cache_connection):
+        """
+        Brings the copy up to date with the path cache, if it changed.
+
+        :param path_cache_connection: Connection to the path cache database.
+        :raises TankError: If the path cache can't be copied.
+        """
+        change_counter = self._read_change_counter()
+        if change_counter is not None and change_counter == self._change_counter:
+            return
+
+        state = self._get_state()
+        if state and state[0] == change_counter:
+            # the copy was brought up to date by another process.
+            self._change_counter = change_counter
+            return
+
+        if not state or not self._update(path_cache_connection, state, change_counter):
+            self._copy(path_cache_connection, change_counter)
+
+        self._change_counter = change_counter
+
+    def _read_change_counter(self):
+        """
+        Reads the file change counter of the path cache.
+
+        The header is read without locking the database, the counter being
+        read again on the next refresh if it was being written.
+
+        :returns: The counter as an integer.
+        :raises TankError: If the path cache uses write-ahead logging, in
+            which case the counter isn't updated.
+        """
+        with open(self._path_cache_file, "rb") as fh:
+            header = bytearray(fh.read(self._HEADER_SIZE))
+
+        if len(header) < self._HEADER_SIZE:
+            # empty database, or being created.
+            return None
+
+        if header[self._WRITE_VERSION_OFFSET] == 2:
+            raise TankError(
+                "Path cache %s uses write-ahead logging and can't be copied."
+                % self._path_cache_file
+            )
+
+        return struct.unpack_from(">I", header, self._CHANGE_COUNTER_OFFSET)[0]
+
+    def _get_state(self):
+        """
+        Returns the state of the path cache when the copy was last updated.
+
+        :returns: Tuple with the file change counter of the path cache, the
+            highest path cache record id and the number of records, or None
+            if the copy wasn't made yet.
+        """
+        c = self._connection.cursor()
+        try:
+            try:
+                return c.execute(
+                    "SELECT change_counter, max_rowid, row_count FROM mirror_state"
+                ).fetchone()
+            except sqlite3.OperationalError:
+                return None
+        finally:
+            c.close()
+
+    def _update(self, path_cache_connection, state, change_counter):
+        """
+        Copies the records added to the path cache since the last update.
+
+        :param path_cache_connection: Connection to the path cache database.
+        :param state: Tuple returned by :meth:`_get_state`.
+        :param change_counter: Current file change counter of the path cache.
+        :returns: True if the copy was updated, False if records were changed
+            or removed and the path cache needs to be copied again.
+        """
+        (_, max_rowid, row_count) = state
+        select_last_row = "SELECT %s FROM path_cache WHERE rowid = ?" % self._COLUMNS
+
+        pc = path_cache_connection.cursor()
+        # read the path cache in a single transaction to get consistent results.
+        in_transaction = path_cache_connection.in_transaction
+        if not in_transaction:
+            pc.execute("BEGIN")
+        try:
+            nb_rows = pc.execute("SELECT count(*) FROM path_cache").fetchone()[0]
+            last_row = pc.execute(select_last_row, (max_rowid,)).fetchone()
+            new_rows = pc.execute(
+                "SELECT rowid, %s FROM path_cache WHERE rowid > ? ORDER BY rowid"
+                % self._COLUMNS,
+                (max_rowid,),
+            ).fetchall()
+        finally:
+            if not in_transaction:
+                path_cache_connection.rollback()
+            pc.close()
+
+        if nb_rows != row_count + len(new_rows):
+            return False
+
+        c = self._connection.cursor()
+        try:
+            if c.execute(select_last_row, (max_rowid,)).fetchone() != last_row:
+                return False
+
+            c.executemany(
+                "INSERT OR IGNORE INTO path_cache(rowid, %s) VALUES(?, ?, ?, ?, ?, ?, ?)"
+                % self._COLUMNS,
+                new_rows,
+            )
+            if new_rows:
+                max_rowid = new_rows[-1][0]
+            c.execute(
+                "UPDATE mirror_state SET change_counter = ?, max_rowid = ?, row_count = ?",
+                (change_counter, max_rowid, nb_rows),
+            )
+            self._connection.commit()
+        except Exception:
+            self._connection.rollback()
+            raise
+        finally:
+            c.close()
+
+        log.debug(
+            "Copied %d new records from path cache %s to %s."
+            % (len(new_rows), self._path_cache_file, self._mirror_file)
+        )
+        return True
+
+    def _copy(self, path_cache_connection, change_counter):
+        """
+        Replaces the copy with the whole path cache.
+
+        :param path_cache_connection: Connection to the path cache database.
+        :param change_counter: Current file change counter of the path cache.
+        """
+        start_time = time.time()
+        path_cache_connection.backup(self._connection)
+
+        c = self._connection.cursor()
+        try:
+            (max_rowid, row_count) = c.execute(
+                "SELECT coalesce(max(rowid), 0), count(*) FROM path_cache"
+            ).fetchone()
+            c.execute("DROP TABLE IF EXISTS mirror_state")
+            c.execute(
+                "CREATE TABLE mirror_state "
+                "(change_counter integer, max_rowid integer, row_count integer)"
+            )
+            c.execute(
+                "INSERT INTO mirror_state VALUES(?, ?, ?)",
+                (change_counter, max_rowid, row_count),
+            )
+            self._connection.commit()
+        except Exception:
+            self._connection.rollback()
+            raise
+        finally:
+            c.close()
+
+        log.debug(
+            "Copied path cache %s to %s in %.2f seconds."
+            % (self._path_cache_file, self._mirror_file, time.time() - start_time)
+        )
+
+
+class PathCacheHandle(object):
+    """
+    Long lived access to the path cache of a Toolkit instance, for lookups.
+
+    Opening the path cache runs the cache location hook, connects to the
+    database and checks its schema, which is wasteful for lookups done over and
+    over, like when building contexts from paths. A handle opens the path cache
+    once and keeps its connection until it is closed, letting sqlite keep its
+    statements prepared. The connection is shared by all threads, which take
+    turns using it. It is closed when the engine is destroyed, before a full
+    synchronization of the path cache and when the Toolkit instance is garbage
+    collected, and opened again if needed.
+
+    The entities found for a series of paths are cached. The cache is dropped
+    whenever the path cache database changes, whether it was synchronized by
+    this process or another one.
+    """
+
+    # number of series of paths for which entities are cached.
+    ENTITIES_CACHE_SIZE = 512
+
+    def __init__(self, tk):
+        """
+        :param tk: Toolkit API instance
+        """
+        # the Toolkit instance owns the handle, don't keep it alive.
+        self._tk = weakref.ref(tk)
+        self._lock = threading.Lock()
+        self._path_cache = None
+        self._data_version = None
+        self._entities_cache = LRUCache(self.ENTITIES_CACHE_SIZE)
+
+    def get_entities(self, paths):
+        """
+        Returns the primary and secondary entities of a series of paths,
+        typically a path and its parent folders.
+
+        :param paths: List of paths on disk.
+        :returns: Tuple with the list of primary entities and the list of
+                  secondary entities of the paths, in the order of the paths.
+        :raises TankError: If a path has more than one primary entity.
+        """
+        key = tuple(paths)
+        with self._lock:
+            path_cache = self._get_path_cache()
+            data_version = path_cache.get_data_version()
+            if data_version != self._data_version:
+                self._entities_cache.clear()
+                self._data_version = data_version
+
+            cached_entities = self._entities_cache.get(key)
+            if cached_entities is None:
+                entities_by_path = path_cache.get_entities_for_paths(paths)
+                entities = []
+                secondary_entities = []
+                for path in paths:
+                    (entity, path_secondary_entities) = entities_by_path[path]
+                    if entity:
+                        entities.append(entity)
+                    secondary_entities.extend(path_secondary_entities)
+                cached_entities = (entities, secondary_entities)
+                self._entities_cache.put(key, cached_entities)
+
+        # return copies, so callers can't alter the cached entities.
+        return (
+            [dict(entity) for entity in cached_entities[0]],
+            [dict(entity) for entity in cached_entities[1]],
+        )
+
+    def get_entity(self, path):
+        """
+        Returns an entity given a path.
+
+        See :meth:`PathCache.get_entity`.
+
+        :param path: a path on disk
+        :returns: Shotgun entity dict or None if not found
+        """
+        with self._lock:
+            return self._get_path_cache().get_entity(path)
+
+    def get_paths(self, entity_type, entity_id, primary_only):
+        """
+        Returns a list of paths on disk given an entity.
+
+        See :meth:`PathCache.get_paths`.
+
+        :param entity_type: a Shotgun entity type
+        :param entity_id: a Shotgun entity id
+        :param primary_only: Only return items marked as primary
+        :returns: list of paths on disk
+        """
+        with self._lock:
+            return self._get_path_cache().get_paths(
+                entity_type, entity_id, primary_only
+            )
+
+    def invalidate(self):
+        """
+        Drops the cached entities.
+        """
+        with self._lock:
+            self._entities_cache.clear()
+
+    def close(self):
+        """
+        Closes the database connection. It is opened again if needed.
+        """
+        with self._lock:
+            if self._path_cache is not None:
+                self._path_cache.close()
+                self._path_cache = None
+            self._entities_cache.clear()
+            self._data_version = None
+
+    def _get_path_cache(self):
+        """
+        Returns the path cache, opening it if needed. Must be called with the
+        lock held.
+
+        :returns: :class:`PathCache`
+        """
+        if self._path_cache is None:
+            # the path cache only gets a proxy of the Toolkit instance too, so
+            # the handle can be closed when the instance is garbage collected.
+            self._path_cache = PathCache(
+                weakref.proxy(self._tk()), check_same_thread=False
+            )
+        return self._path_cache
@@ -22,7 +22,7 @@ from .errors import TankError, TankUnreadableFileError
 from .util.version import is_version_older
 from . import constants
 from .platform.environment import InstalledEnvironment, WritableEnvironment
-from .util import shotgun, yaml_cache
+from .util import shotgun, yaml_cache, yaml_cache_file
 from .util import ShotgunPath
 from .util import StorageRoots
 from .util.pickle import retrieve_env_var_pickled
@@ -396,15 +396,27 @@ class PipelineConfiguration(object):
 
     def get_yaml_cache_location(self):
         """
-        Returns the location of the yaml cache for this configuration.
+        Returns the location of the pickled yaml cache for this configuration.
         """
         return os.path.join(self._pc_root, "yaml_cache.pickle")
 
+    def get_yaml_cache_file_location(self):
+        """
+        Returns the location of the binary yaml cache for this configuration.
+        """
+        return os.path.join(self._pc_root, yaml_cache_file.CACHE_FILE_NAME)
+
     def _populate_yaml_cache(self):
         """
-        Loads pickled yaml_cache items if they are found and merges them into
+        Loads the yaml cache items if they are found and merges them into
         the global YamlCache.
+
+        The binary yaml cache is used if available, and the pickled yaml cache
+        written by older versions of core otherwise.
         """
+        if self._populate_yaml_cache_from_file():
+            return
+
         cache_file = self.get_yaml_cache_location()
         if not os.path.exists(cache_file):
             return
@@ -427,6 +439,34 @@ class PipelineConfiguration(object):
         finally:
             fh.close()
 
+    def _populate_yaml_cache_from_file(self):
+        """
+        Adds the items of the binary yaml cache to the global YamlCache. Their
+        data is only decoded when they are requested.
+
+        :returns: True if the binary yaml cache was loaded.
+        """
+        cache_path = self.get_yaml_cache_file_location()
+        if not os.path.exists(cache_path):
+            return False
+
+        # the same configuration can be loaded several times in a session.
+        cache_file = yaml_cache.g_yaml_cache.get_cache_file(cache_path)
+        if cache_file:
+            if cache_file.is_up_to_date():
+                return True
+            yaml_cache.g_yaml_cache.remove_cache_file(cache_file)
+
+        try:
+            cache_file = yaml_cache_file.YamlCacheFile(cache_path, self._pc_root)
+            nb_items = yaml_cache.g_yaml_cache.add_cache_file(cache_file)
+        except Exception as e:
+            log.warning("Could not load yaml cache %s: %s" % (cache_path, e))
+            return False
+
+        log.debug("Added %s items from yaml cache %s" % (nb_items, cache_path))
+        return True
+
     ########################################################################################
     # general access and properties
 
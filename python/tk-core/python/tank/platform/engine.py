@@ -38,6 +38,7 @@ from ..util import sgre as re
 from ..util.metrics import EventMetric
 from ..util.metrics import MetricsDispatcher
 from ..util import metrics_cache
+from ..util.timeline import Timeline, record_span
 from ..log import LogManager
 
 from . import application
@@ -724,9 +725,13 @@ class Engine(TankBundle):
             # finally remove the current engine reference
             set_current_engine(None)
 
-            # now clear the hooks cache to make sure fresh hooks are loaded the
-            # next time an engine is initialized
-            hook.clear_hooks_cache()
+            # now release the hooks modified on disk - fresh hooks are loaded the
+            # next time an engine is initialized while unchanged hooks are reused.
+            hook.clear_stale_hooks()
+
+            # release the path cache database, it is opened again if the
+            # Toolkit instance is used again.
+            self.sgtk._close_path_cache_handle()
 
             # clean up the main thread invoker - it's a QObject so it's important we
             # explicitly set the value to None!
@@ -2539,6 +2544,7 @@ class Engine(TankBundle):
     ##########################################################################################
     # private
 
+    @record_span("engine")
     def __load_apps(self, reuse_existing_apps=False, old_context=None):
         """
         Populate the __applications dictionary, skip over apps that fail to initialize.
@@ -2706,7 +2712,8 @@ class Engine(TankBundle):
                 # track the init of the app
                 self.__currently_initializing_app = app
                 try:
-                    app.init_app()
+                    with Timeline().span("init_app", "engine", app=app_instance_name):
+                        app.init_app()
                 finally:
                     self.__currently_initializing_app = None
 
@@ -69,7 +69,9 @@ class Environment(object):
     def _refresh(self):
         """Refreshes the environment data from disk
         """
-        data = self.__load_environment_data()
+        # the includes processing builds new data structures, so a view over
+        # the cached data is enough and avoids a deep copy of the file.
+        data = self.__load_environment_data(as_view=True)
 
         self._env_data = environment_includes.process_includes(
             self._env_path, data, self.__context
@@ -247,23 +249,30 @@ class Environment(object):
                 constants.ENVIRONMENT_LOCATION_KEY
             )
 
-    def __load_data(self, path):
+    def __load_data(self, path, as_view=False):
         """
         loads the main data from disk, raw form
+
+        :param as_view: If True, a read-only view over the cached data is
+            returned instead of a copy.
         """
         logger.debug("Loading environment data from path: %s", path)
+        if as_view:
+            return g_yaml_cache.get_view(path) or {}
         return g_yaml_cache.get(path) or {}
 
-    def __load_environment_data(self):
+    def __load_environment_data(self, as_view=False):
         """
         Loads the main environment data file.
 
+        :param as_view: If True, a read-only view over the cached data is
+            returned instead of a copy.
         :returns: Dictionary of the data.
 
         :raises TankMissingEnvironmentFile: Raised if the environment file does not exist on disk.
         """
         try:
-            return self.__load_data(self._env_path)
+            return self.__load_data(self._env_path, as_view)
         except TankUnreadableFileError:
             logger.exception("Missing environment file:")
             raise TankMissingEnvironmentFile(
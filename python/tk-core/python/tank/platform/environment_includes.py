@@ -40,7 +40,7 @@ from ..log import LogManager
 from . import constants
 
 from ..util import sgre as re
-from ..util.yaml_cache import g_yaml_cache
+from ..util.yaml_cache import g_yaml_cache, CopyOnWriteDict, CopyOnWriteList
 from ..util.includes import resolve_include
 
 log = LogManager.get_logger(__name__)
@@ -129,6 +129,11 @@ def _resolve_refs_r(lookup_dict, data):
     # default is no processing
     processed_val = data
 
+    if isinstance(data, (CopyOnWriteDict, CopyOnWriteList)):
+        # views over the yaml cache are turned into regular lists and
+        # dictionaries below, so the cached data can be read directly.
+        data = data.raw_data
+
     if isinstance(data, list):
         processed_val = []
         for x in data:
@@ -212,8 +217,9 @@ def _process_includes_r(file_name, data, context):
     fw_lookup = {}
     for include_file in include_files:
 
-        # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
+        # path exists, so try to read it. The data doesn't need to be copied
+        # since resolving its references builds new dictionaries and lists.
+        included_data = g_yaml_cache.get_view(include_file) or {}
 
         # now resolve this data before proceeding
         included_data, included_fw_lookup = _process_includes_r(
@@ -264,12 +270,12 @@ def find_framework_location(file_name, framework_name, context):
                             defined in or None if not found.
     """
     # load the data in for the root file:
-    data = g_yaml_cache.get(file_name) or {}
+    data = g_yaml_cache.get_view(file_name) or {}
 
     # track root frameworks:
     root_fw_lookup = {}
     fw_data = data.get("frameworks", {})
-    if fw_data and isinstance(fw_data, dict):
+    if fw_data and isinstance(fw_data, (dict, CopyOnWriteDict)):
         for fw in fw_data.keys():
             root_fw_lookup[fw] = file_name
 
@@ -324,7 +330,7 @@ def find_reference(file_name, context, token, absolute_location=False):
     :rtype: tuple
     """
     # load the data in
-    data = g_yaml_cache.get(file_name) or {}
+    data = g_yaml_cache.get_view(file_name) or {}
 
     # first build our big fat lookup dict
     include_files = _resolve_includes(file_name, data, context)
@@ -333,7 +339,7 @@ def find_reference(file_name, context, token, absolute_location=False):
 
     for include_file in include_files:
         # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
+        included_data = g_yaml_cache.get_view(include_file) or {}
 
         if token in included_data:
             # If we've been asked to ensure an absolute location, we need
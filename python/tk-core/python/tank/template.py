@@ -15,12 +15,14 @@ Management of file and directory templates.
 
 import os
 import sys
+import threading
 
 from . import templatekey
 from .errors import TankError
 from . import constants
 from .template_path_parser import TemplatePathParser
 from tank.util import is_linux, is_macos, is_windows, sgre as re
+from tank.util.lru_cache import LRUCache
 
 
 class Template(object):
@@ -29,6 +31,9 @@ class Template(object):
     in the form of :class:`TemplateKey` objects.
     """
 
+    # number of recently parsed paths for which the result of get_fields is kept
+    _FIELDS_CACHE_SIZE = 32
+
     @classmethod
     def _keys_from_definition(cls, definition, template_name, keys):
         """Extracts Template Keys from a definition.
@@ -107,6 +112,13 @@ class Template(object):
         self._prefix = ""
         self._static_tokens = []
 
+        # variations prepared for parsing, built on first use.
+        self._compiled_variations = None
+        # the path parsers of the variations are reused, one path at a time.
+        self._parse_lock = threading.Lock()
+        # recent results of get_fields, keyed by path and skipped keys
+        self._fields_cache = LRUCache(self._FIELDS_CACHE_SIZE)
+
     def __repr__(self):
         class_name = self.__class__.__name__
         if self.name:
@@ -497,19 +509,79 @@ class Template(object):
         :returns: Values found in the path based on keys in template
         :rtype: Dictionary
         """
-        path_parser = None
-        fields = None
-
-        for ordered_keys, static_tokens in zip(self._ordered_keys, self._static_tokens):
-            path_parser = TemplatePathParser(ordered_keys, static_tokens)
-            fields = path_parser.parse_path(input_path, skip_keys)
-            if fields != None:
-                break
+        cache_key = (input_path, tuple(skip_keys) if skip_keys else ())
+        result = self._fields_cache.get(cache_key)
+        if result is None:
+            result = self._parse_fields(input_path, skip_keys)
+            self._fields_cache.put(cache_key, result)
 
+        (fields, error) = result
         if fields is None:
-            raise TankError("Template %s: %s" % (str(self), path_parser.last_error))
+            raise TankError("Template %s: %s" % (str(self), error))
+
+        # the cached dictionary must not be altered by the caller.
+        return dict(fields)
+
+    def _parse_fields(self, input_path, skip_keys):
+        """
+        Extracts key name, value pairs from a string.
 
-        return fields
+        :param input_path: Source path for values
+        :param skip_keys: Optional keys to skip
+        :returns: Tuple with the fields found in the path and None, or
+            None and the reason why the path couldn't be parsed.
+        """
+        last_error = None
+        lower_path = None
+
+        for (path_parser, tokens_regex) in self._get_compiled_variations():
+            if tokens_regex is not None:
+                # the parser requires all static tokens to be found in order in
+                # the path, which the regular expression checks in a single pass.
+                if lower_path is None:
+                    normalized_path = os.path.normpath(input_path)
+                    lower_path = normalized_path.lower()
+                if not tokens_regex.search(lower_path):
+                    last_error = (
+                        "Tried to extract fields from path '%s', "
+                        "but the path does not fit the template." % normalized_path
+                    )
+                    continue
+
+            with self._parse_lock:
+                fields = path_parser.parse_path(input_path, skip_keys)
+                if fields is not None:
+                    return (fields, None)
+                last_error = path_parser.last_error
+
+        return (None, last_error)
+
+    def _get_compiled_variations(self):
+        """
+        Returns the variations of the template, prepared for parsing.
+
+        :returns: List of tuples with the path parser of the variation and a
+            compiled regular expression matching paths containing all static
+            tokens in order. The regular expression is None for variations
+            without keys, which must match the static token exactly.
+        """
+        if self._compiled_variations is None:
+            compiled_variations = []
+            for ordered_keys, static_tokens in zip(
+                self._ordered_keys, self._static_tokens
+            ):
+                if ordered_keys and static_tokens:
+                    tokens_regex = re.compile(
+                        ".*?".join(re.escape(token) for token in static_tokens),
+                        re.DOTALL,
+                    )
+                else:
+                    tokens_regex = None
+                compiled_variations.append(
+                    (TemplatePathParser(ordered_keys, static_tokens), tokens_regex)
+                )
+            self._compiled_variations = compiled_variations
+        return self._compiled_variations
 
 
 class TemplatePath(Template):
@@ -0,0 +1,163 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Index over template definitions, used to quickly find the templates a path may match.
+"""
+
+import os
+
+from .template import TemplatePath
+
+
+class TemplateIndex(object):
+    """
+    Narrows down the templates which can match a given path.
+
+    A template path always starts with its storage root, so the first static
+    token of each of its variations (the root followed by the static part of the
+    definition preceding the first key) has to be a prefix of any absolute path
+    matching it. These leading tokens are stored in a prefix trie, so looking up
+    the candidate templates for a path only requires walking the path once,
+    instead of parsing it against every template.
+
+    Templates which can't be indexed this way, like string templates, are
+    always returned as candidates, as are all templates when the path being
+    looked up is not absolute. The candidates are then validated as usual, so
+    the end result is identical to validating the path against every template.
+    """
+
+    class _TrieNode(object):
+        """
+        Node of the prefix trie, keyed by lower case characters.
+        """
+
+        __slots__ = ("children", "templates")
+
+        def __init__(self):
+            self.children = {}
+            self.templates = []
+
+    def __init__(self, templates):
+        """
+        :param templates: Dictionary of :class:`Template` instances, keyed by name.
+        """
+        # keep a copy of the dictionary so we can tell if the templates changed.
+        self._templates = dict(templates)
+        self._root = self._TrieNode()
+        # templates which have to be validated against every path
+        self._unindexed = []
+        # order of the templates in the dictionary, so candidates are returned in
+        # the same order as a linear scan would.
+        self._order = {}
+
+        for position, template in enumerate(self._templates.values()):
+            self._order[id(template)] = position
+            leading_tokens = self._get_leading_tokens(template)
+            if leading_tokens is None:
+                self._unindexed.append(template)
+                continue
+            for token in leading_tokens:
+                node = self._root
+                for char in token:
+                    node = node.children.setdefault(char, self._TrieNode())
+                node.templates.append(template)
+
+        self._lookups = 0
+        self._candidates = 0
+
+    @staticmethod
+    def _get_leading_tokens(template):
+        """
+        Returns the first static token of each variation of a template.
+
+        :param template: :class:`Template` instance.
+        :returns: Set of lower case strings, or None if the template can't be indexed.
+        """
+        if not isinstance(template, TemplatePath):
+            return None
+
+        leading_tokens = set()
+        for static_tokens in template._static_tokens:
+            if not static_tokens or not os.path.isabs(static_tokens[0]):
+                return None
+            leading_tokens.add(static_tokens[0])
+        return leading_tokens
+
+    def is_valid_for(self, templates):
+        """
+        Checks if the index was built from the given templates.
+
+        :param templates: Dictionary of :class:`Template` instances, keyed by name.
+        :returns: True if the index can be used to look up these templates.
+        """
+        # dictionaries of templates compare their values by identity.
+        return self._templates == templates
+
+    def get_candidates(self, path):
+        """
+        Returns the templates which may match a path.
+
+        :param path: Path to look up.
+        :returns: List of :class:`Template` instances, in the order of the templates
+            dictionary the index was built from.
+        """
+        # paths are parsed normalized and case insensitively by the templates.
+        lower_path = os.path.normpath(path).lower()
+
+        if not os.path.isabs(lower_path):
+            candidates = list(self._templates.values())
+        else:
+            candidates = list(self._unindexed)
+            node = self._root
+            for char in lower_path:
+                candidates.extend(node.templates)
+                node = node.children.get(char)
+                if node is None:
+                    break
+            else:
+                candidates.extend(node.templates)
+
+            # a template may be reached through several variations.
+            unique_candidates = {}
+            for template in candidates:
+                unique_candidates[id(template)] = template
+            candidates = sorted(
+                unique_candidates.values(), key=lambda t: self._order[id(t)]
+            )
+
+        self._lookups += 1
+        self._candidates += len(candidates)
+        return candidates
+
+    @property
+    def stats(self):
+        """
+        Statistics about the lookups done through the index.
+
+        :returns: Dictionary with the number of ``templates`` indexed, the number of
+            ``lookups`` done, the average number of ``candidates`` per lookup, and the
+            ``hit_rate``: the ratio of templates which didn't have to be validated.
+        """
+        nb_templates = len(self._templates)
+        if self._lookups:
+            average_candidates = self._candidates / float(self._lookups)
+        else:
+            average_candidates = 0.0
+        if self._lookups and nb_templates:
+            hit_rate = 1.0 - average_candidates / nb_templates
+        else:
+            hit_rate = 0.0
+        return {
+            "templates": nb_templates,
+            "lookups": self._lookups,
+            "candidates": average_candidates,
+            "hit_rate": hit_rate,
+        }
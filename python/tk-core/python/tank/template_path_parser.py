@@ -91,6 +91,8 @@ class TemplatePathParser(object):
         """
         skip_keys = skip_keys or []
         input_path = os.path.normpath(input_path)
+        # the parser can be reused, forget about the previous path.
+        self.last_error = "Unable to parse path"
 
         # all token comparisons are done case insensitively.
         lower_path = input_path.lower()
@@ -9,7 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 from .platforms import is_windows, is_linux, is_macos
-from .shotgun import register_publish
+from .shotgun import register_publish, register_publishes
 from .shotgun import resolve_publish_path
 from .shotgun import find_publish
 from .shotgun import download_url
@@ -54,5 +54,6 @@ from .errors import PublishResolveError
 from .errors import PublishPathNotDefinedError, PublishPathNotSupported
 
 from .user_settings import UserSettings
+from .timeline import Timeline
 
 from .storage_roots import StorageRoots
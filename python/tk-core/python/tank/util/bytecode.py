@@ -0,0 +1,245 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers to compile python files to byte code ahead of their first import.
+"""
+
+import concurrent.futures
+import importlib.machinery
+import importlib.util
+import os
+import py_compile
+import sys
+
+from .. import LogManager
+from .local_file_storage import LocalFileStorageManager
+
+log = LogManager.get_logger(__name__)
+
+# Default number of files compiled concurrently. Compiling is mostly bound by
+# the interpreter lock, but reading sources and writing byte code from and to
+# network storage isn't, so a few threads still help.
+DEFAULT_COMPILE_WORKERS = 4
+
+# Folders which never contain code to import.
+_SKIPPED_FOLDERS = ["__pycache__", ".git", ".svn", ".hg"]
+
+
+@LogManager.log_timing
+def compile_folder(
+    path,
+    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    max_workers=DEFAULT_COMPILE_WORKERS,
+):
+    """
+    Compiles all the python files in a folder and its sub folders to byte code.
+
+    Files which already have byte code are skipped, as are files which fail to
+    compile, for example because they target another version of Python.
+
+    The default invalidation mode writes byte code which is never checked
+    against its source, which saves reading the source at import time, and is
+    meant for folders which never change once written, like bundles in the
+    bundle cache. Use :attr:`py_compile.PycInvalidationMode.CHECKED_HASH` for
+    folders whose files could be edited.
+
+    :param str path: Folder to compile.
+    :param invalidation_mode: A :class:`py_compile.PycInvalidationMode`.
+    :param int max_workers: Number of files compiled concurrently.
+    :returns: The number of files compiled.
+    """
+    source_files = []
+    for (root, dir_names, file_names) in os.walk(path):
+        dir_names[:] = [name for name in dir_names if name not in _SKIPPED_FOLDERS]
+        for file_name in file_names:
+            if file_name.endswith(".py"):
+                source_file = os.path.join(root, file_name)
+                if not os.path.exists(importlib.util.cache_from_source(source_file)):
+                    source_files.append(source_file)
+
+    def compile_file(source_file):
+        try:
+            py_compile.compile(
+                source_file, doraise=True, invalidation_mode=invalidation_mode
+            )
+        except Exception as e:
+            log.debug("Could not compile %s: %s" % (source_file, e))
+            return False
+        return True
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        nb_compiled = sum(executor.map(compile_file, source_files))
+
+    log.debug(
+        "Compiled %s of %s python files in %s." % (nb_compiled, len(source_files), path)
+    )
+    return nb_compiled
+
+
+def use_user_pycache(paths):
+    """
+    Stores the byte code of the code imported from the given folders in the
+    user's cache folder if they are read-only, so it doesn't need to be compiled
+    on each launch.
+
+    Only modules found through ``sys.path`` or package paths under the read-only
+    folders, and modules of a core loaded by the core import handler from them,
+    are affected: their byte code is read from next to the sources if
+    it exists there, for example if compiled by :func:`compile_folder`, and
+    from the user's cache folder otherwise. The byte code of any other module,
+    for example the ones of the host application, is left alone.
+
+    :param list paths: Folders code is imported from, typically the bundle caches.
+    :returns: The read-only folders whose byte code is stored in the user's
+        cache folder.
+    """
+    read_only_paths = [
+        os.path.normcase(os.path.abspath(path))
+        for path in paths
+        if os.path.isdir(path) and not os.access(path, os.W_OK)
+    ]
+    new_paths = [path for path in read_only_paths if path not in _read_only_roots]
+    if not new_paths:
+        return list(_read_only_roots)
+
+    _read_only_roots.extend(new_paths)
+    if _user_pycache_path_hook not in sys.path_hooks:
+        sys.path_hooks.insert(0, _user_pycache_path_hook)
+
+    # finders may already be cached for the folders of the read-only roots.
+    for path_entry in list(sys.path_importer_cache):
+        if isinstance(path_entry, str) and _is_read_only_path(path_entry):
+            del sys.path_importer_cache[path_entry]
+
+    log.debug(
+        "Read-only folders %s found, storing their byte code in %s."
+        % (new_paths, _get_user_pycache_root())
+    )
+    return list(_read_only_roots)
+
+
+# Read-only folders whose byte code is stored in the user's cache folder.
+_read_only_roots = []
+
+
+def _is_read_only_path(path):
+    """
+    :param str path: Path to check.
+    :returns: True if the path is under one of the read-only roots.
+    """
+    path = os.path.normcase(os.path.abspath(path))
+    for root in _read_only_roots:
+        if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+def _get_user_pycache_root():
+    """
+    :returns: The folder storing the byte code of the read-only roots.
+    """
+    return os.path.join(
+        LocalFileStorageManager.get_global_root(LocalFileStorageManager.CACHE),
+        "pycache",
+    )
+
+
+def _get_user_pycache_path(bytecode_path):
+    """
+    :param str bytecode_path: Path of byte code next to its source.
+    :returns: Path of the byte code in the user's cache folder, laid out like
+        ``sys.pycache_prefix`` would.
+    """
+    return os.path.join(
+        _get_user_pycache_root(),
+        os.path.splitdrive(os.path.abspath(bytecode_path))[1].lstrip(os.sep),
+    )
+
+
+class _UserPycacheLoader(importlib.machinery.SourceFileLoader):
+    """
+    Source file loader reading and writing byte code from and to the user's
+    cache folder when it can't be found next to the source.
+    """
+
+    def get_data(self, path):
+        """
+        Reads a file, falling back to the user's cache folder for byte code.
+
+        :param str path: Path of the file.
+        :returns: The content of the file, as bytes.
+        """
+        if not path.endswith(tuple(importlib.machinery.BYTECODE_SUFFIXES)):
+            return super(_UserPycacheLoader, self).get_data(path)
+
+        try:
+            return super(_UserPycacheLoader, self).get_data(path)
+        except OSError:
+            return super(_UserPycacheLoader, self).get_data(
+                _get_user_pycache_path(path)
+            )
+
+    def set_data(self, path, data, *args, **kwargs):
+        """
+        Writes byte code to the user's cache folder, as the folder next to the
+        source is read-only.
+
+        :param str path: Path of the byte code next to its source.
+        :param bytes data: The byte code.
+        """
+        super(_UserPycacheLoader, self).set_data(
+            _get_user_pycache_path(path), data, *args, **kwargs
+        )
+
+
+def create_source_loader(module_fullname, module_file):
+    """
+    Creates the loader of a python source file, storing its byte code in the
+    user's cache folder if the file is under one of the read-only folders
+    passed to :func:`use_user_pycache`.
+
+    This is meant for finders which create loaders themselves rather than
+    going through ``sys.path_hooks``, like the core import handler.
+
+    :param str module_fullname: Full name of the module.
+    :param str module_file: Path to the source file of the module.
+    :returns: A :class:`importlib.machinery.SourceFileLoader`.
+    """
+    if _is_read_only_path(module_file):
+        return _UserPycacheLoader(module_fullname, module_file)
+    return importlib.machinery.SourceFileLoader(module_fullname, module_file)
+
+
+def _user_pycache_path_hook(path_entry):
+    """
+    Path hook finding the modules of the folders under the read-only roots with
+    :class:`_UserPycacheLoader`.
+
+    :param str path_entry: Folder to find modules in.
+    :returns: A :class:`importlib.machinery.FileFinder`.
+    :raises ImportError: If the folder isn't under a read-only root, so the next
+        path hook is used.
+    """
+    if not isinstance(path_entry, str) or not _is_read_only_path(path_entry):
+        raise ImportError("Not a read-only bundle cache folder: %s" % path_entry)
+
+    return importlib.machinery.FileFinder(
+        path_entry,
+        (
+            importlib.machinery.ExtensionFileLoader,
+            importlib.machinery.EXTENSION_SUFFIXES,
+        ),
+        (_UserPycacheLoader, importlib.machinery.SOURCE_SUFFIXES),
+        (
+            importlib.machinery.SourcelessFileLoader,
+            importlib.machinery.BYTECODE_SUFFIXES,
+        ),
+    )
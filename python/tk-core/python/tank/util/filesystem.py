@@ -291,6 +291,46 @@ def copy_folder(src, dst, folder_permissions=0o775, skip_list=None):
     return files
 
 
+def get_folder_snapshot(src, skip_list=None):
+    """
+    Returns the modification time and size of the files of a folder, which
+    can be compared with a previous snapshot to find out which files changed.
+
+    Files are skipped the same way :meth:`copy_folder` skips them, so a
+    snapshot lists the files a copy of the folder contains.
+
+    :param src: Path to the folder.
+    :param skip_list: List of file names to skip at the root of the folder.
+                      If this parameter is omitted or set to None, common
+                      files such as ``.git``, ``.gitignore`` etc will be ignored.
+    :returns: Dictionary of file paths relative to the folder, using forward
+              slashes, to a ``[modification time in nanoseconds, size]`` list.
+    """
+    # files or directories to always skip
+    SKIP_LIST_ALWAYS = ["__MACOSX", ".DS_Store"]
+
+    if skip_list is None:
+        actual_skip_list = list(SKIP_LIST_DEFAULT)
+    else:
+        actual_skip_list = list(skip_list)
+    actual_skip_list.extend(SKIP_LIST_ALWAYS)
+
+    snapshot = {}
+    for dir_entry in os.scandir(src):
+        if dir_entry.name in actual_skip_list:
+            continue
+
+        if dir_entry.is_dir():
+            # sub folders use the default skip list, as copy_folder does.
+            for (path, signature) in get_folder_snapshot(dir_entry.path).items():
+                snapshot["%s/%s" % (dir_entry.name, path)] = signature
+        else:
+            stat = dir_entry.stat()
+            snapshot[dir_entry.name] = [stat.st_mtime_ns, stat.st_size]
+
+    return snapshot
+
+
 @with_cleared_umask
 def move_folder(src, dst, folder_permissions=0o775):
     """
@@ -0,0 +1,96 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+
+
+class LRUCache(object):
+    """
+    Mapping holding a bounded number of items, discarding the least recently
+    used item when full.
+
+    The cache is meant to sit in front of frequently called code, so it doesn't
+    take a lock: each operation on the underlying ordered dictionary is atomic,
+    and concurrent accesses can at worst evict an item slightly early or skew
+    the statistics.
+    """
+
+    # marker for missing items, as None can be cached.
+    _MISSING = object()
+
+    def __init__(self, max_size):
+        """
+        :param int max_size: Maximum number of items held by the cache.
+        """
+        self._max_size = max_size
+        self._items = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        """
+        Returns the item stored for a key, marking it as the most recently used.
+
+        :param key: Key of the item.
+        :param default: Value returned if the key is not in the cache.
+        :returns: The cached item, or ``default``.
+        """
+        value = self._items.get(key, self._MISSING)
+        if value is self._MISSING:
+            self._misses += 1
+            return default
+        self._hits += 1
+        try:
+            self._items.move_to_end(key)
+        except KeyError:
+            # evicted by another thread in the meantime.
+            pass
+        return value
+
+    def put(self, key, value):
+        """
+        Stores an item, discarding the least recently used one if the cache is full.
+
+        :param key: Key of the item.
+        :param value: Item to store.
+        """
+        self._items[key] = value
+        if len(self._items) > self._max_size:
+            try:
+                self._items.popitem(last=False)
+            except KeyError:
+                # emptied by another thread in the meantime.
+                pass
+
+    def pop(self, key, default=None):
+        """
+        Removes an item from the cache.
+
+        :param key: Key of the item.
+        :param default: Value returned if the key is not in the cache.
+        :returns: The removed item, or ``default``.
+        """
+        return self._items.pop(key, default)
+
+    def clear(self):
+        """
+        Removes all items from the cache.
+        """
+        self._items.clear()
+
+    @property
+    def stats(self):
+        """
+        :returns: Dictionary with the number of ``hits``, ``misses`` and cached ``items``.
+        """
+        return {"hits": self._hits, "misses": self._misses, "items": len(self._items)}
@@ -25,9 +25,10 @@ from .publish_util import (
     get_published_file_entity_type,
 )
 
-from .publish_creation import register_publish
+from .publish_creation import register_publish, register_publishes
 from .publish_resolve import resolve_publish_path
 from .download import (
+    DownloadStatistics,
     download_url,
     download_and_unpack_attachment,
     download_and_unpack_url,
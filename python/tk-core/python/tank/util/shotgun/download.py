@@ -16,6 +16,7 @@ import os
 import sys
 import tempfile
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
 import uuid
@@ -30,8 +31,76 @@ from ..zip import unzip_file
 log = LogManager.get_logger(__name__)
 
 
+# size of the blocks read from the network and written to disk when downloading
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class DownloadStatistics(object):
+    """
+    Timing and size information about a download.
+
+    Returned by :meth:`download_and_unpack_attachment` and
+    :meth:`download_and_unpack_url` so that callers can report
+    download performance.
+    """
+
+    def __init__(self, source):
+        """
+        :param str source: Url or attachment id being downloaded.
+        """
+        self.source = source
+        #: Size of the downloaded file in bytes.
+        self.size = 0
+        #: Number of bytes transferred over the network by the last attempt.
+        self.bytes_transferred = 0
+        #: Number of bytes reused from previous attempts thanks to a resume.
+        self.bytes_resumed = 0
+        #: Number of attempts needed to complete the download.
+        self.attempts = 0
+        #: Time spent downloading during the last attempt, in seconds.
+        self.download_time = 0.0
+        #: Time spent unpacking the downloaded file, in seconds.
+        self.unpack_time = 0.0
+
+    @property
+    def bytes_per_second(self):
+        """
+        Average transfer rate of the download, or ``None`` if the download was
+        too fast to be measured.
+        """
+        if not self.download_time:
+            return None
+        return self.bytes_transferred / self.download_time
+
+    def to_dict(self):
+        """
+        :returns: The statistics as a dictionary, suitable for logging or metrics.
+        """
+        return {
+            "source": self.source,
+            "size": self.size,
+            "bytes_transferred": self.bytes_transferred,
+            "bytes_resumed": self.bytes_resumed,
+            "attempts": self.attempts,
+            "download_time": self.download_time,
+            "unpack_time": self.unpack_time,
+            "bytes_per_second": self.bytes_per_second,
+        }
+
+    def __repr__(self):
+        return "<DownloadStatistics %s>" % self.to_dict()
+
+
 @LogManager.log_timing
-def download_url(sg, url, location, use_url_extension=False, headers=None):
+def download_url(
+    sg,
+    url,
+    location,
+    use_url_extension=False,
+    headers=None,
+    progress_callback=None,
+    resume=False,
+):
     """
     Convenience method that downloads a file from a given url.
     This method will take into account any proxy settings which have
@@ -48,6 +117,9 @@ def download_url(sg, url, location, use_url_extension=False, headers=None):
     - location="/path/to/file" and use_url_extension=False would return "/path/to/file"
     - location="/path/to/file" and use_url_extension=True would return "/path/to/file.png"
 
+    The content is streamed to disk in fixed size chunks, so large payloads are never
+    held in memory.
+
     :param sg: Shotgun API instance to get proxy connection settings from
     :param url: url to download
     :param location: path on disk where the payload should be written.
@@ -58,37 +130,80 @@ def download_url(sg, url, location, use_url_extension=False, headers=None):
                                    to construct the full path name to the downloaded
                                    contents. The newly constructed full path name
                                    will be returned.
+    :param progress_callback: Optional callable invoked after each chunk is written
+        with the signature ``progress_callback(bytes_downloaded, total_bytes, bytes_per_second)``.
+        ``total_bytes`` is ``None`` when the server doesn't report the content length.
+    :param bool resume: If True and ``location`` already contains a partial download,
+        an HTTP range request is used to only fetch the remaining bytes. If the server
+        doesn't support range requests, the file is downloaded again from the start.
 
     :returns: Full filepath to the downloaded file. This may have been altered from
               the input ``location`` if ``use_url_extension`` is True and a file extension
               could be determined from the resolved url.
     :raises: :class:`TankError` on failure.
     """
+    location, _ = _stream_url(
+        sg, url, location, use_url_extension, headers, progress_callback, resume
+    )
+    return location
+
+
+def _stream_url(
+    sg, url, location, use_url_extension, headers, progress_callback, resume
+):
+    """
+    Streams the content of a url to disk.
+
+    See :meth:`download_url` for a description of the parameters.
+
+    :returns: Tuple with the path to the downloaded file and the number of bytes
+        transferred over the network.
+    :raises: :class:`TankError` on failure.
+    """
+    # An opener is built for each request rather than installed globally, so
+    # concurrent downloads don't replace each other's cookie and proxy handlers.
+    #
     # We only need to set the auth cookie for downloads from Shotgun server,
     # input URLs like: https://my-site.shotgunstudio.com/thumbnail/full/Asset/1227
     if sg.config.server in url:
         # this method also handles proxy server settings from the shotgun API
-        __setup_sg_auth_and_proxy(sg)
+        opener = __get_sg_auth_and_proxy_opener(sg)
     elif sg.config.proxy_handler:
         # These input URLs have generally already been authenticated and are
         # in the form: https://sg-media-staging-usor-01.s3.amazonaws.com/9d93f...
         # %3D&response-content-disposition=filename%3D%22jackpot_icon.png%22.
         # Grab proxy server settings from the shotgun API
         opener = urllib.request.build_opener(sg.config.proxy_handler)
-
-        urllib.request.install_opener(opener)
+    else:
+        opener = urllib.request.build_opener()
 
     # inherit the timeout value from the sg API
     timeout = sg.config.timeout_secs
 
+    headers = dict(headers or {})
+    offset = 0
+    # the extension of the final file is only known once the url is resolved,
+    # so we can't resume when it has to be appended.
+    if resume and not use_url_extension and os.path.isfile(location):
+        offset = os.path.getsize(location)
+        if offset:
+            headers["Range"] = "bytes=%d-" % offset
+
     # download the given url
     try:
-        request = urllib.request.Request(url, headers=headers or {})
-        if timeout:
-            response = urllib.request.urlopen(request, timeout=timeout)
-        else:
-            # use system default
-            response = urllib.request.urlopen(request)
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            if timeout:
+                response = opener.open(request, timeout=timeout)
+            else:
+                # use system default
+                response = opener.open(request)
+        except urllib.error.HTTPError as e:
+            if offset and e.code == 416:
+                # the partial file can't be resumed, discard it so that
+                # the next attempt starts from scratch.
+                filesystem.safe_delete_file(location)
+            raise
 
         if use_url_extension:
             # Make sure the disk location has the same extension as the url path.
@@ -100,28 +215,64 @@ def download_url(sg, url, location, use_url_extension=False, headers=None):
             if url_ext:
                 location = "%s%s" % (location, url_ext)
 
-        f = open(location, "wb")
-        try:
-            f.write(response.read())
-        finally:
-            f.close()
+        if offset and response.getcode() == 206:
+            content_range = response.headers.get("Content-Range", "")
+            if not content_range.startswith("bytes %d-" % offset):
+                filesystem.safe_delete_file(location)
+                raise TankError(
+                    "Unexpected content range '%s' when resuming at byte %d."
+                    % (content_range, offset)
+                )
+            log.debug("Resuming download of %s at byte %d." % (url, offset))
+            mode = "ab"
+        else:
+            # the server sent the full content, overwrite any partial download.
+            offset = 0
+            mode = "wb"
+
+        content_length = response.headers.get("Content-Length")
+        total_bytes = offset + int(content_length) if content_length else None
+
+        bytes_transferred = 0
+        time_before = time.time()
+        with open(location, mode) as f:
+            while True:
+                chunk = response.read(_DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                bytes_transferred += len(chunk)
+                if progress_callback:
+                    elapsed = time.time() - time_before
+                    progress_callback(
+                        offset + bytes_transferred,
+                        total_bytes,
+                        bytes_transferred / elapsed if elapsed else None,
+                    )
+
+        if total_bytes is not None and offset + bytes_transferred != total_bytes:
+            raise TankError(
+                "Connection closed after %d of %d bytes."
+                % (offset + bytes_transferred, total_bytes)
+            )
     except Exception as e:
         raise TankError(
             "Could not download contents of url '%s'. Error reported: %s" % (url, e)
         )
 
-    return location
+    return location, bytes_transferred
 
 
-def __setup_sg_auth_and_proxy(sg):
+def __get_sg_auth_and_proxy_opener(sg):
     """
-    Borrowed from the Shotgun Python API, setup urllib with a cookie for authentication on
-    Shotgun instance.
+    Borrowed from the Shotgun Python API, builds a urllib opener with a cookie for
+    authentication on Shotgun instance.
 
     Looks up session token and sets that in a cookie in the :mod:`urllib` handler. This is
     used internally for downloading attachments from the Shotgun server.
 
     :param sg: Shotgun API instance
+    :returns: A :class:`urllib.request.OpenerDirector`.
     """
     # Importing this module locally to reduce clutter and facilitate clean up when/if this
     # functionality gets ported back into the Shotgun API.
@@ -153,11 +304,16 @@ def __setup_sg_auth_and_proxy(sg):
         opener = urllib.request.build_opener(sg.config.proxy_handler, cookie_handler)
     else:
         opener = urllib.request.build_opener(cookie_handler)
-    urllib.request.install_opener(opener)
+    return opener
 
 
 def download_and_unpack_attachment(
-    sg, attachment_id, target, retries=5, auto_detect_bundle=False
+    sg,
+    attachment_id,
+    target,
+    retries=5,
+    auto_detect_bundle=False,
+    progress_callback=None,
 ):
     """
     Downloads the given attachment from Shotgun, assumes it is a zip file
@@ -172,16 +328,32 @@ def download_and_unpack_attachment(
         (config, app, engine, framework) and that this should be attempted to be
         detected and unpacked intelligently. For example, if the zip file contains
         the bundle in a subfolder, this should be correctly unfolded.
+    :param progress_callback: Optional callable reporting download progress.
+        See :meth:`download_url` for its signature.
+    :returns: :class:`DownloadStatistics` for the download.
     :raises: ShotgunAttachmentDownloadError on failure
     """
     # NOTE Downloading by attachment ID is deprecated in the Shotgun API.
     # We should avoid using this where possible.
     return _download_and_unpack(
-        sg, target, retries, auto_detect_bundle, attachment_id=attachment_id
+        sg,
+        target,
+        retries,
+        auto_detect_bundle,
+        attachment_id=attachment_id,
+        progress_callback=progress_callback,
     )
 
 
-def download_and_unpack_url(sg, url, target, retries=5, auto_detect_bundle=False, headers=None):
+def download_and_unpack_url(
+    sg,
+    url,
+    target,
+    retries=5,
+    auto_detect_bundle=False,
+    headers=None,
+    progress_callback=None,
+):
     """
     Downloads the content from the provided url, assumes it is a zip file
     and attempts to unpack it into the given location.
@@ -195,20 +367,41 @@ def download_and_unpack_url(sg, url, target, retries=5, auto_detect_bundle=False
         (config, app, engine, framework) and that this should be attempted to be
         detected and unpacked intelligently. For example, if the zip file contains
         the bundle in a subfolder, this should be correctly unfolded.
+    :param progress_callback: Optional callable reporting download progress.
+        See :meth:`download_url` for its signature.
+    :returns: :class:`DownloadStatistics` for the download.
     :raises: ShotgunAttachmentDownloadError on failure
     """
-    return _download_and_unpack(sg, target, retries, auto_detect_bundle, url=url, headers=headers or {})
+    return _download_and_unpack(
+        sg,
+        target,
+        retries,
+        auto_detect_bundle,
+        url=url,
+        headers=headers or {},
+        progress_callback=progress_callback,
+    )
 
 
 @LogManager.log_timing
 def _download_and_unpack(
-    sg, target, retries, auto_detect_bundle, attachment_id=None, url=None, headers=None
+    sg,
+    target,
+    retries,
+    auto_detect_bundle,
+    attachment_id=None,
+    url=None,
+    headers=None,
+    progress_callback=None,
 ):
     """
     Downloads the given attachment from Shotgun if an attachment ID is provided,
     otherwise downloads the content from the provided url.  Assumes the downloaded
     file is a zip file and attempts to unpack it into the given location.
 
+    The payload is streamed into a temporary file. When an attempt fails, the
+    following attempts resume from the bytes already written to that file.
+
     :param sg: Shotgun API instance
     :param target: Folder to unpack zip to. if not created, the method will
                    try to create it.
@@ -219,75 +412,93 @@ def _download_and_unpack(
         the bundle in a subfolder, this should be correctly unfolded.
     :param attachment_id: Attachment to download
     :param url: The url to download from
+    :param progress_callback: Optional callable reporting download progress.
+        See :meth:`download_url` for its signature.
+    :returns: :class:`DownloadStatistics` for the download.
     :raises: ShotgunAttachmentDownloadError on failure
     """
-    # @todo: progress feedback here - when the PTR api supports it!
     # sometimes people report that this download fails (because of flaky connections etc)
-    # engines can often be 30-50MiB - as a quick fix, just retry the download if it fails
+    # engines can often be 30-50MiB - so retry the download if it fails, picking up
+    # where the previous attempt left off.
 
     attempt = 0
     done = False
     invalid_zip_file = False
+    stats = DownloadStatistics(url or "attachment id %s" % attachment_id)
 
-    while not invalid_zip_file and not done and attempt < retries:
-
-        zip_tmp = os.path.join(tempfile.gettempdir(), "%s_tank.zip" % uuid.uuid4().hex)
-        try:
-            time_before = time.time()
-            if attachment_id:
-                log.debug("Downloading attachment id %s..." % attachment_id)
-                bundle_content = sg.download_attachment(attachment_id)
-                log.debug("Download complete. Saving into %s" % zip_tmp)
-                with open(zip_tmp, "wb") as fh:
-                    fh.write(bundle_content)
-            elif url:
-                log.debug("Downloading content of url %s..." % url)
-                download_url(sg, url, zip_tmp, headers=headers or {})
-            else:
-                raise ValueError(
-                    "A value is required for one of kwargs `url` or `attachment_id`"
-                )
-
-            file_size = os.path.getsize(zip_tmp)
-
-            # log connection speed
-            time_to_download = time.time() - time_before
-            if time_to_download:
-                # In downloads from localhost (including during unit tests)
-                # downloads can be immediate.  In this case, we won't try to log
-                # download speed.
-                broadband_speed_bps = file_size * 8.0 / time_to_download
-                broadband_speed_mibps = broadband_speed_bps / (1024 * 1024)
-                log.debug("Download speed: %4f Mbit/s" % broadband_speed_mibps)
+    zip_tmp = os.path.join(tempfile.gettempdir(), "%s_tank.zip" % uuid.uuid4().hex)
+    try:
+        while not invalid_zip_file and not done and attempt < retries:
 
-            log.debug("Unpacking %s bytes to %s..." % (file_size, target))
-            filesystem.ensure_folder_exists(target)
             try:
-                unzip_file(zip_tmp, target, auto_detect_bundle)
-            except zipfile.BadZipfile:
-                invalid_zip_file = True
-
-        except Exception as e:
-            if attachment_id:
-                log.warning(
-                    "Attempt %s: Attachment download of id %s from %s failed: %s"
-                    % (attempt, attachment_id, sg.base_url, e)
-                )
-            elif url:
-                log.warning(
-                    "Attempt %s: Download of content of url %s failed: %s"
-                    % (attempt, url, e)
+                stats.attempts += 1
+                if attachment_id:
+                    log.debug("Downloading attachment id %s..." % attachment_id)
+                    # resolve the url on every attempt, as the storage
+                    # links it redirects to are only valid for a limited time.
+                    download_source = sg.get_attachment_download_url(attachment_id)
+                elif url:
+                    log.debug("Downloading content of url %s..." % url)
+                    download_source = url
+                else:
+                    raise ValueError(
+                        "A value is required for one of kwargs `url` or `attachment_id`"
+                    )
+
+                time_before = time.time()
+                _, bytes_transferred = _stream_url(
+                    sg,
+                    download_source,
+                    zip_tmp,
+                    False,
+                    headers,
+                    progress_callback,
+                    True,
                 )
+                stats.download_time = time.time() - time_before
+                stats.bytes_transferred = bytes_transferred
+                stats.size = os.path.getsize(zip_tmp)
+                stats.bytes_resumed = stats.size - bytes_transferred
+
+                # log connection speed
+                if stats.bytes_per_second:
+                    # In downloads from localhost (including during unit tests)
+                    # downloads can be immediate.  In this case, we won't try to log
+                    # download speed.
+                    broadband_speed_mibps = stats.bytes_per_second * 8.0 / (1024 * 1024)
+                    log.debug("Download speed: %4f Mbit/s" % broadband_speed_mibps)
+
+                log.debug("Unpacking %s bytes to %s..." % (stats.size, target))
+                time_before = time.time()
+                filesystem.ensure_folder_exists(target)
+                try:
+                    unzip_file(zip_tmp, target, auto_detect_bundle)
+                except zipfile.BadZipfile:
+                    invalid_zip_file = True
+                finally:
+                    stats.unpack_time = time.time() - time_before
+
+            except Exception as e:
+                if attachment_id:
+                    log.warning(
+                        "Attempt %s: Attachment download of id %s from %s failed: %s"
+                        % (attempt, attachment_id, sg.base_url, e)
+                    )
+                elif url:
+                    log.warning(
+                        "Attempt %s: Download of content of url %s failed: %s"
+                        % (attempt, url, e)
+                    )
+                else:
+                    raise
+                attempt += 1
+                # sleep 500ms before we retry
+                time.sleep(0.5)
             else:
-                raise
-            attempt += 1
-            # sleep 500ms before we retry
-            time.sleep(0.5)
-        else:
-            done = True
-        finally:
-            # remove zip file
-            filesystem.safe_delete_file(zip_tmp)
+                done = True
+    finally:
+        # remove zip file
+        filesystem.safe_delete_file(zip_tmp)
 
     if invalid_zip_file:
         # the attachment in shotgun could not be unpacked
@@ -307,4 +518,6 @@ def _download_and_unpack(
         )
 
     else:
-        log.debug("Attachment download and unpack complete.")
+        log.debug("Attachment download and unpack complete: %r" % stats)
+
+    return stats
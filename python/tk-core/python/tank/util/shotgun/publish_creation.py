@@ -14,13 +14,18 @@ Logic for publishing files to Shotgun.
 
 import os
 import pprint
+import threading
 import urllib.parse
 import urllib.request
+import weakref
+
+from tank_vendor import shotgun_api3
 
 from ...errors import TankError, TankMultipleMatchingTemplatesError
 from ...log import LogManager
 from .. import constants, login
 from ..errors import ShotgunPublishError
+from ..lru_cache import LRUCache
 from ..shotgun_path import ShotgunPath
 from .publish_util import (
     find_publish,
@@ -30,6 +35,14 @@ from .publish_util import (
 
 log = LogManager.get_logger(__name__)
 
+# number of storage root indexes kept for each pipeline configuration, one for
+# each list of project names paths were matched against.
+STORAGE_ROOT_INDEX_CACHE_SIZE = 4
+
+# default maximum number of entities created in a single batch request when
+# registering publishes in bulk.
+PUBLISH_BATCH_SIZE = 100
+
 
 @LogManager.log_timing
 def register_publish(tk, context, path, name, version_number, **kwargs):
@@ -246,8 +259,6 @@ def register_publish(tk, context, path, name, version_number, **kwargs):
         sg_fields = kwargs.get("sg_fields", {})
         dry_run = kwargs.get("dry_run", False)
 
-        published_file_entity_type = get_published_file_entity_type(tk)
-
         log.debug("Publish: Resolving the published file type")
         sg_published_file_type = None
         # query shotgun for the published_file_type
@@ -255,32 +266,9 @@ def register_publish(tk, context, path, name, version_number, **kwargs):
             if not isinstance(published_file_type, str):
                 raise TankError("published_file_type must be a string")
 
-            if published_file_entity_type == "PublishedFile":
-                filters = [["code", "is", published_file_type]]
-                sg_published_file_type = tk.shotgun.find_one(
-                    "PublishedFileType", filters=filters
-                )
-
-                if not sg_published_file_type:
-                    # create a published file type on the fly
-                    sg_published_file_type = tk.shotgun.create(
-                        "PublishedFileType", {"code": published_file_type}
-                    )
-            else:  # == TankPublishedFile
-                filters = [
-                    ["code", "is", published_file_type],
-                    ["project", "is", context.project],
-                ]
-                sg_published_file_type = tk.shotgun.find_one(
-                    "TankType", filters=filters
-                )
-
-                if not sg_published_file_type:
-                    # create a tank type on the fly
-                    sg_published_file_type = tk.shotgun.create(
-                        "TankType",
-                        {"code": published_file_type, "project": context.project},
-                    )
+            sg_published_file_type = _get_published_file_types(
+                tk, [(published_file_type, context.project)]
+            )[0]
 
         # create the publish
         log.debug("Publish: Creating publish in Flow Production Tracking")
@@ -303,32 +291,15 @@ def register_publish(tk, context, path, name, version_number, **kwargs):
         if not dry_run:
             # upload thumbnails
             log.debug("Publish: Uploading thumbnails")
-            if thumbnail_path and os.path.exists(thumbnail_path):
-
-                # publish
-                tk.shotgun.upload_thumbnail(
-                    published_file_entity_type, entity["id"], thumbnail_path
-                )
-
-                # entity
-                if update_entity_thumbnail == True and context.entity is not None:
-                    tk.shotgun.upload_thumbnail(
-                        context.entity["type"], context.entity["id"], thumbnail_path
-                    )
-
-                # task
-                if update_task_thumbnail == True and task is not None:
-                    tk.shotgun.upload_thumbnail("Task", task["id"], thumbnail_path)
-
-            else:
-                # no thumbnail found - instead use the default one
-                this_folder = os.path.abspath(os.path.dirname(__file__))
-                no_thumb = os.path.join(
-                    this_folder, os.path.pardir, "resources", "no_preview.jpg"
-                )
-                tk.shotgun.upload_thumbnail(
-                    published_file_entity_type, entity.get("id"), no_thumb
-                )
+            _upload_publish_thumbnails(
+                tk,
+                entity,
+                context,
+                task,
+                thumbnail_path,
+                update_entity_thumbnail,
+                update_task_thumbnail,
+            )
 
             # register dependencies
             log.debug("Publish: Register dependencies")
@@ -339,16 +310,422 @@ def register_publish(tk, context, path, name, version_number, **kwargs):
     except Exception as e:
         # Log the exception so the original traceback is available
         log.exception(e)
-        if "[Attachment.local_storage] does not exist" in str(e):
-            raise ShotgunPublishError(
-                "Local File Linking seems to be turned off. "
-                "Turn it on on your Site Preferences Page.",
-                entity,
+        raise _get_publish_error(e, entity)
+
+
+def _get_publish_error(error, entity):
+    """
+    Returns the error to report when registering a publish failed.
+
+    :param error: The exception which was raised.
+    :param entity: The publish entity which was created, if any.
+    :returns: :class:`ShotgunPublishError` instance.
+    """
+    if "[Attachment.local_storage] does not exist" in str(error):
+        return ShotgunPublishError(
+            "Local File Linking seems to be turned off. "
+            "Turn it on on your Site Preferences Page.",
+            entity,
+        )
+    else:
+        # Our own exception with the original message and the created entity,
+        # if any
+        return ShotgunPublishError(error_message="%s" % error, entity=entity)
+
+
+@LogManager.log_timing
+def register_publishes(tk, publishes, batch_size=None, dry_run=False):
+    """
+    Creates Published Files in Shotgun in bulk.
+
+    This is equivalent to calling :meth:`register_publish` for each publish, but
+    publish types, publish entities and dependencies are looked up and created
+    with a few batched Shotgun requests rather than several requests per publish,
+    which makes a big difference when registering thousands of publishes, for
+    example the frame sequences rendered on a farm.
+
+    Each publish is described by a dictionary with the ``context``, ``path``,
+    ``name`` and ``version_number`` keys, and any of the optional arguments of
+    :meth:`register_publish`, except ``dry_run``::
+
+        >>> results = sgtk.util.register_publishes(
+            tk,
+            [
+                {
+                    "context": context,
+                    "path": "/studio/demo_project/shot_010/render/beauty.v001.%04d.exr",
+                    "name": "beauty.exr",
+                    "version_number": 1,
+                    "published_file_type": "Rendered Image",
+                },
+                ...
+            ],
+        )
+        >>> for (entity, error) in results:
+        ...     if error:
+        ...         print(error)
+
+    Publishes are created in the order they are given, in batches. If Shotgun
+    rejects a batch, its publishes are created one by one so errors can be
+    reported for each of them. If a batch fails for any other reason, for
+    example a network error, the batch may still have been created, so the
+    error is reported for all its publishes rather than risking duplicates.
+
+    :param tk: :class:`~sgtk.Sgtk` instance
+    :param publishes: List of dictionaries describing the publishes to create.
+    :param batch_size: Maximum number of entities created in a single batch request.
+        Defaults to 100.
+    :param dry_run: If set, do not actually create the publishes. The data that
+        would be supplied to Shotgun is returned instead of the created entities.
+    :returns: List with an ``(entity, error)`` tuple for each publish, in the same
+        order. ``entity`` is the created entity dictionary, or None if it wasn't
+        created, and ``error`` is a :class:`ShotgunPublishError` if registering
+        the publish failed, None otherwise.
+    """
+    batch_size = max(1, batch_size or PUBLISH_BATCH_SIZE)
+    published_file_entity_type = get_published_file_entity_type(tk)
+
+    entities = [None] * len(publishes)
+    errors = [None] * len(publishes)
+
+    def set_error(idx, error):
+        # keep the original traceback of the error, if it was raised.
+        exc_info = None
+        if error.__traceback__:
+            exc_info = (type(error), error, error.__traceback__)
+        log.error(
+            "Publish: Failed to register %s: %s" % (publishes[idx].get("path"), error),
+            exc_info=exc_info,
+        )
+        errors[idx] = _get_publish_error(error, entities[idx])
+
+    # resolve all the publish types at once
+    log.debug("Publish: Resolving the published file types")
+    type_indices = []
+    for (idx, publish) in enumerate(publishes):
+        published_file_type = publish.get("published_file_type") or publish.get(
+            "tank_type"
+        )
+        if not published_file_type:
+            continue
+        if not isinstance(published_file_type, str):
+            set_error(idx, TankError("published_file_type must be a string"))
+            continue
+        type_indices.append(idx)
+
+    sg_published_file_types = {}
+    try:
+        type_specs = []
+        for idx in type_indices:
+            publish = publishes[idx]
+            type_specs.append(
+                (
+                    publish.get("published_file_type") or publish.get("tank_type"),
+                    publish["context"].project,
+                )
+            )
+        sg_published_file_types = dict(
+            zip(type_indices, _get_published_file_types(tk, type_specs))
+        )
+    except Exception as e:
+        for idx in type_indices:
+            set_error(idx, e)
+
+    # put together the data of all the publishes
+    data_indices = []
+    sg_batch_data = []
+    for (idx, publish) in enumerate(publishes):
+        if errors[idx]:
+            continue
+        try:
+            context = publish["context"]
+            task = publish.get("task")
+            if task is None:
+                task = context.task
+
+            data = _get_published_file_data(
+                tk,
+                context,
+                publish["path"],
+                publish["name"],
+                publish["version_number"],
+                task,
+                publish.get("comment"),
+                sg_published_file_types.get(idx),
+                publish.get("created_by"),
+                publish.get("created_at"),
+                publish.get("version_entity"),
+                publish.get("sg_fields", {}),
             )
+        except Exception as e:
+            set_error(idx, e)
+            continue
+
+        if dry_run:
+            # add the publish type to be as consistent as possible
+            data["type"] = published_file_entity_type
+            entities[idx] = data
+            continue
+
+        data_indices.append(idx)
+        sg_batch_data.append(
+            {
+                "request_type": "create",
+                "entity_type": published_file_entity_type,
+                "data": data,
+            }
+        )
+
+    if dry_run:
+        return list(zip(entities, errors))
+
+    # create the publishes
+    log.debug(
+        "Publish: Creating %d publishes in Flow Production Tracking"
+        % len(sg_batch_data)
+    )
+    for start in range(0, len(sg_batch_data), batch_size):
+        batch_indices = data_indices[start : start + batch_size]
+        batch_requests = sg_batch_data[start : start + batch_size]
+        try:
+            created = tk.shotgun.batch(batch_requests)
+        except shotgun_api3.Fault as e:
+            # batch requests are transactional: find out which publishes failed
+            log.debug(
+                "Publish: Batch creation failed, creating publishes one by one: %s" % e
+            )
+            for (idx, request) in zip(batch_indices, batch_requests):
+                try:
+                    entities[idx] = tk.shotgun.create(
+                        published_file_entity_type, request["data"]
+                    )
+                except Exception as e:
+                    set_error(idx, e)
+        except Exception as e:
+            # the batch may have been created even though no response was
+            # received, don't create its publishes again.
+            for idx in batch_indices:
+                set_error(idx, e)
         else:
-            # Raise our own exception with the original message and the created entity,
-            # if any
-            raise ShotgunPublishError(error_message="%s" % e, entity=entity)
+            for (idx, entity) in zip(batch_indices, created):
+                entities[idx] = entity
+
+    created_indices = [idx for idx in data_indices if entities[idx] and not errors[idx]]
+
+    # upload thumbnails
+    log.debug("Publish: Uploading thumbnails")
+    for idx in created_indices:
+        publish = publishes[idx]
+        try:
+            _upload_publish_thumbnails(
+                tk,
+                entities[idx],
+                publish["context"],
+                publish.get("task") or publish["context"].task,
+                publish.get("thumbnail_path"),
+                publish.get("update_entity_thumbnail", False),
+                publish.get("update_task_thumbnail", False),
+            )
+        except Exception as e:
+            set_error(idx, e)
+
+    # register dependencies, looking up the publishes of all the dependency
+    # paths at once.
+    log.debug("Publish: Register dependencies")
+    created_indices = [idx for idx in created_indices if not errors[idx]]
+    dependency_paths = set()
+    for idx in created_indices:
+        dependency_paths.update(publishes[idx].get("dependency_paths", []))
+    dependency_publishes = {}
+    if dependency_paths:
+        try:
+            dependency_publishes = find_publish(tk, sorted(dependency_paths))
+        except Exception as e:
+            # the publishes are created, report the error on the ones whose
+            # dependencies can't be registered.
+            for idx in created_indices:
+                if publishes[idx].get("dependency_paths"):
+                    set_error(idx, e)
+            created_indices = [idx for idx in created_indices if not errors[idx]]
+
+    # batches of the dependency requests of whole publishes, so errors can be
+    # reported for each publish.
+    dependency_batches = [[]]
+    for idx in created_indices:
+        publish = publishes[idx]
+        try:
+            requests = _get_dependency_requests(
+                tk,
+                entities[idx],
+                publish.get("dependency_paths", []),
+                publish.get("dependency_ids", []),
+                dependency_publishes,
+            )
+        except Exception as e:
+            set_error(idx, e)
+            continue
+        if not requests:
+            continue
+        nb_requests = sum(len(r) for (_, r) in dependency_batches[-1])
+        if nb_requests and nb_requests + len(requests) > batch_size:
+            dependency_batches.append([])
+        dependency_batches[-1].append((idx, requests))
+
+    for dependency_batch in dependency_batches:
+        if not dependency_batch:
+            continue
+        try:
+            tk.shotgun.batch(
+                [request for (_, requests) in dependency_batch for request in requests]
+            )
+        except shotgun_api3.Fault as e:
+            log.debug(
+                "Publish: Batch dependency creation failed, "
+                "creating dependencies one publish at a time: %s" % e
+            )
+            for (idx, requests) in dependency_batch:
+                try:
+                    tk.shotgun.batch(requests)
+                except Exception as e:
+                    set_error(idx, e)
+        except Exception as e:
+            # the dependencies may have been created even though no response
+            # was received, don't create them again.
+            for (idx, _) in dependency_batch:
+                set_error(idx, e)
+
+    log.debug("Publish: Complete")
+    return list(zip(entities, errors))
+
+
+def _upload_publish_thumbnails(
+    tk,
+    entity,
+    context,
+    task,
+    thumbnail_path,
+    update_entity_thumbnail,
+    update_task_thumbnail,
+):
+    """
+    Uploads the thumbnail of a publish, or the default thumbnail if there is none.
+
+    :param tk: :class:`~sgtk.Sgtk` instance
+    :param entity: The publish entity.
+    :param context: The :class:`~sgtk.Context` of the publish.
+    :param task: Task of the publish, or None.
+    :param thumbnail_path: Path to the thumbnail, or None.
+    :param update_entity_thumbnail: Push thumbnail up to the associated entity
+    :param update_task_thumbnail: Push thumbnail up to the associated task
+    """
+    published_file_entity_type = get_published_file_entity_type(tk)
+
+    if thumbnail_path and os.path.exists(thumbnail_path):
+
+        # publish
+        tk.shotgun.upload_thumbnail(
+            published_file_entity_type, entity["id"], thumbnail_path
+        )
+
+        # entity
+        if update_entity_thumbnail == True and context.entity is not None:
+            tk.shotgun.upload_thumbnail(
+                context.entity["type"], context.entity["id"], thumbnail_path
+            )
+
+        # task
+        if update_task_thumbnail == True and task is not None:
+            tk.shotgun.upload_thumbnail("Task", task["id"], thumbnail_path)
+
+    else:
+        # no thumbnail found - instead use the default one
+        this_folder = os.path.abspath(os.path.dirname(__file__))
+        no_thumb = os.path.join(
+            this_folder, os.path.pardir, "resources", "no_preview.jpg"
+        )
+        tk.shotgun.upload_thumbnail(
+            published_file_entity_type, entity.get("id"), no_thumb
+        )
+
+
+def _get_published_file_types(tk, published_file_types):
+    """
+    Finds the publish types with the given names in shotgun, creating the ones
+    which don't exist yet. A single query is made for all the types, or for
+    all the types of a project with legacy TankType publish types, which are
+    project specific.
+
+    :param tk: :class:`~sgtk.Sgtk` instance
+    :param published_file_types: List of (publish type name, project entity) tuples.
+    :returns: List of publish type entity dictionaries, in the same order.
+    """
+    if get_published_file_entity_type(tk) == "PublishedFile":
+        type_entity_type = "PublishedFileType"
+        type_projects = {None: [code for (code, _) in published_file_types]}
+    else:  # == TankPublishedFile
+        type_entity_type = "TankType"
+        type_projects = {}
+        for (code, project) in published_file_types:
+            project_key = (project["type"], project["id"]) if project else None
+            type_projects.setdefault(project_key, []).append(code)
+
+    # (project key, lower case name) -> publish type
+    sg_types = {}
+    sg_batch_data = []
+    for (project_key, codes) in type_projects.items():
+        filters = [["code", "in", sorted(set(codes))]]
+        project = None
+        if type_entity_type == "TankType":
+            project = (
+                {"type": project_key[0], "id": project_key[1]} if project_key else None
+            )
+            filters.append(["project", "is", project])
+
+        # names are not case sensitive in shotgun queries, keep the first
+        # type found for each name as a find_one query would.
+        for sg_type in tk.shotgun.find(
+            type_entity_type,
+            filters,
+            ["code"],
+            order=[{"field_name": "id", "direction": "asc"}],
+        ):
+            sg_types.setdefault(
+                (project_key, sg_type["code"].lower()),
+                {"type": sg_type["type"], "id": sg_type["id"]},
+            )
+
+        for code in codes:
+            key = (project_key, code.lower())
+            if key in sg_types:
+                continue
+            # create the publish type on the fly
+            data = {"code": code}
+            if type_entity_type == "TankType":
+                data["project"] = project
+            sg_batch_data.append(
+                {
+                    "request_type": "create",
+                    "entity_type": type_entity_type,
+                    "data": data,
+                }
+            )
+            # don't create the same type twice
+            sg_types[key] = len(sg_batch_data) - 1
+
+    if sg_batch_data:
+        created_types = tk.shotgun.batch(sg_batch_data)
+        for (key, sg_type) in list(sg_types.items()):
+            if isinstance(sg_type, int):
+                sg_types[key] = created_types[sg_type]
+
+    results = []
+    for (code, project) in published_file_types:
+        if type_entity_type == "TankType" and project:
+            project_key = (project["type"], project["id"])
+        else:
+            project_key = None
+        results.append(sg_types[(project_key, code.lower())])
+    return results
 
 
 def _create_published_file(
@@ -369,6 +746,63 @@ def _create_published_file(
     """
     Creates a publish entity in shotgun given some standard fields.
 
+    See :meth:`_get_published_file_data` for a description of the parameters.
+
+    :param dry_run: Don't actually create the published file entry. Simply
+                    return the data dictionary that would be supplied.
+
+    :returns: The result of the shotgun API create method.
+    """
+    data = _get_published_file_data(
+        tk,
+        context,
+        path,
+        name,
+        version_number,
+        task,
+        comment,
+        published_file_type,
+        created_by_user,
+        created_at,
+        version_entity,
+        sg_fields,
+    )
+
+    published_file_entity_type = get_published_file_entity_type(tk)
+
+    if dry_run:
+        # add the publish type to be as consistent as possible
+        data["type"] = published_file_entity_type
+        log.debug(
+            "Dry run. Simply returning the data that would be sent to PTR: %s"
+            % pprint.pformat(data)
+        )
+        return data
+    else:
+        log.debug(
+            "Registering publish in Flow Production Tracking: %s" % pprint.pformat(data)
+        )
+        return tk.shotgun.create(published_file_entity_type, data)
+
+
+def _get_published_file_data(
+    tk,
+    context,
+    path,
+    name,
+    version_number,
+    task,
+    comment,
+    published_file_type,
+    created_by_user,
+    created_at,
+    version_entity,
+    sg_fields=None,
+):
+    """
+    Returns the data of a publish entity to create in shotgun given some
+    standard fields.
+
     :param tk: :class:`~sgtk.Sgtk` instance
     :param context: A :class:`~sgtk.Context` to associate with the publish. This will
                     populate the ``task`` and ``entity`` link in Shotgun.
@@ -394,10 +828,9 @@ def _create_published_file(
     :param created_at: Timestamp to associate with publish or None for default.
     :param version_entity: Version dictionary to associate with publish or ``None``.
     :param sg_fields: Dictionary of additional data to add to publish.
-    :param dry_run: Don't actually create the published file entry. Simply
-                    return the data dictionary that would be supplied.
 
-    :returns: The result of the shotgun API create method.
+    :returns: Dictionary of the publish data, once processed by the
+              ``before_register_publish`` core hook.
     """
 
     data = {
@@ -612,24 +1045,10 @@ def _create_published_file(
                 }
 
     # now call out to hook just before publishing
-    data = tk.execute_core_hook(
+    return tk.execute_core_hook(
         constants.TANK_PUBLISH_HOOK_NAME, shotgun_data=data, context=context
     )
 
-    if dry_run:
-        # add the publish type to be as consistent as possible
-        data["type"] = published_file_entity_type
-        log.debug(
-            "Dry run. Simply returning the data that would be sent to PTR: %s"
-            % pprint.pformat(data)
-        )
-        return data
-    else:
-        log.debug(
-            "Registering publish in Flow Production Tracking: %s" % pprint.pformat(data)
-        )
-        return tk.shotgun.create(published_file_entity_type, data)
-
 
 def _translate_abstract_fields(tk, path):
     """
@@ -688,11 +1107,36 @@ def _create_dependencies(tk, publish_entity, dependency_paths, dependency_ids):
     :param dependency_ids: List of publish entity ids to associate. List of ints
 
     """
-    published_file_entity_type = get_published_file_entity_type(tk)
-
     publishes = find_publish(tk, dependency_paths)
 
     # create a single batch request for maximum speed
+    sg_batch_data = _get_dependency_requests(
+        tk, publish_entity, dependency_paths, dependency_ids, publishes
+    )
+
+    # push to shotgun in a single xact
+    if len(sg_batch_data) > 0:
+        tk.shotgun.batch(sg_batch_data)
+
+
+def _get_dependency_requests(
+    tk, publish_entity, dependency_paths, dependency_ids, publishes
+):
+    """
+    Returns the batch requests creating dependencies in shotgun from a given
+    entity to a list of paths and ids. Paths not recognized are skipped.
+
+    :param tk: API handle
+    :param publish_entity: The publish entity to set the dependencies for. This is a dictionary
+                           with keys type and id.
+    :param dependency_paths: List of paths on disk. List of strings.
+    :param dependency_ids: List of publish entity ids to associate. List of ints
+    :param publishes: Dictionary of the publishes found for the dependency paths,
+                      as returned by :meth:`find_publish`.
+    :returns: List of batch requests.
+    """
+    published_file_entity_type = get_published_file_entity_type(tk)
+
     sg_batch_data = []
 
     for dependency_path in dependency_paths:
@@ -757,9 +1201,7 @@ def _create_dependencies(tk, publish_entity, dependency_paths, dependency_ids):
             }
             sg_batch_data.append(req)
 
-    # push to shotgun in a single xact
-    if len(sg_batch_data) > 0:
-        tk.shotgun.batch(sg_batch_data)
+    return sg_batch_data
 
 
 def _calc_path_cache(tk, path, project_names=None):
@@ -799,41 +1241,117 @@ def _calc_path_cache(tk, path, project_names=None):
     # normalize to only use forward slashes
     norm_path = norm_path.replace("\\", "/")
 
-    # get roots - dict keyed by storage name
-    storage_roots = tk.pipeline_configuration.get_local_storage_roots()
-
     # get project name, typically a a-z string but can contain
     # forward slashes, e.g. 'my_project', or 'client_a/proj_b'
     if not project_names:
         project_names = [tk.pipeline_configuration.get_project_disk_name()]
 
-    for root_name, root_path in storage_roots.items():
+    index = _StorageRootIndex.get(tk.pipeline_configuration, project_names)
+    (root_name, path_cache) = index.split_path(norm_path)
 
-        root_path_obj = ShotgunPath.from_current_os_path(root_path)
-        # normalize the root path
-        norm_root_path = root_path_obj.current_os.replace(os.sep, "/")
+    if path_cache is None:
+        log.debug(
+            "Unable to split path '%s' into a storage and a relative path." % path
+        )
+    else:
+        log.debug(
+            "Split up path '%s' into storage %s and relative path '%s'"
+            % (path, root_name, path_cache)
+        )
+    return (root_name, path_cache)
 
-        for project_name in project_names:
 
-            # append project and normalize
-            proj_path = root_path_obj.join(project_name).current_os
-            proj_path = str(proj_path.replace(os.sep, "/"))
+class _StorageRootIndex(object):
+    """
+    Table of the project folders found in the storage roots of a pipeline
+    configuration, used to split paths into a storage root and a path relative
+    to it without going through every storage root and project for each path.
+    """
+
+    # pipeline configuration -> LRUCache of indexes keyed by project names
+    _indexes = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, pipeline_configuration, project_names):
+        """
+        Returns the index of the storage roots of a pipeline configuration, building
+        it if needed.
+
+        :param pipeline_configuration: :class:`~sgtk.pipelineconfig.PipelineConfiguration`
+            instance.
+        :param list project_names: Names of the project folders to match paths against.
+        :returns: :class:`_StorageRootIndex` instance.
+        """
+        key = tuple(project_names)
+        with cls._lock:
+            indexes = cls._indexes.get(pipeline_configuration)
+            if indexes is None:
+                indexes = LRUCache(STORAGE_ROOT_INDEX_CACHE_SIZE)
+                cls._indexes[pipeline_configuration] = indexes
+            index = indexes.get(key)
+
+        if index is None:
+            index = cls(pipeline_configuration.get_local_storage_roots(), project_names)
+            with cls._lock:
+                indexes.put(key, index)
+        return index
+
+    def __init__(self, storage_roots, project_names):
+        """
+        :param dict storage_roots: Local storage root paths keyed by storage name.
+        :param list project_names: Names of the project folders to match paths against.
+        """
+        # lower case project folder path -> (root name, length of the root path)
+        self._prefixes = {}
+
+        for root_name, root_path in storage_roots.items():
+
+            root_path_obj = ShotgunPath.from_current_os_path(root_path)
+            # normalize the root path
+            norm_root_path = root_path_obj.current_os.replace(os.sep, "/")
+
+            for project_name in project_names:
+
+                # append project and normalize
+                proj_path = root_path_obj.join(project_name).current_os
+                proj_path = str(proj_path.replace(os.sep, "/")).lower()
+
+                # the first storage root listed takes precedence when several
+                # map to the same project folder.
+                if proj_path not in self._prefixes:
+                    self._prefixes[proj_path] = (root_name, len(norm_root_path))
+
+        # the lengths of the project folder paths, longest first, so the most
+        # specific project folder is matched first.
+        self._prefix_lengths = sorted(
+            set(len(prefix) for prefix in self._prefixes), reverse=True
+        )
 
-            if norm_path.lower().startswith(proj_path.lower()):
+    def split_path(self, norm_path):
+        """
+        Splits a path into the name of the storage root it belongs to and the
+        path relative to that root.
+
+        :param str norm_path: Normalized path, using forward slashes.
+        :returns: (root_name, path_cache), or (None, None) if the path doesn't
+            belong to a project folder of a storage root.
+        """
+        lower_path = norm_path.lower()
+        for length in self._prefix_lengths:
+            if length > len(lower_path):
+                continue
+
+            match = self._prefixes.get(lower_path[:length])
+            if match:
                 # our path matches this storage!
+                (root_name, root_path_length) = match
 
                 # Remove parent dir plus "/" - be careful to handle the case where
                 # the parent dir ends with a '/', e.g. 'T:/' for a Windows drive
-                path_cache = norm_path[len(norm_root_path) :].lstrip("/")
-                log.debug(
-                    "Split up path '%s' into storage %s and relative path '%s'"
-                    % (path, root_name, path_cache)
-                )
-                return root_name, path_cache
+                return (root_name, norm_path[root_path_length:].lstrip("/"))
 
-    # not found, return None values
-    log.debug("Unable to split path '%s' into a storage and a relative path." % path)
-    return None, None
+        return (None, None)
 
 
 def group_by_storage(tk, list_of_paths, only_current_project=True):
@@ -0,0 +1,233 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Timeline of the phases of a session, which can be saved in the Chrome trace
+event format.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+from .singleton import Singleton
+from .. import LogManager
+
+log = LogManager.get_logger(__name__)
+
+
+class Timeline(Singleton):
+    """
+    Records the time spent in the phases of a session, for example the startup of
+    an application, as a timeline of spans.
+
+    Spans are recorded with :meth:`span` or the :func:`record_span` decorator.
+    :meth:`span` can be used as a context manager::
+
+        with Timeline().span("ToolkitManager._bootstrap_sgtk", "bootstrap"):
+            ...
+
+    or by ending them explicitly::
+
+        span = Timeline().span("startup")
+        ...
+        span.end()
+
+    The timeline can be saved with :meth:`save` in the Chrome trace event format,
+    which can be opened in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+    Recording a span is cheap, so spans are always recorded. Only the first
+    :data:`MAX_EVENTS` spans of a session are kept.
+
+    The recorded spans are handed over to the new core when swapping cores, see
+    :meth:`export_state` and :meth:`import_state`.
+    """
+
+    # Maximum number of spans recorded in a session.
+    MAX_EVENTS = 10000
+
+    def _init_singleton(self):
+        """
+        Initializes the singleton.
+        """
+        # Only builtin types are used, as they are shared with the other cores
+        # of the session.
+        self._state = {"events": [], "thread_names": {}}
+
+    def span(self, name, category="toolkit", **args):
+        """
+        Starts recording a span.
+
+        :param str name: Name of the span.
+        :param str category: Category of the span, used to filter spans when
+            viewing the timeline.
+        :param args: Values to record with the span.
+
+        :returns: A :class:`TimelineSpan` to end, or to use as a context manager.
+        """
+        return TimelineSpan(self, name, category, args)
+
+    def export_state(self):
+        """
+        Returns the spans recorded so far, to be handed over to another core.
+
+        :returns: Opaque object to pass to :meth:`import_state`.
+        """
+        return self._state
+
+    def import_state(self, state):
+        """
+        Records the spans to the state of another core, typically the one
+        used before swapping cores, so all the spans of the session end up in a
+        single timeline.
+
+        :param state: Object returned by :meth:`export_state`.
+        """
+        if state is self._state:
+            return
+        state["events"].extend(self._state["events"])
+        state["thread_names"].update(self._state["thread_names"])
+        self._state = state
+
+    def save(self, path):
+        """
+        Writes the timeline to a file in the Chrome trace event format.
+
+        :param str path: Path to the file.
+        """
+        pid = os.getpid()
+        events = list(self._state["events"])
+        for (tid, thread_name) in list(self._state["thread_names"].items()):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+
+        tmp_path = "%s.%d.tmp" % (path, pid)
+        try:
+            with open(tmp_path, "wt") as fh:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        log.debug("Wrote timeline of %d spans to %s" % (len(events), path))
+
+    def _add_span(self, name, category, start_time, end_time, thread, args):
+        """
+        Records a span which ended.
+
+        :param str name: Name of the span.
+        :param str category: Category of the span.
+        :param float start_time: Time at which the span started, in seconds.
+        :param float end_time: Time at which the span ended, in seconds.
+        :param thread: The thread which recorded the span.
+        :param dict args: Values to record with the span.
+        """
+        events = self._state["events"]
+        if len(events) >= self.MAX_EVENTS:
+            return
+
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": int(start_time * 1000000),
+            "dur": int((end_time - start_time) * 1000000),
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        self._state["thread_names"][thread.ident] = thread.name
+        events.append(event)
+
+
+def record_span(category="toolkit"):
+    """
+    Decorator recording each call of a function as a span of the :class:`Timeline`,
+    named after the function.
+
+    :param str category: Category of the spans.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Timeline().span(func.__qualname__, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TimelineSpan(object):
+    """
+    A span of a :class:`Timeline`, recorded once it ends.
+    """
+
+    def __init__(self, timeline, name, category, args):
+        """
+        :param timeline: :class:`Timeline` recording the span.
+        :param str name: Name of the span.
+        :param str category: Category of the span.
+        :param dict args: Values to record with the span.
+        """
+        self._timeline = timeline
+        self._name = name
+        self._category = category
+        self._args = args
+        self._thread = threading.current_thread()
+        self._start_time = time.time()
+        self._ended = False
+
+    def end(self, **args):
+        """
+        Ends the span. Ending a span more than once has no effect.
+
+        :param args: Additional values to record with the span.
+        """
+        if self._ended:
+            return
+        self._ended = True
+        self._args.update(args)
+        self._timeline._add_span(
+            self._name,
+            self._category,
+            self._start_time,
+            time.time(),
+            self._thread,
+            self._args,
+        )
+
+    def __enter__(self):
+        """
+        :returns: The span.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Ends the span, recording the error which interrupted it, if any.
+        """
+        if exc_type:
+            self.end(error=exc_type.__name__)
+        else:
+            self.end()
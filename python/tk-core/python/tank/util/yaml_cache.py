@@ -16,9 +16,14 @@ unless it's changed on disk.
 import os
 import copy
 import threading
+import collections.abc
+import time
 
 from tank_vendor import yaml
 from ..errors import TankError, TankUnreadableFileError, TankFileDoesNotExistError
+from ..log import LogManager
+
+log = LogManager.get_logger(__name__)
 
 
 class CacheItem(object):
@@ -62,6 +67,11 @@ class CacheItem(object):
 
     data = property(_get_data, _set_data)
 
+    @property
+    def is_populated(self):
+        """Whether the item carries data, which doesn't need to be read from disk."""
+        return bool(self._data)
+
     @property
     def path(self):
         """The path to the file on disk that the item was sourced from."""
@@ -119,6 +129,261 @@ class CacheItem(object):
         return str(self.path)
 
 
+class _LazyCacheItem(CacheItem):
+    """
+    Item whose data is decoded from a yaml cache file when first accessed.
+    """
+
+    def __init__(self, path, cache_file, yaml_cache):
+        """
+        :param path:        The normalized path to the .yml file on disk.
+        :param cache_file:  The :class:`~tank.util.yaml_cache_file.YamlCacheFile`
+                            holding the data.
+        :param yaml_cache:  The :class:`YamlCache` the item is added to, to
+                            count decoded items.
+        """
+        super().__init__(path, stat=cache_file.get_stat(path))
+        self._cache_file = cache_file
+        self._yaml_cache = yaml_cache
+
+    def _get_data(self):
+        """The item's data."""
+        if self._cache_file is not None:
+            self._data = self._cache_file.load_data(self.path)
+            self._cache_file = None
+            self._yaml_cache._count_stats(decoded=1)
+        return self._data
+
+    def _set_data(self, config_data):
+        self._data = config_data
+        self._cache_file = None
+
+    data = property(_get_data, _set_data)
+
+    @property
+    def is_populated(self):
+        """Whether the item carries data, which doesn't need to be read from disk."""
+        return self._cache_file is not None or bool(self._data)
+
+    @property
+    def cache_file(self):
+        """The cache file the data will be decoded from, or None if it was decoded."""
+        return self._cache_file
+
+
+class _InFlightLoad(object):
+    """
+    Represents a yaml file being loaded by a thread, which other threads
+    requesting the same file can wait for instead of loading it again.
+    """
+
+    def __init__(self, item):
+        """
+        :param item: The CacheItem being populated.
+        """
+        self.item = item
+        self.error = None
+        self._done = threading.Event()
+
+    def complete(self, error=None):
+        """
+        Flags the load as completed, waking up the waiting threads.
+
+        :param error: The exception raised by the load, if it failed.
+        """
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        """
+        Waits for the load to complete.
+
+        :returns: The populated CacheItem.
+        :raises: The exception raised by the load, if it failed.
+        """
+        self._done.wait()
+        if self.error:
+            raise self.error
+        return self.item
+
+
+class CopyOnWriteDict(collections.abc.MutableMapping):
+    """
+    Dictionary view over data shared with the yaml cache.
+
+    Reading from the view doesn't copy anything: nested dictionaries and lists
+    are returned as views as well, created on first access. The first change
+    made to a view shallow copies the underlying dictionary, so the cached data
+    is never altered and only the modified parts of the tree are duplicated.
+    """
+
+    def __init__(self, data):
+        """
+        :param dict data: Data to expose. It will never be modified.
+        """
+        self._data = data
+        self._is_copy = False
+        self._views = {}
+
+    def _get_view(self, key, value):
+        """
+        Returns the value stored for a key, as a view if it is a container.
+        """
+        if self._is_copy or not isinstance(value, (dict, list)):
+            return value
+        view = self._views.get(key)
+        if view is None:
+            view = _make_view(value)
+            self._views[key] = view
+        return view
+
+    def _copy_on_write(self):
+        """
+        Copies the underlying data before it gets modified.
+        """
+        if not self._is_copy:
+            # Keep the views already handed out, so changes made through them
+            # remain visible from this view.
+            self._data = dict(
+                (key, self._get_view(key, value)) for key, value in self._data.items()
+            )
+            self._is_copy = True
+            self._views = None
+
+    @property
+    def raw_data(self):
+        """
+        The dictionary exposed by the view, to read it without any overhead.
+        It must not be modified, since it can be shared with the cache.
+        """
+        return self._data
+
+    def __getitem__(self, key):
+        return self._get_view(key, self._data[key])
+
+    def __setitem__(self, key, value):
+        self._copy_on_write()
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._copy_on_write()
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __deepcopy__(self, memo):
+        # Views are only a way to defer copies, so a deep copy turns them back
+        # into regular containers.
+        return copy.deepcopy(self._data, memo)
+
+
+class CopyOnWriteList(collections.abc.MutableSequence):
+    """
+    List view over data shared with the yaml cache.
+
+    See :class:`CopyOnWriteDict` for details.
+    """
+
+    def __init__(self, data):
+        """
+        :param list data: Data to expose. It will never be modified.
+        """
+        self._data = data
+        self._is_copy = False
+        self._views = {}
+
+    def _get_view(self, index, value):
+        """
+        Returns the value stored at an index, as a view if it is a container.
+        """
+        if self._is_copy or not isinstance(value, (dict, list)):
+            return value
+        view = self._views.get(index)
+        if view is None:
+            view = _make_view(value)
+            self._views[index] = view
+        return view
+
+    def _copy_on_write(self):
+        """
+        Copies the underlying data before it gets modified.
+        """
+        if not self._is_copy:
+            self._data = [
+                self._get_view(index, value) for index, value in enumerate(self._data)
+            ]
+            self._is_copy = True
+            self._views = None
+
+    @property
+    def raw_data(self):
+        """
+        The list exposed by the view, to read it without any overhead.
+        It must not be modified, since it can be shared with the cache.
+        """
+        return self._data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._data)))]
+        if index < 0:
+            index += len(self._data)
+        return self._get_view(index, self._data[index])
+
+    def __setitem__(self, index, value):
+        self._copy_on_write()
+        self._data[index] = value
+
+    def __delitem__(self, index):
+        self._copy_on_write()
+        del self._data[index]
+
+    def insert(self, index, value):
+        self._copy_on_write()
+        self._data.insert(index, value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if not isinstance(other, collections.abc.Sequence) or isinstance(other, str):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._data, memo)
+
+
+def _make_view(data):
+    """
+    Wraps yaml data into a copy-on-write view.
+
+    :param data: Data loaded from a yaml file.
+    :returns: A :class:`CopyOnWriteDict` or :class:`CopyOnWriteList` for
+        dictionaries and lists, the data itself otherwise.
+    """
+    if isinstance(data, dict):
+        return CopyOnWriteDict(data)
+    if isinstance(data, list):
+        return CopyOnWriteList(data)
+    return data
+
+
 class YamlCache(object):
     """
     Main yaml cache class
@@ -129,8 +394,14 @@ class YamlCache(object):
         Construction
         """
         self._cache = cache_dict or dict()
+        # The lock only protects the cache and in-flight dictionaries and the
+        # statistics, files are read and parsed without holding it.
         self._lock = threading.Lock()
+        self._loading = dict()
         self._is_static = is_static
+        # yaml cache files data can be decoded from.
+        self._cache_files = []
+        self.reset_stats()
 
     def _get_is_static(self):
         """
@@ -150,9 +421,13 @@ class YamlCache(object):
         Invalidates the cache for a given path. This is usually called when writing
         to a yaml file.
         """
+        # items are keyed by their normalized path.
+        path = os.path.normpath(path)
         with self._lock:
-            if path in self._cache:
-                del self._cache[path]
+            self._cache.pop(path, None)
+            # A file being loaded might have been read before the write, don't
+            # let it be cached or shared with new requests.
+            self._loading.pop(path, None)
 
     def get(self, path, deepcopy_data=True):
         """
@@ -170,7 +445,7 @@ class YamlCache(object):
         # the appropriate item back to us, which will be either the new
         # item we have created here with the yaml data stored within, or
         # the existing cached data.
-        item = self._add(CacheItem(path))
+        item = self._add(self._create_cache_item(path))
 
         # If asked to, return a deep copy of the cached data to ensure that
         # the cached data is not updated accidentally!
@@ -179,6 +454,76 @@ class YamlCache(object):
         else:
             return item.data
 
+    def get_view(self, path):
+        """
+        Retrieve the yaml data for the specified path, as a copy-on-write view
+        over the cached data.
+
+        Unlike a deep copy, getting a view doesn't duplicate the data: nested
+        dictionaries and lists are only wrapped when accessed, and only copied
+        if they are modified. This makes it the cheapest way to read the data,
+        while still protecting the cache from accidental changes.
+
+        .. note:: Views are not ``dict`` or ``list`` instances, callers testing
+            the type of the data should use :meth:`get` instead.
+
+        :param path: The path of the yaml file to load.
+        :returns: The yaml data loaded from the file, wrapped in a
+            :class:`CopyOnWriteDict` or :class:`CopyOnWriteList` if it is
+            a container.
+        """
+        item = self._add(self._create_cache_item(path))
+        return _make_view(item.data)
+
+    def add_cache_file(self, cache_file):
+        """
+        Adds the items stored in a yaml cache file to the cache.
+
+        The data of each item is only decoded when the item is requested. Like
+        any other item, it is discarded if the yaml file changed on disk since
+        it was cached.
+
+        :param cache_file: A :class:`~tank.util.yaml_cache_file.YamlCacheFile`.
+        :returns: The number of items added to the cache.
+        """
+        paths = cache_file.get_paths()
+        for path in paths:
+            self._add(_LazyCacheItem(path, cache_file, self))
+
+        with self._lock:
+            self._cache_files.append(cache_file)
+        return len(paths)
+
+    def get_cache_file(self, path):
+        """
+        Returns a yaml cache file previously added with :meth:`add_cache_file`.
+
+        :param path: Path to the cache file.
+        :returns: A :class:`~tank.util.yaml_cache_file.YamlCacheFile` or None.
+        """
+        with self._lock:
+            for cache_file in self._cache_files:
+                if cache_file.path == path:
+                    return cache_file
+        return None
+
+    def remove_cache_file(self, cache_file):
+        """
+        Removes the items whose data was not decoded yet from a yaml cache file.
+
+        Items already handed out can still decode their data, as the cache file
+        data stays in memory as long as they reference it.
+
+        :param cache_file: A :class:`~tank.util.yaml_cache_file.YamlCacheFile`
+            previously added with :meth:`add_cache_file`.
+        """
+        with self._lock:
+            for (path, item) in list(self._cache.items()):
+                if getattr(item, "cache_file", None) is cache_file:
+                    del self._cache[path]
+            if cache_file in self._cache_files:
+                self._cache_files.remove(cache_file)
+
     def get_cached_items(self):
         """
         Returns a list of all CacheItems stored in the cache.
@@ -195,6 +540,82 @@ class YamlCache(object):
         for item in cache_items:
             self._add(item)
 
+    def get_stats(self):
+        """
+        Returns statistics about the cache usage, useful to profile startup.
+
+        The returned dictionary contains the number of cache ``hits`` and
+        ``misses``, the number of ``stat_calls`` issued to check files on disk,
+        the number of files ``parsed`` and the total ``parse_time`` in seconds,
+        the number of items ``decoded`` from yaml cache files,
+        the number of ``coalesced`` requests which waited for another thread
+        to load the same file, and the number of ``items`` in the cache.
+
+        :returns: Dictionary of statistics.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["items"] = len(self._cache)
+        return stats
+
+    def reset_stats(self):
+        """
+        Resets the statistics returned by :meth:`get_stats`.
+        """
+        stats = {
+            "hits": 0,
+            "misses": 0,
+            "stat_calls": 0,
+            "parsed": 0,
+            "parse_time": 0.0,
+            "decoded": 0,
+            "coalesced": 0,
+        }
+        with self._lock:
+            self._stats = stats
+
+    def _count_stats(self, **increments):
+        """
+        Adds the given increments to the statistics.
+
+        The cache lock must not be held by the caller.
+
+        :param increments: Increments keyed by statistic name.
+        """
+        with self._lock:
+            for (name, increment) in increments.items():
+                self._stats[name] += increment
+
+    def dump_stats(self):
+        """
+        Writes the statistics returned by :meth:`get_stats` to the debug log.
+        """
+        stats = self.get_stats()
+        log.debug(
+            "Yaml cache: %d items, %d hits, %d misses, %d stat calls, "
+            "%d coalesced requests, %d items decoded, %d files parsed in %.3fs."
+            % (
+                stats["items"],
+                stats["hits"],
+                stats["misses"],
+                stats["stat_calls"],
+                stats["coalesced"],
+                stats["decoded"],
+                stats["parsed"],
+                stats["parse_time"],
+            )
+        )
+
+    def _create_cache_item(self, path):
+        """
+        Creates an item for a yaml file, with its current stat.
+
+        :param path: The path to the .yml file on disk.
+        :returns: A CacheItem without data.
+        """
+        self._count_stats(stat_calls=1)
+        return CacheItem(path)
+
     def _add(self, item):
         """
         Adds the given item to the cache in a thread-safe way. If the given item
@@ -206,53 +627,78 @@ class YamlCache(object):
         been populated with the yaml data from disk, that data will be read prior
         to the item being added to the cache.
 
+        The data is read without holding the cache lock, so other threads can
+        keep using the cache in the meantime. Concurrent requests for the same
+        file wait for the thread loading it instead of loading it again.
+
         :param item:    The CacheItem to add to the cache.
         :returns:       The cached CacheItem.
         """
-        self._lock.acquire()
+        path = item.path
 
-        try:
-            path = item.path
+        with self._lock:
             cached_item = self._cache.get(path)
 
             # If this is a static cache, we won't do any checks on
             # mod time and file size. If it's in the cache we return
-            # it, otherwise we populate the item data from disk, cache
-            # it, and then return it.
-            if self.is_static:
-                if cached_item:
-                    return cached_item
-                else:
-                    if not item.data:
-                        self._populate_cache_item_data(item)
-                    self._cache[path] = item
-                    return item
+            # it. Since this isn't a static cache, we need to make sure
+            # that we don't need to invalidate and recache this item
+            # based on mod time and file size on disk.
+            if cached_item and (self.is_static or cached_item == item):
+                # It's already in the cache and matches mtime
+                # and file size, so we can just return what we
+                # already have. It's technically identical in
+                # terms of data of what we got, but it's best
+                # to return the instance we have since that's
+                # what previous logic in the cache did.
+                self._stats["hits"] += 1
+                return cached_item
+
+            self._stats["misses"] += 1
+
+            if item.is_populated:
+                # Already populated, typically when merging items, so there
+                # is nothing to load.
+                self._cache[path] = item
+                return item
+
+            # Wait for the same file to be loaded by another thread, unless
+            # it was changed on disk since that load started.
+            in_flight = self._loading.get(path)
+            if in_flight and (self.is_static or in_flight.item == item):
+                self._stats["coalesced"] += 1
+                is_loading_thread = False
             else:
-                # Since this isn't a static cache, we need to make sure
-                # that we don't need to invalidate and recache this item
-                # based on mod time and file size on disk.
-                if cached_item and cached_item == item:
-                    # It's already in the cache and matches mtime
-                    # and file size, so we can just return what we
-                    # already have. It's technically identical in
-                    # terms of data of what we got, but it's best
-                    # to return the instance we have since that's
-                    # what previous logic in the cache did.
-                    return cached_item
-                else:
-                    # Load the yaml data from disk. If it's not already populated.
-                    if not item.data:
-                        self._populate_cache_item_data(item)
-                    self._cache[path] = item
-                    return item
-        finally:
-            self._lock.release()
+                in_flight = _InFlightLoad(item)
+                self._loading[path] = in_flight
+                is_loading_thread = True
+
+        if not is_loading_thread:
+            return in_flight.wait()
+
+        try:
+            self._populate_cache_item_data(item)
+        except Exception as e:
+            with self._lock:
+                if self._loading.get(path) is in_flight:
+                    del self._loading[path]
+            in_flight.complete(e)
+            raise
+
+        # Publish the item, unless the cache was invalidated while loading it.
+        with self._lock:
+            if self._loading.get(path) is in_flight:
+                del self._loading[path]
+                self._cache[path] = item
+        in_flight.complete()
+        return item
 
     def _populate_cache_item_data(self, item):
         """
         Loads the CacheItem's YAML data from disk.
         """
         path = item.path
+        time_before = time.time()
         try:
             with open(path, "r", encoding="utf8") as fh:
                 raw_data = yaml.load(fh, Loader=yaml.FullLoader)
@@ -262,6 +708,8 @@ class YamlCache(object):
             raise TankError(
                 "Could not open file '%s'. Error reported: '%s'" % (path, e)
             )
+        finally:
+            self._count_stats(parsed=1, parse_time=time.time() - time_before)
         # Populate the item's data before adding it to the cache.
         item.data = raw_data
 
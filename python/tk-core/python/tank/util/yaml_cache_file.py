@@ -0,0 +1,285 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Binary file format storing the yaml data of a configuration, so it can be read
+without parsing the yaml files.
+
+The file starts with a fixed size header, followed by the data of each yaml
+file, encoded separately, and ends with an index mapping the yaml file paths,
+relative to the configuration root, to the location of their data and to the
+modification time and size the files had when they were cached::
+
+    header | data of file 1 | data of file 2 | ... | index
+
+The file is read in memory when opened and only the index is decoded, the data
+of a yaml file is only decoded when it is requested. Since the file isn't kept
+open or mapped, it can be replaced while other processes use it, even on
+Windows. Data is encoded with :mod:`marshal` when possible, which is much faster
+to decode than pickle, and with :mod:`pickle` otherwise, for example for dates. Since the marshal format
+is specific to the Python version, files written by a different version of
+Python are rejected.
+"""
+
+import collections
+import fnmatch
+import marshal
+import os
+import pickle
+import struct
+
+from . import yaml_cache
+from ..errors import TankError
+from ..log import LogManager
+
+log = LogManager.get_logger(__name__)
+
+# Name of the cache file, stored at the root of a configuration.
+CACHE_FILE_NAME = "yaml_cache.bin"
+
+# Magic string identifying the format.
+_MAGIC = b"SGTKYAML"
+
+# Version of the format, to be increased when it changes.
+FORMAT_VERSION = 1
+
+# magic, format version, marshal version, index offset, index size
+_HEADER = struct.Struct("<8sHHQQ")
+
+# How the data of a yaml file was encoded.
+(_MARSHAL_ENCODING, _PICKLE_ENCODING) = range(2)
+
+# Minimal stat information about a cached yaml file.
+FileStat = collections.namedtuple("FileStat", ["st_mtime", "st_size"])
+
+
+class YamlCacheFile(object):
+    """
+    Reads a yaml cache file.
+    """
+
+    def __init__(self, path, root_dir):
+        """
+        Opens the cache file and reads its index.
+
+        :param str path: Path to the cache file.
+        :param str root_dir: Root of the configuration the cache file was written for.
+            The yaml file paths stored in the cache are relative to it.
+        :raises TankError: If the file can't be read or was written for another
+            version of the format or of Python.
+        """
+        self._path = path
+        self._entries = {}
+
+        try:
+            with open(path, "rb") as fh:
+                self._stat = os.fstat(fh.fileno())
+                self._buffer = memoryview(fh.read())
+        except Exception as e:
+            raise TankError("Unable to open yaml cache file '%s': %s" % (path, e))
+
+        try:
+            (
+                magic,
+                format_version,
+                marshal_version,
+                index_offset,
+                index_size,
+            ) = _HEADER.unpack_from(self._buffer)
+            if magic != _MAGIC:
+                raise TankError("Not a yaml cache file.")
+            if format_version != FORMAT_VERSION or marshal_version != marshal.version:
+                raise TankError(
+                    "Written by an incompatible version of the format (%s) or "
+                    "of Python (marshal version %s)."
+                    % (format_version, marshal_version)
+                )
+            index = marshal.loads(
+                self._buffer[index_offset : index_offset + index_size]
+            )
+        except Exception as e:
+            raise TankError("Unable to read yaml cache file '%s': %s" % (path, e))
+
+        for (relative_path, offset, size, encoding, mtime, file_size) in index:
+            file_path = os.path.normpath(
+                os.path.join(root_dir, *relative_path.split("/"))
+            )
+            self._entries[file_path] = (
+                offset,
+                size,
+                encoding,
+                FileStat(mtime, file_size),
+            )
+
+    def __repr__(self):
+        return "<YamlCacheFile %s>" % self._path
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def path(self):
+        """
+        Path to the cache file.
+        """
+        return self._path
+
+    def is_up_to_date(self):
+        """
+        Checks if the cache file was rewritten since it was opened.
+
+        :returns: True if the file on disk is the one which was opened.
+        """
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return False
+        return (
+            stat.st_mtime == self._stat.st_mtime and stat.st_size == self._stat.st_size
+        )
+
+    def get_paths(self):
+        """
+        Returns the normalized paths of all the yaml files in the cache.
+        """
+        return list(self._entries.keys())
+
+    def get_stat(self, path):
+        """
+        Returns the stat information of a yaml file when it was cached.
+
+        :param str path: Normalized path of the yaml file.
+        :returns: A :class:`FileStat`.
+        """
+        return self._entries[path][3]
+
+    def load_data(self, path):
+        """
+        Decodes the data of a yaml file.
+
+        :param str path: Normalized path of the yaml file.
+        :returns: The yaml data.
+        """
+        (offset, size, encoding, _) = self._entries[path]
+        raw_data = self._buffer[offset : offset + size]
+        if encoding == _MARSHAL_ENCODING:
+            return marshal.loads(raw_data)
+        return pickle.loads(raw_data)
+
+
+def find_yaml_files(root_dir):
+    """
+    Finds all the yaml files of a configuration.
+
+    :param str root_dir: Root of the configuration.
+    :returns: List of paths.
+    """
+    paths = []
+    for root, dir_names, file_names in os.walk(root_dir):
+        for file_name in fnmatch.filter(file_names, "*.yml"):
+            paths.append(os.path.join(root, file_name))
+    return paths
+
+
+def write_cache_file(path, root_dir, cache_items):
+    """
+    Writes a yaml cache file.
+
+    The file is written next to its final location first and then moved in
+    place, so readers never see a partially written file.
+
+    :param str path: Path to the cache file.
+    :param str root_dir: Root of the configuration. Items for yaml files
+        outside of it are skipped.
+    :param cache_items: List of :class:`~tank.util.yaml_cache.CacheItem`
+        to write.
+    :returns: The number of items written.
+    :raises TankError: If the file can't be written.
+    """
+    root_dir = os.path.normpath(root_dir)
+    index = []
+    chunks = []
+    offset = _HEADER.size
+
+    for item in cache_items:
+        try:
+            relative_path = os.path.relpath(item.path, root_dir)
+        except ValueError:
+            # on another drive.
+            relative_path = os.pardir
+        if relative_path == os.pardir or relative_path.startswith(
+            os.pardir + os.path.sep
+        ):
+            log.debug("Skipping %s, which is not in %s." % (item.path, root_dir))
+            continue
+        try:
+            raw_data = marshal.dumps(item.data)
+            encoding = _MARSHAL_ENCODING
+        except ValueError:
+            # the data contains objects marshal doesn't support.
+            raw_data = pickle.dumps(item.data, pickle.HIGHEST_PROTOCOL)
+            encoding = _PICKLE_ENCODING
+        index.append(
+            (
+                relative_path.replace(os.path.sep, "/"),
+                offset,
+                len(raw_data),
+                encoding,
+                item.stat.st_mtime,
+                item.stat.st_size,
+            )
+        )
+        chunks.append(raw_data)
+        offset += len(raw_data)
+
+    raw_index = marshal.dumps(index)
+    header = _HEADER.pack(
+        _MAGIC, FORMAT_VERSION, marshal.version, offset, len(raw_index)
+    )
+
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(header)
+            for chunk in chunks:
+                fh.write(chunk)
+            fh.write(raw_index)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise TankError("Unable to write yaml cache file '%s': %s" % (path, e))
+
+    return len(index)
+
+
+def write_config_cache_file(root_dir, path=None):
+    """
+    Reads all the yaml files of a configuration and writes their data to a
+    yaml cache file.
+
+    :param str root_dir: Root of the configuration.
+    :param str path: Path to the cache file. Defaults to a file named
+        :data:`CACHE_FILE_NAME` in the root of the configuration.
+    :returns: Tuple with the path to the cache file and the list of
+        :class:`~tank.util.yaml_cache.CacheItem` written.
+    :raises TankError: If a yaml file can't be read or the file can't be written.
+    """
+    path = path or os.path.join(root_dir, CACHE_FILE_NAME)
+    root_dir = os.path.normpath(root_dir)
+
+    items = []
+    for yaml_path in find_yaml_files(root_dir):
+        log.debug("Caching %s..." % yaml_path)
+        data = yaml_cache.g_yaml_cache.get(yaml_path, deepcopy_data=False)
+        items.append(yaml_cache.CacheItem(yaml_path, data))
+
+    write_cache_file(path, root_dir, items)
+    return (path, items)
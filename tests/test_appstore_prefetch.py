@@ -0,0 +1,102 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import threading
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.descriptor.io_descriptor.appstore import IODescriptorAppStore
+from tank.descriptor import constants
+
+
+class MockConnection:
+    """Mock the Shotgun class from python_api."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+
+class MockAppStore:
+    """Mock the app store Shotgun connection, counting the queries."""
+
+    def __init__(self, nb_versions):
+        self.nb_versions = nb_versions
+        self.calls = []
+
+    def find(self, entity_type, filters, fields=None, order=None, limit=0):
+        self.calls.append((entity_type, filters, limit))
+        if entity_type == constants.TANK_APP_ENTITY_TYPE:
+            names = filters[0][2]
+            return [
+                {"type": entity_type, "id": i, "sg_system_name": name}
+                for (i, name) in enumerate(names)
+            ]
+        # versions of the bundles, newest first
+        sg_bundles = filters[-1][2]
+        return [
+            {
+                "code": "v1.0.%d" % version,
+                "tags": [],
+                "sg_tank_app": sg_bundle,
+            }
+            for version in reversed(range(self.nb_versions))
+            for sg_bundle in sg_bundles
+        ]
+
+
+def _create_descriptors(tmpdir, base_url, nb_descriptors):
+    """
+    Creates app store app descriptors using an empty bundle cache.
+    """
+    descriptors = []
+    for i in range(nb_descriptors):
+        descriptor = IODescriptorAppStore(
+            {"type": "app_store", "name": "tk-app-%d" % i, "version": "v1.0.0"},
+            MockConnection(base_url),
+            constants.DESCRIPTOR_APP,
+        )
+        descriptor.set_cache_roots(str(tmpdir), [])
+        descriptors.append(descriptor)
+    return descriptors
+
+
+def test_prefetch_query_count(tmpdir):
+    """
+    Ensure the number of app store queries doesn't depend on the number of descriptors.
+    """
+    base_url = "https://prefetch-count.shotgunstudio.com"
+    app_store = MockAppStore(nb_versions=3)
+    IODescriptorAppStore._app_store_connections[base_url] = (
+        app_store,
+        None,
+        threading.get_ident(),
+    )
+    descriptors = _create_descriptors(tmpdir, base_url, 20)
+    try:
+        IODescriptorAppStore.prefetch_latest_versions(
+            descriptors, [None] * 19 + ["v1.0.x"]
+        )
+        # one query for the bundles and one for all their versions
+        assert len(app_store.calls) == 2
+        assert all(limit == 0 for (_, _, limit) in app_store.calls)
+
+        for descriptor in descriptors:
+            prefetched = descriptor._IODescriptorAppStore__get_prefetched_versions(None)
+            (_, sg_versions) = prefetched
+            assert [v["code"] for v in sg_versions] == ["v1.0.2", "v1.0.1", "v1.0.0"]
+    finally:
+        IODescriptorAppStore.clear_prefetched_versions()
+        del IODescriptorAppStore._app_store_connections[base_url]
+
+    # the records are released once cleared
+    assert descriptors[0]._IODescriptorAppStore__get_prefetched_versions(None) is None
@@ -0,0 +1,121 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import logging
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.log import LogManager
+
+
+def _create_handlers(tmpdir, max_records):
+    log_file = os.path.join(str(tmpdir), "test.log")
+    file_handler = LogManager._SafeRotatingFileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    async_handler = LogManager._AsyncFileHandler(file_handler, max_records)
+    return (log_file, file_handler, async_handler)
+
+
+def _read_lines(log_file):
+    with open(log_file) as fh:
+        return fh.read().splitlines()
+
+
+def test_async_file_handler(tmpdir):
+    """
+    Ensure the records logged by several threads are all written in batches,
+    once the handler is closed.
+    """
+    (log_file, file_handler, async_handler) = _create_handlers(tmpdir, 10000)
+    logger = logging.getLogger("test_async_file_handler")
+    logger.propagate = False
+    logger.addHandler(async_handler)
+    nb_threads = 4
+    nb_records = 500
+
+    def log_records(thread_idx):
+        for idx in range(nb_records):
+            logger.warning("thread %d record %d", thread_idx, idx)
+
+    with patch.object(
+        file_handler, "write_batch", wraps=file_handler.write_batch
+    ) as write_batch:
+        threads = [
+            threading.Thread(target=log_records, args=(i,)) for i in range(nb_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.removeHandler(async_handler)
+        async_handler.close()
+
+    lines = _read_lines(log_file)
+    assert sorted(lines) == sorted(
+        "thread %d record %d" % (thread_idx, idx)
+        for thread_idx in range(nb_threads)
+        for idx in range(nb_records)
+    )
+    # each thread's records are written in order.
+    for thread_idx in range(nb_threads):
+        prefix = "thread %d " % thread_idx
+        assert [line for line in lines if line.startswith(prefix)] == [
+            "%srecord %d" % (prefix, idx) for idx in range(nb_records)
+        ]
+    assert all(
+        len(call.args[0]) <= LogManager._AsyncFileHandler.BATCH_SIZE
+        for call in write_batch.call_args_list
+    )
+    assert sum(len(call.args[0]) for call in write_batch.call_args_list) == len(lines)
+    # closing again has no effect.
+    async_handler.close()
+    file_handler.close()
+
+
+def test_async_file_handler_full_queue(tmpdir):
+    """
+    Ensure the records logged while the queue is full are dropped and reported.
+    """
+    (log_file, file_handler, async_handler) = _create_handlers(tmpdir, 5)
+    logger = logging.getLogger("test_async_file_handler_full_queue")
+    logger.propagate = False
+
+    # block the writer thread on the first record.
+    writing = threading.Event()
+    resume = threading.Event()
+    write_batch = file_handler.write_batch
+
+    def blocking_write_batch(records):
+        writing.set()
+        resume.wait()
+        write_batch(records)
+
+    with patch.object(file_handler, "write_batch", side_effect=blocking_write_batch):
+        logger.addHandler(async_handler)
+        logger.warning("first")
+        assert writing.wait(5)
+        for idx in range(10):
+            logger.warning("record %d", idx)
+        resume.set()
+        logger.removeHandler(async_handler)
+        async_handler.close()
+    file_handler.close()
+
+    lines = _read_lines(log_file)
+    assert lines[:6] == ["first"] + ["record %d" % idx for idx in range(5)]
+    assert lines[6:] == [
+        "5 log records were dropped, as they were logged faster than they "
+        "could be written to disk."
+    ]
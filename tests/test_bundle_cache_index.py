@@ -0,0 +1,114 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import sys
+import threading
+from unittest.mock import patch
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.descriptor import constants
+from tank.descriptor.io_descriptor.bundle_cache_index import BundleCacheIndex
+
+
+def _create_bundle(root, name, version):
+    path = os.path.join(root, "app_store", name, version)
+    os.makedirs(path)
+    return path
+
+
+def test_bundle_lookups(tmpdir):
+    """
+    Ensure bundles are found from the listings of the bundle cache.
+    """
+    root = str(tmpdir)
+    path = _create_bundle(root, "tk-multi-loader2", "v1.0.0")
+    index = BundleCacheIndex()
+
+    assert index.exists(root, path, os.path.isdir)
+    assert index.exists(root, path, os.path.isdir)
+    assert not index.exists(
+        root,
+        os.path.join(root, "app_store", "tk-multi-loader2", "v2.0.0"),
+        os.path.isdir,
+    )
+    assert index.stats["lookups"] == 3
+    assert index.stats["cached_lookups"] == 1
+
+
+def test_removed_bundle(tmpdir):
+    """
+    Ensure a bundle removed from the bundle cache is no longer reported.
+    """
+    root = str(tmpdir)
+    path = _create_bundle(root, "tk-multi-loader2", "v1.0.0")
+    index = BundleCacheIndex()
+    assert index.exists(root, path, os.path.isdir)
+
+    shutil.rmtree(path)
+    # the bundle is trusted until its lookup expires
+    assert index.exists(root, path, os.path.isdir)
+    with patch.object(constants, "BUNDLE_CACHE_LISTING_LIFETIME", 0):
+        assert not index.exists(root, path, os.path.isdir)
+
+
+def test_invalidated_bundle(tmpdir):
+    """
+    Ensure invalidating a folder drops the bundles found inside it.
+    """
+    root = str(tmpdir)
+    path = _create_bundle(root, "tk-multi-loader2", "v1.0.0")
+    index = BundleCacheIndex()
+    assert index.exists(root, path, os.path.isdir)
+
+    shutil.rmtree(os.path.dirname(path))
+    index.invalidate(os.path.dirname(path))
+    assert not index.exists(root, path, os.path.isdir)
+
+
+def test_added_bundle(tmpdir):
+    """
+    Ensure a bundle written by another process is found once the listing expired.
+    """
+    root = str(tmpdir)
+    _create_bundle(root, "tk-multi-loader2", "v1.0.0")
+    path = os.path.join(root, "app_store", "tk-multi-loader2", "v2.0.0")
+    index = BundleCacheIndex()
+    assert not index.exists(root, path, os.path.isdir)
+
+    os.makedirs(path)
+    assert not index.exists(root, path, os.path.isdir)
+    with patch.object(constants, "BUNDLE_CACHE_LISTING_LIFETIME", 0):
+        assert index.exists(root, path, os.path.isdir)
+
+
+def test_concurrent_lookups(tmpdir):
+    """
+    Ensure bundles looked up from several threads are all found.
+    """
+    root = str(tmpdir)
+    paths = [_create_bundle(root, "tk-app-%d" % i, "v1.0.0") for i in range(20)]
+    index = BundleCacheIndex()
+    results = []
+
+    def lookup():
+        results.extend(index.exists(root, path, os.path.isdir) for path in paths)
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 8 * len(paths)
+    assert index.stats["lookups"] == 8 * len(paths)
@@ -0,0 +1,108 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import importlib
+import importlib.util
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.util import bytecode
+from tank.bootstrap.import_handler import CoreImportHandler
+
+
+@pytest.fixture
+def read_only_folder(tmpdir):
+    """
+    Creates a bundle cache folder reported as read-only, with the user's
+    byte code cache in a temporary folder.
+    """
+    bundle_cache = str(tmpdir.join("bundle_cache"))
+    os.makedirs(bundle_cache)
+    user_pycache = str(tmpdir.join("user_pycache"))
+
+    read_only_roots = list(bytecode._read_only_roots)
+    path_hooks = list(sys.path_hooks)
+    # the tests may run with permissions to write anywhere, and without
+    # writing byte code.
+    with patch.object(bytecode.os, "access", return_value=False), patch.object(
+        bytecode, "_get_user_pycache_root", return_value=user_pycache
+    ), patch.object(sys, "dont_write_bytecode", False):
+        bytecode.use_user_pycache([bundle_cache])
+        try:
+            yield (bundle_cache, user_pycache)
+        finally:
+            bytecode._read_only_roots[:] = read_only_roots
+            sys.path_hooks[:] = path_hooks
+            sys.path_importer_cache.clear()
+
+
+def _get_user_pycache_files(user_pycache):
+    """
+    :returns: Names of the byte code files in the user's byte code cache.
+    """
+    return [
+        file_name
+        for (_, _, file_names) in os.walk(user_pycache)
+        for file_name in file_names
+    ]
+
+
+def test_import_from_read_only_folder(read_only_folder):
+    """
+    Ensure modules imported through sys.path from a read-only folder have
+    their byte code stored in the user's cache folder.
+    """
+    (bundle_cache, user_pycache) = read_only_folder
+    with open(os.path.join(bundle_cache, "read_only_module.py"), "w") as fh:
+        fh.write("VALUE = 42\n")
+
+    sys.path.insert(0, bundle_cache)
+    try:
+        module = importlib.import_module("read_only_module")
+    finally:
+        sys.path.remove(bundle_cache)
+        sys.modules.pop("read_only_module", None)
+
+    assert module.VALUE == 42
+    assert not os.path.exists(os.path.join(bundle_cache, "__pycache__"))
+    assert _get_user_pycache_files(user_pycache) == [
+        os.path.basename(
+            importlib.util.cache_from_source(
+                os.path.join(bundle_cache, "read_only_module.py")
+            )
+        )
+    ]
+
+
+def test_core_import_from_read_only_folder(read_only_folder):
+    """
+    Ensure a core swapped from a read-only folder has its byte code stored in
+    the user's cache folder.
+    """
+    (bundle_cache, user_pycache) = read_only_folder
+    core_path = os.path.join(bundle_cache, "tk-core", "python")
+    os.makedirs(os.path.join(core_path, "tank"))
+    with open(os.path.join(core_path, "tank", "__init__.py"), "w") as fh:
+        fh.write("VALUE = 42\n")
+
+    spec = CoreImportHandler(core_path).find_spec("tank")
+    # execute the module without replacing the core running the tests.
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert module.VALUE == 42
+    assert not os.path.exists(os.path.join(core_path, "tank", "__pycache__"))
+    assert len(_get_user_pycache_files(user_pycache)) == 1
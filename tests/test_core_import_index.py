@@ -0,0 +1,57 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.bootstrap.import_handler import _CorePackageIndex
+
+
+def _create_core(tmpdir):
+    """
+    Creates a core with a package and a sub package.
+    """
+    core_path = str(tmpdir.join("core"))
+    os.makedirs(os.path.join(core_path, "tank", "util"))
+    for path in (
+        ("tank", "__init__.py"),
+        ("tank", "api.py"),
+        ("tank", "util", "__init__.py"),
+        ("tank", "util", "login.py"),
+    ):
+        with open(os.path.join(core_path, *path), "w") as fh:
+            fh.write("")
+    return core_path
+
+
+def test_persisted_index(tmpdir):
+    """
+    Ensure a persisted index is used until the core is modified.
+    """
+    core_path = _create_core(tmpdir)
+    index_path = str(tmpdir.join("index.json"))
+    _CorePackageIndex.build(core_path, ["tank"]).save(index_path)
+
+    package_index = _CorePackageIndex.load(index_path, core_path)
+    tank_path = os.path.join(core_path, "tank")
+    assert package_index.find_module_file(core_path, "tank") == os.path.join(
+        tank_path, "__init__.py"
+    )
+    assert package_index.find_module_file(tank_path, "api") == os.path.join(
+        tank_path, "api.py"
+    )
+    assert package_index.find_module_file(tank_path, "missing") is None
+
+    # the index is discarded once a module is removed
+    os.remove(os.path.join(tank_path, "util", "login.py"))
+    assert _CorePackageIndex.load(index_path, core_path) is None
@@ -0,0 +1,129 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import http.server
+import io
+import os
+import sys
+import threading
+import zipfile
+
+import pytest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.util.shotgun import download
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the payload of the server, supporting range requests."""
+
+    def do_GET(self):
+        payload = self.server.payload
+        self.server.range_headers.append(self.headers.get("Range"))
+        offset = 0
+        if self.headers.get("Range"):
+            offset = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                "bytes %d-%d/%d" % (offset, len(payload) - 1, len(payload)),
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(payload) - offset))
+        self.end_headers()
+        self.wfile.write(payload[offset:])
+
+    def log_message(self, *args):
+        pass
+
+
+class MockConfig:
+    server = "https://mock.shotgunstudio.com"
+    proxy_handler = None
+    timeout_secs = None
+
+
+class MockConnection:
+    """Mock the Shotgun class from python_api."""
+
+    base_url = MockConfig.server
+    config = MockConfig()
+
+
+@pytest.fixture
+def server():
+    """
+    Runs an http server in a thread, serving a zip file.
+    """
+    payload = io.BytesIO()
+    with zipfile.ZipFile(payload, "w") as zip_file:
+        zip_file.writestr("info.yml", "a" * 1024 * 1024 * 3)
+    httpd = http.server.HTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    httpd.payload = payload.getvalue()
+    httpd.range_headers = []
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+def _get_url(server):
+    return "http://127.0.0.1:%d/bundle.zip" % server.server_address[1]
+
+
+def test_download_url_resume(server, tmpdir):
+    """
+    Ensure a partial download is resumed and progress is reported.
+    """
+    location = str(tmpdir.join("bundle.zip"))
+    with open(location, "wb") as fh:
+        fh.write(server.payload[:1000])
+
+    progress = []
+    download.download_url(
+        MockConnection(),
+        _get_url(server),
+        location,
+        progress_callback=lambda *args: progress.append(args),
+        resume=True,
+    )
+    with open(location, "rb") as fh:
+        assert fh.read() == server.payload
+    assert server.range_headers == ["bytes=1000-"]
+    # the progress includes the bytes already downloaded
+    (bytes_downloaded, total_bytes, _) = progress[-1]
+    assert bytes_downloaded == total_bytes == len(server.payload)
+
+
+def test_download_and_unpack_url_statistics(server, tmpdir):
+    """
+    Ensure the download statistics and progress are reported.
+    """
+    progress = []
+    stats = download.download_and_unpack_url(
+        MockConnection(),
+        _get_url(server),
+        str(tmpdir.join("bundle")),
+        progress_callback=lambda *args: progress.append(args),
+    )
+    assert os.path.isfile(str(tmpdir.join("bundle", "info.yml")))
+    assert isinstance(stats, download.DownloadStatistics)
+    assert stats.attempts == 1
+    assert stats.size == stats.bytes_transferred == len(server.payload)
+    assert stats.bytes_resumed == 0
+    assert stats.to_dict()["source"] == _get_url(server)
+    assert progress[-1][0] == len(server.payload)
@@ -0,0 +1,96 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.folder import FolderIOReceiver
+
+
+def _create_items(root):
+    """
+    Returns folder creation items for a few shots, children listed before
+    their parents like the folder configuration can produce them.
+    """
+    source_path = os.path.join(root, "source.txt")
+    with open(source_path, "w") as fh:
+        fh.write("source")
+
+    items = []
+    for shot in range(20):
+        shot_path = os.path.join(root, "project", "shots", "shot_%02d" % shot)
+        items.extend(
+            [
+                {"action": "folder", "path": os.path.join(shot_path, "work")},
+                {"action": "entity_folder", "path": shot_path},
+                {"action": "folder", "path": os.path.join(shot_path, "publish")},
+                # requested again by another part of the schema
+                {"action": "folder", "path": os.path.join(shot_path, "work", "")},
+                {
+                    "action": "copy",
+                    "source_path": source_path,
+                    "target_path": os.path.join(shot_path, "work", "source.txt"),
+                },
+                {
+                    "action": "create_file",
+                    "path": os.path.join(shot_path, "publish", "readme.txt"),
+                    "content": "shot %d" % shot,
+                },
+                {
+                    "action": "remote_entity_folder",
+                    "path": os.path.join(shot_path, "remote"),
+                },
+            ]
+        )
+    items.append({"action": "folder", "path": os.path.join(root, "project", "shots")})
+    return items
+
+
+def test_execute_items(tmpdir):
+    """
+    Ensure the items are created concurrently, parents before their children.
+    """
+    root = str(tmpdir)
+    items = _create_items(root)
+    locations = FolderIOReceiver.execute_items(items, False, max_workers=4)
+
+    # items requested several times and remote folders are not reported, and
+    # the locations are reported in the order of the items.
+    expected_locations = [
+        item.get("target_path") or item["path"]
+        for (idx, item) in enumerate(items)
+        if idx % 7 not in (3, 6)
+    ]
+    assert locations == expected_locations
+    for shot in range(20):
+        shot_path = os.path.join(root, "project", "shots", "shot_%02d" % shot)
+        assert os.path.isdir(os.path.join(shot_path, "publish"))
+        assert not os.path.exists(os.path.join(shot_path, "remote"))
+        with open(os.path.join(shot_path, "work", "source.txt")) as fh:
+            assert fh.read() == "source"
+        with open(os.path.join(shot_path, "publish", "readme.txt")) as fh:
+            assert fh.read() == "shot %d" % shot
+
+    # nothing is reported when everything exists.
+    assert FolderIOReceiver.execute_items(items, False, max_workers=4) == []
+
+
+def test_execute_items_preview(tmpdir):
+    """
+    Ensure nothing is created in preview mode.
+    """
+    root = str(tmpdir)
+    items = _create_items(root)
+    locations = FolderIOReceiver.execute_items(items, True, max_workers=4)
+    assert len(locations) == 20 * 5 + 1
+    assert not os.path.exists(os.path.join(root, "project"))
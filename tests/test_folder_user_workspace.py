@@ -0,0 +1,91 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.folder.folder_types import user
+from tank.folder.folder_types.user import UserWorkspace
+
+
+class MockShotgun:
+    """Mock the Shotgun class from python_api, returning the filtered users."""
+
+    def __init__(self):
+        self.filters = []
+
+    def find(self, entity_type, filters, fields):
+        self.filters.append(filters)
+        user_ids = [
+            condition["values"][0]
+            for condition in filters["conditions"]
+            if condition["path"] == "id"
+        ]
+        return [
+            {
+                "type": "HumanUser",
+                "id": user_id,
+                "login": "user%d" % user_id,
+                "name": "User %d" % user_id,
+            }
+            for user_id in user_ids
+        ]
+
+
+class MockTk:
+    """Mock a Toolkit API instance."""
+
+    def __init__(self):
+        self.shotgun = MockShotgun()
+
+    def execute_core_hook(self, hook_name, value, **kwargs):
+        # folder names are processed by a core hook
+        return value
+
+
+class MockIOReceiver:
+    """Mock the folder creation io receiver, recording the created folders."""
+
+    def __init__(self):
+        self.folders = []
+
+    def make_entity_folder(self, path, entity, config_metadata):
+        self.folders.append(path)
+
+
+def test_user_workspace_per_request_user():
+    """
+    Ensure a user workspace folder shared by several requests uses the
+    current user of each request.
+    """
+    tk = MockTk()
+    # the same node is used by all the folder creation requests, like the
+    # folder configuration cached by an Sgtk instance.
+    node = UserWorkspace.create(
+        tk, None, "/schema/user", {"type": "user_workspace", "name": "login"}
+    )
+
+    for user_id in (1, 2):
+        io_receiver = MockIOReceiver()
+        with patch.object(
+            user.login,
+            "get_current_user",
+            return_value={"type": "HumanUser", "id": user_id},
+        ):
+            node.create_folders(io_receiver, "/project", {}, True, [], "tk-shell")
+        assert io_receiver.folders == [os.path.join("/project", "user%d" % user_id)]
+
+    # the user filter was only added to the queries, not to the node.
+    assert node._filters["conditions"] == []
+    assert len(tk.shotgun.filters[1]["conditions"]) == 1
@@ -0,0 +1,74 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank import hook
+
+BASE_HOOK = """
+import sgtk
+
+class BaseHook(sgtk.Hook):
+    def execute(self):
+        return "%s"
+"""
+
+DERIVED_HOOK = """
+import sgtk
+
+class DerivedHook(sgtk.get_hook_baseclass()):
+    pass
+"""
+
+
+def test_clear_stale_hooks(tmpdir):
+    """
+    Ensure only the hooks modified on disk and the hooks deriving from them
+    are released, so unchanged hooks are reused by the next engine.
+    """
+    base_path = str(tmpdir.join("base_hook.py"))
+    derived_path = str(tmpdir.join("derived_hook.py"))
+    other_path = str(tmpdir.join("other_hook.py"))
+    with open(base_path, "w") as fh:
+        fh.write(BASE_HOOK % "base")
+    with open(derived_path, "w") as fh:
+        fh.write(DERIVED_HOOK)
+    with open(other_path, "w") as fh:
+        fh.write(BASE_HOOK % "other")
+
+    hook.clear_hooks_cache()
+    try:
+        assert (
+            hook.create_hook_instance([base_path, derived_path], None).execute()
+            == "base"
+        )
+        other_class = type(hook.create_hook_instance([other_path], None))
+        assert hook.get_hooks_cache_stats()["hooks"] == 3
+
+        # nothing changed on disk, all the hooks are kept
+        hook.clear_stale_hooks()
+        assert hook.get_hooks_cache_stats()["hooks"] == 3
+
+        with open(base_path, "w") as fh:
+            fh.write(BASE_HOOK % "modified")
+        hook.clear_stale_hooks()
+        # the modified hook is released along with the hook deriving from it
+        assert hook.get_hooks_cache_stats()["hooks"] == 1
+        assert type(hook.create_hook_instance([other_path], None)) is other_class
+        assert (
+            hook.create_hook_instance([base_path, derived_path], None).execute()
+            == "modified"
+        )
+    finally:
+        hook.clear_hooks_cache()
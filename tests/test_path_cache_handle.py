@@ -0,0 +1,153 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import gc
+import os
+import sqlite3
+import sys
+import threading
+import weakref
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.path_cache import PathCache, PathCacheHandle
+
+
+class MockPipelineConfiguration:
+    """Mock a pipeline configuration with a single storage root."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def get_shotgun_path_cache_enabled(self):
+        return True
+
+    def has_associated_data_roots(self):
+        return True
+
+    def get_data_roots(self):
+        return {"primary": self.root}
+
+    def get_project_id(self):
+        return 1
+
+    def get_shotgun_id(self):
+        return 1
+
+
+class MockTk:
+    """Mock a Toolkit API instance, storing the path cache in a given file."""
+
+    def __init__(self, root, path_cache_file):
+        self.pipeline_configuration = MockPipelineConfiguration(root)
+        self.path_cache_file = path_cache_file
+
+    def execute_core_hook_method(self, hook_name, method_name, **kwargs):
+        # the cache location hook
+        return self.path_cache_file
+
+
+def _create_tk(tmpdir, nb_shots):
+    """
+    Creates a Toolkit instance with a path cache holding a folder per shot.
+    """
+    root = str(tmpdir.join("project"))
+    tk = MockTk(root, str(tmpdir.join("path_cache.db")))
+    # create the database
+    PathCache(tk).close()
+    connection = sqlite3.connect(tk.path_cache_file)
+    connection.executemany(
+        "INSERT INTO path_cache VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("Shot", i, "shot_%d" % i, "primary", "/shots/shot_%d" % i, 1)
+            for i in range(nb_shots)
+        ],
+    )
+    connection.commit()
+    connection.close()
+    return tk
+
+
+def test_concurrent_lookups(tmpdir):
+    """
+    Ensure a handle can be used from several threads at once.
+    """
+    tk = _create_tk(tmpdir, 50)
+    handle = PathCacheHandle(tk)
+    errors = []
+
+    def lookup():
+        try:
+            for i in range(50):
+                assert handle.get_paths("Shot", i, True) == [
+                    os.path.join(tk.pipeline_configuration.root, "shots", "shot_%d" % i)
+                ]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    handle.close()
+
+    assert errors == []
+
+
+def test_close(tmpdir):
+    """
+    Ensure a closed handle releases its connection and opens it again when needed.
+    """
+    tk = _create_tk(tmpdir, 1)
+    handle = PathCacheHandle(tk)
+    assert handle.get_paths("Shot", 0, True)
+    connection = handle._path_cache._connection
+
+    handle.close()
+    assert handle._path_cache is None
+    # the connection was closed
+    try:
+        connection.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        pass
+    else:
+        assert False, "The connection is still open."
+
+    # replace the path cache file, the handle sees the new content
+    os.remove(tk.path_cache_file)
+    tk = _create_tk(tmpdir, 2)
+    handle = PathCacheHandle(tk)
+    assert handle.get_paths("Shot", 1, True)
+    handle.close()
+
+
+def test_handle_does_not_keep_tk_alive(tmpdir):
+    """
+    Ensure the Toolkit instance owning a handle can be garbage collected.
+    """
+    tk = _create_tk(tmpdir, 1)
+    handle = PathCacheHandle(tk)
+    assert handle.get_paths("Shot", 0, True)
+    connection = handle._path_cache._connection
+    # close the handle when the Toolkit instance is collected, like Sgtk does.
+    weakref.finalize(tk, handle.close)
+    tk_ref = weakref.ref(tk)
+    del tk
+    gc.collect()
+    assert tk_ref() is None
+    assert handle._path_cache is None
+    try:
+        connection.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        pass
+    else:
+        assert False, "The connection is still open."
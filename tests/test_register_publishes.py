@@ -0,0 +1,157 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank_vendor import shotgun_api3
+from tank.util.shotgun import publish_creation
+from tank.util.errors import ShotgunPublishError
+
+
+class MockContext:
+    """Mock a Toolkit context."""
+
+    project = {"type": "Project", "id": 1}
+    task = None
+
+
+class MockShotgun:
+    """Mock the Shotgun class from python_api, rejecting some publishes."""
+
+    def __init__(self, rejected_paths=(), batch_error=None):
+        self.rejected_paths = rejected_paths
+        self.batch_error = batch_error
+        self.nb_batches = 0
+        self.nb_creates = 0
+        self.next_id = 1
+
+    def _create(self, entity_type, data):
+        if data.get("path") in self.rejected_paths:
+            raise shotgun_api3.Fault("Rejected %s" % data["path"])
+        entity = dict(data, type=entity_type, id=self.next_id)
+        self.next_id += 1
+        return entity
+
+    def batch(self, requests):
+        self.nb_batches += 1
+        if self.batch_error:
+            raise self.batch_error
+        # batches are transactional
+        for request in requests:
+            if request["data"].get("path") in self.rejected_paths:
+                raise shotgun_api3.Fault("Rejected %s" % request["data"]["path"])
+        return [self._create(r["entity_type"], r["data"]) for r in requests]
+
+    def create(self, entity_type, data):
+        self.nb_creates += 1
+        return self._create(entity_type, data)
+
+
+class MockTk:
+    """Mock a Toolkit API instance."""
+
+    def __init__(self, shotgun):
+        self.shotgun = shotgun
+
+
+def _get_published_file_data(tk, context, path, *args):
+    return {"path": path, "code": os.path.basename(path)}
+
+
+def _register_publishes(tk, paths, **kwargs):
+    """
+    Registers a publish for each path, with the Shotgun specific lookups mocked.
+    """
+    publishes = [
+        {
+            "context": MockContext(),
+            "path": path,
+            "name": os.path.basename(path),
+            "version_number": 1,
+            "dependency_paths": ["/dependency"],
+        }
+        for path in paths
+    ]
+    with patch.object(
+        publish_creation,
+        "get_published_file_entity_type",
+        return_value="PublishedFile",
+    ), patch.object(
+        publish_creation, "_get_published_file_data", _get_published_file_data
+    ), patch.object(
+        publish_creation, "_upload_publish_thumbnails"
+    ):
+        return publish_creation.register_publishes(tk, publishes, **kwargs)
+
+
+@patch.object(publish_creation, "find_publish", return_value={})
+def test_register_publishes_batches(*mocks):
+    """
+    Ensure publishes are created in batches.
+    """
+    sg = MockShotgun()
+    results = _register_publishes(
+        MockTk(sg), ["/publish/%d" % i for i in range(5)], batch_size=2
+    )
+    assert sg.nb_batches == 3
+    assert sg.nb_creates == 0
+    assert [entity["path"] for (entity, _) in results] == [
+        "/publish/%d" % i for i in range(5)
+    ]
+    assert all(error is None for (_, error) in results)
+
+
+@patch.object(publish_creation, "find_publish", return_value={})
+def test_register_publishes_rejected_batch(*mocks):
+    """
+    Ensure the publishes of a batch rejected by Shotgun are created one by one.
+    """
+    sg = MockShotgun(rejected_paths=["/publish/1"])
+    results = _register_publishes(MockTk(sg), ["/publish/%d" % i for i in range(3)])
+    assert sg.nb_creates == 3
+    (entity, error) = results[1]
+    assert entity is None
+    assert isinstance(error, ShotgunPublishError)
+    for idx in (0, 2):
+        (entity, error) = results[idx]
+        assert entity["path"] == "/publish/%d" % idx
+        assert error is None
+
+
+@patch.object(publish_creation, "find_publish", return_value={})
+def test_register_publishes_failed_batch(*mocks):
+    """
+    Ensure the publishes of a batch failing for another reason are not created again.
+    """
+    sg = MockShotgun(batch_error=IOError("Connection reset"))
+    results = _register_publishes(MockTk(sg), ["/publish/%d" % i for i in range(3)])
+    assert sg.nb_creates == 0
+    for (entity, error) in results:
+        assert entity is None
+        assert isinstance(error, ShotgunPublishError)
+
+
+@patch.object(publish_creation, "find_publish", side_effect=IOError("Timeout"))
+def test_register_publishes_failed_dependency_lookup(*mocks):
+    """
+    Ensure a failing dependency lookup is reported on the created publishes.
+    """
+    sg = MockShotgun()
+    results = _register_publishes(MockTk(sg), ["/publish/%d" % i for i in range(3)])
+    for (idx, (entity, error)) in enumerate(results):
+        # the publishes were created
+        assert entity["path"] == "/publish/%d" % idx
+        assert isinstance(error, ShotgunPublishError)
+        assert error.entity == entity
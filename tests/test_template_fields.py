@@ -0,0 +1,81 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank import template
+from tank.template import TemplatePath
+from tank.templatekey import IntegerKey, StringKey
+
+
+def _create_template():
+    keys = {
+        "Shot": StringKey("Shot"),
+        "name": StringKey("name", filter_by="alphanumeric"),
+        "version": IntegerKey("version", format_spec="03"),
+    }
+    # the optional name gives the template two variations.
+    return TemplatePath(
+        "shots/{Shot}/publish/{Shot}[_{name}].v{version}.ma", keys, "/project"
+    )
+
+
+def test_get_fields_reuses_parsers():
+    """
+    Ensure the path parsers are built once per template variation.
+    """
+    with patch.object(
+        template, "TemplatePathParser", wraps=template.TemplatePathParser
+    ) as parser_class:
+        tmpl = _create_template()
+        for idx in range(10):
+            path = os.path.join(
+                "/project", "shots", "sh%d" % idx, "publish", "sh%d_main.v%03d.ma"
+            ) % (idx, idx)
+            assert tmpl.validate(path)
+            assert tmpl.get_fields(path) == {
+                "Shot": "sh%d" % idx,
+                "name": "main",
+                "version": idx,
+            }
+        path = os.path.join("/project", "shots", "sh1", "publish", "sh1.v002.ma")
+        assert tmpl.get_fields(path) == {"Shot": "sh1", "version": 2}
+        assert not tmpl.validate(os.path.join("/project", "shots", "sh1", "sh1.ma"))
+    assert parser_class.call_count == 2
+
+
+def test_get_fields_concurrent():
+    """
+    Ensure the reused path parsers give the right fields to concurrent threads.
+    """
+    tmpl = _create_template()
+    errors = []
+
+    def get_fields(thread_idx):
+        for idx in range(200):
+            path = os.path.join(
+                "/project", "shots", "sh%d" % thread_idx, "publish", "sh%d.v%03d.ma"
+            ) % (thread_idx, idx)
+            fields = tmpl.get_fields(path)
+            if fields != {"Shot": "sh%d" % thread_idx, "version": idx}:
+                errors.append(fields)
+
+    threads = [threading.Thread(target=get_fields, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
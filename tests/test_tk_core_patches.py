@@ -0,0 +1,71 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+CORE_PATH = os.path.join(REPO_ROOT, "python", "tk-core")
+PATCHES_PATH = os.path.join(REPO_ROOT, "python", "tk-core-patches")
+
+
+def _get_patches():
+    return sorted(name for name in os.listdir(PATCHES_PATH) if name.endswith(".patch"))
+
+
+def _read_files(root):
+    """
+    Returns the content of the files under a folder, keyed by relative path.
+    """
+    files = {}
+    for (dirpath, dirnames, filenames) in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name != "__pycache__"]
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, "rb") as fh:
+                files[os.path.relpath(path, root)] = fh.read()
+    return files
+
+
+def _apply_patch(root, patch, reverse=False):
+    args = ["git", "apply", "--directory=python/tk-core"]
+    if reverse:
+        args.append("--reverse")
+    subprocess.check_call(args + [os.path.join(PATCHES_PATH, patch)], cwd=root)
+
+
+def test_local_patches_listed():
+    """
+    Ensure the bundled core lists the patches of the queue.
+    """
+    with open(os.path.join(CORE_PATH, "local_patches")) as fh:
+        assert fh.read().split() == _get_patches()
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+def test_patches_rebuild_core(tmpdir):
+    """
+    Ensure the patch queue can be removed from the bundled core and applied
+    again to rebuild it, like tk_core_update.sh does on the upstream core.
+    """
+    root = str(tmpdir)
+    core_copy = os.path.join(root, "python", "tk-core")
+    shutil.copytree(CORE_PATH, core_copy, ignore=shutil.ignore_patterns("__pycache__"))
+
+    patches = _get_patches()
+    for patch in reversed(patches):
+        _apply_patch(root, patch, reverse=True)
+    for patch in patches:
+        _apply_patch(root, patch)
+
+    assert _read_files(core_copy) == _read_files(CORE_PATH)
@@ -0,0 +1,78 @@
+# Copyright (c) 2023 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import threading
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "python/tk-core/python")
+)
+from tank.util.yaml_cache import YamlCache
+
+
+def _write_yaml_files(tmpdir, nb_files):
+    paths = []
+    for idx in range(nb_files):
+        path = os.path.join(str(tmpdir), "file_%d.yml" % idx)
+        with open(path, "w") as fh:
+            fh.write("index: %d\n" % idx)
+        paths.append(path)
+    return paths
+
+
+def test_concurrent_stats(tmpdir):
+    """
+    Ensure the statistics are not lost when the cache is used by several threads.
+    """
+    paths = _write_yaml_files(tmpdir, 4)
+    yaml_cache = YamlCache()
+    nb_threads = 8
+    nb_gets = 200
+    barrier = threading.Barrier(nb_threads)
+
+    def get_files():
+        barrier.wait()
+        for idx in range(nb_gets):
+            path = paths[idx % len(paths)]
+            assert yaml_cache.get(path, deepcopy_data=False) == {
+                "index": idx % len(paths)
+            }
+
+    # switch threads as often as possible to expose races.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=get_files) for _ in range(nb_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    stats = yaml_cache.get_stats()
+    assert stats["stat_calls"] == nb_threads * nb_gets
+    assert stats["hits"] + stats["misses"] == nb_threads * nb_gets
+    assert stats["misses"] == stats["parsed"] + stats["coalesced"]
+    assert stats["items"] == len(paths)
+
+
+def test_invalidate_normalizes_path(tmpdir):
+    """
+    Ensure a path can be invalidated however it is written.
+    """
+    (path,) = _write_yaml_files(tmpdir, 1)
+    yaml_cache = YamlCache()
+    yaml_cache.get(path)
+    yaml_cache.invalidate(
+        os.path.join(os.path.dirname(path), ".", os.path.basename(path))
+    )
+    assert yaml_cache.get_stats()["items"] == 0
@@ -19,6 +19,9 @@ echo ""
 echo "A commit_id file will be written to the tk-core shotgun distribution to "
 echo "indicate which version being bundled with core."
 echo ""
+echo "The local patches found in python/tk-core-patches will then be applied to"
+echo "the core, and listed in a local_patches file next to the commit_id file."
+echo ""
 echo "This script is intended to be used by developers and maintainers of the tk-core API."
 echo ""
 echo "Note requires sed on Linux or gsed on MacOS."
@@ -52,6 +55,8 @@ SRC_REPO=git@github.com:shotgunsoftware/tk-core.git
 DEST_REPO="$ROOT/repo"
 # Destination relative to this script for the files
 DEST="$(pwd)/python/tk-core"
+# Local changes applied on top of the core, in order.
+PATCHES="$(pwd)/python/tk-core-patches"
 
 # Recreate the folder structure
 mkdir "$ROOT"
@@ -74,6 +79,18 @@ cp -R "$DEST_REPO"/* "$DEST"
 rm -rf "$DEST/tests"
 rm -rf "$DEST/docs"
 
+# Reapply the local changes. commit_id keeps the upstream commit, so record the
+# patches applied on top of it. A patch which doesn't apply anymore aborts the
+# update: it needs to be refreshed, or removed if it was merged upstream.
+echo "Applying the local patches to TK-CORE..."
+: > "$DEST/local_patches"
+for patch in "$PATCHES"/*.patch; do
+    [ -e "$patch" ] || continue
+    echo "Applying $(basename "$patch")..."
+    git apply --directory=python/tk-core "$patch"
+    basename "$patch" >> "$DEST/local_patches"
+done
+
 echo "Updating tk-core info.yml..."
 if [[ "$OSTYPE" == "linux-gnu"* ]]; then
     sed -i "$DEST/info.yml" -e "s/version: \"HEAD\"/version: \"$1\"/"